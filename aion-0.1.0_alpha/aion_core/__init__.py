@@ -5,9 +5,128 @@ __license__ = "GPL-3.0"
 __version__ = "0.1.0"
 
 try:
-    from .utils import aion_data_path, aion_path
+    from . import utils as _utils
+    from .utils import aion_data_path, lazy_module_variables as _lazy_module_variables
 except ImportError:
-    from utils import aion_data_path, aion_path
+    import utils as _utils
+    from utils import aion_data_path, lazy_module_variables as _lazy_module_variables
+
+
+def _aion_path() -> str:
+    """
+    gets the path of the aion installation (it's searched on the first call, see 'utils.aion_path')
+
+    :return: str
+        returns the path
+        syntax: <path>
+        example: "/usr/local/aion-0.1.0_alpha"
+
+    :since: 0.1.0
+    """
+    return _utils.aion_path
+
+
+def _synthesize(command) -> str:
+    """
+    runs a tts engine which writes the synthesized words into the '.wav' file it gets (every call gets its own file, because skills can speak at the same time)
+
+    :param command: function
+        returns the command of the tts engine for the filename of the '.wav' file
+        syntax: <function>
+        example: lambda fname: ["espeak", "-v", "en", "-w", fname, "This is an test"]
+    :return: str
+        returns the filename of the synthesized '.wav' file or None if the synthesis has failed
+        syntax: <filename>
+        example: "/tmp/aion_ab12cd34.wav"
+
+    :since: 0.1.0
+    """
+    from os import close, remove
+    from os.path import getsize
+    from subprocess import DEVNULL, run
+    from tempfile import mkstemp
+
+    file_descriptor, fname = mkstemp(prefix="aion_", suffix=".wav")
+    close(file_descriptor)
+    try:
+        if run(command(fname), stdout=DEVNULL).returncode == 0 and getsize(fname) > 0:
+            return fname
+    except OSError:  # e.g. the tts engine isn't installed
+        pass
+    remove(fname)
+    return None
+
+
+def _tts_espeak(speech_output: str, language: str) -> str:
+    """
+    synthesizes the given words with espeak
+
+    :param speech_output: str
+        the words to be said
+        syntax: <speech output words>
+        example: "This is an test"
+    :param language: str
+        language locale
+        syntax: <language locale>
+        example: "en_US"
+    :return: str
+        returns the filename of the synthesized '.wav' file or None if the synthesis has failed
+        syntax: <filename>
+        example: "/tmp/aion_ab12cd34.wav"
+
+    :since: 0.1.0
+    """
+    return _synthesize(lambda fname: ["espeak", "-v", language.split("_")[0], "-w", fname, str(speech_output)])
+
+
+def _tts_pico2wave(speech_output: str, language: str) -> str:
+    """
+    synthesizes the given words with pico2wave
+
+    :param speech_output: str
+        the words to be said
+        syntax: <speech output words>
+        example: "This is an test"
+    :param language: str
+        language locale
+        syntax: <language locale>
+        example: "en_US"
+    :return: str
+        returns the filename of the synthesized '.wav' file or None if the synthesis has failed
+        syntax: <filename>
+        example: "/tmp/aion_ab12cd34.wav"
+
+    :since: 0.1.0
+    """
+    return _synthesize(lambda fname: ["pico2wave", "--lang=" + language.split("_")[0] + "-" + language.split("_")[1], "--wave=" + fname, str(speech_output) + "."])
+
+
+def _tts_stub(speech_output: str, language: str) -> str:
+    """
+    tts engine for benchmarks, which neither synthesizes nor plays anything
+
+    :param speech_output: str
+        the words to be said (unused)
+        syntax: <speech output words>
+        example: "This is an test"
+    :param language: str
+        language locale (unused)
+        syntax: <language locale>
+        example: "en_US"
+    :return: str
+        returns None (nothing to play)
+
+    :since: 0.1.0
+    """
+    return None
+
+
+tts_engines = {"espeak": _tts_espeak, "pico2wave": _tts_pico2wave, "stub": _tts_stub}
+
+TTS_ENGINE_ENV = "AION_TTS_ENGINE"
+STARTUP_PROFILE_ENV = "AION_STARTUP_PROFILE"
+
+__getattr__ = _lazy_module_variables(globals(), aion_path=_aion_path)
 
 
 def speech_output(speech_output: str) -> None:
@@ -24,24 +143,86 @@ def speech_output(speech_output: str) -> None:
     """
     try:
         from .config import Aion
+        from .trace import current_trace, span
+        from .tts import AudioCache, say
     except ImportError:
         from config import Aion
-    from os import system
+        from trace import current_trace, span
+        from tts import AudioCache, say
+    from os import environ, remove
+    from subprocess import call
 
-    try:
-        tts_engine = Aion().get_tts_engine()
-    except IndexError:
-        Aion().reset()
-        tts_engine = Aion().get_tts_engine()
+    aion = Aion()
+    tts_engine = environ.get(TTS_ENGINE_ENV)  # set e.g. by the pipeline benchmark
+    if tts_engine is None:
+        tts_engine = aion.get_tts_engine()
+    if tts_engine not in tts_engines:
+        return
+    language = aion.get_language()
 
-    if tts_engine == "espeak":
-        system("espeak -v" + Aion().get_language().split("_")[0] + " " + str(speech_output) + " stdout | aplay")
+    # the tts server (started by 'main.py') keeps the audio sink open and streams the audio, without it the words are synthesized to a file and played here
+    if say(speech_output, tts_engine, language, current_trace()) is True:
         print("Sayed '" + str(speech_output) + "'")
-    elif tts_engine == "pico2wave":
-        system('pico2wave --lang=' + Aion().get_language().split("_")[0] + '-' + Aion().get_language().split("_")[1] + ' --wave=/tmp/aion.wav "' + str(speech_output) + "." + '"; aplay /tmp/aion.wav; rm /tmp/aion.wav')
+        return
+
+    cache = AudioCache()
+    wav_fname = cache.get(tts_engine, language, speech_output)
+    if wav_fname is None:
+        with span("tts.synthesis"):
+            wav_fname = tts_engines[tts_engine](speech_output, language)
+        if wav_fname is not None:
+            with open(wav_fname, "rb") as file:
+                cached_fname = cache.put(tts_engine, language, speech_output, file.read())
+            if cached_fname is not None:
+                remove(wav_fname)
+                wav_fname = cached_fname
+    if wav_fname is not None:
+        with span("tts.playback"):
+            call(["aplay", wav_fname])
+        if wav_fname.startswith(cache.directory) is False:
+            remove(wav_fname)
         print("Sayed '" + str(speech_output) + "'")
 
 
+def speech_output_stream(speech_output: str, block: bool = True):
+    """
+    plays a output of an artificial voice from the given words sentence by sentence, so that the first sentence is played before the whole text is synthesized
+
+    :param speech_output: str
+        the words to be said
+        syntax: <speech output words>
+        example: "Python is a programming language. It was created by Guido van Rossum."
+    :param block: bool, optional
+        if True, the function returns after the words were said, if False, immediately
+        syntax: <boolean>
+        example: True
+    :return: tts.SpeechStream
+        returns the stream, which can be cancelled with 'cancel()'
+
+    :since: 0.1.0
+    """
+    try:
+        from .config import Aion
+        from .trace import current_trace
+        from .tts import SpeechStream
+    except ImportError:
+        from config import Aion
+        from trace import current_trace
+        from tts import SpeechStream
+    from os import environ
+
+    aion = Aion()
+    tts_engine = environ.get(TTS_ENGINE_ENV)
+    if tts_engine is None:
+        tts_engine = aion.get_tts_engine()
+
+    stream = SpeechStream(speech_output, tts_engine, aion.get_language(), current_trace())
+    stream.start()
+    if block is True:
+        stream.wait()
+    return stream
+
+
 def start(sudo: bool = False) -> None:
     """
     starts aion
@@ -56,9 +237,9 @@ def start(sudo: bool = False) -> None:
     """
     from os import system
     if sudo is True:
-        system("sudo python3 " + aion_path + "/main.py")
+        system("sudo python3 " + _aion_path() + "/main.py")
     else:
-        system("python3 " + aion_path + "/main.py")
+        system("python3 " + _aion_path() + "/main.py")
 
 
 class ExecuteAionFile:
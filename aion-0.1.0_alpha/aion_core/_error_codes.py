@@ -12,9 +12,11 @@ acph_activate_phrase_exist = "57042"
 
 # config.py (40)
 
+config_no_supported_audio_handoff = "40312"
 config_no_hotword_file_file = "40863"
 config_no_supported_listening_mode = "40518"
 config_no_supported_listening_source = "40801"
+config_no_supported_recognition_queue_policy = "40637"
 config_no_supported_time_format = "40014"
 config_no_supported_tts_engine = "40744"
 config_name_config_is_used_as_root_name = "40026"
@@ -89,6 +91,8 @@ skill_license_must_be_str = "25248"
 skill_required_python3_package_must_be_list_or_tuple = "25780"
 skill_activate_phrases_must_be_dict = "25161"
 skill_activate_phrases_character_must_be_in_alphabet = "25559"
+skill_limits_must_be_dict = "25613"
+skill_limits_invalid_limit = "25694"
 
 skill_package_couldnt_find_directory = "25816"
 skill_package_couldnt_find_aion_file = "25505"
@@ -111,6 +115,7 @@ utils_unexpected_error = "92700"
 utils_fname_doesnt_exist = "92029"
 utils_couldnt_find_parent = "92613"
 utils_dict_index_out_of_range = "92743"
+utils_lock_timeout = "92418"
 
 # variable.py (20)
 
@@ -118,3 +123,7 @@ variable_get_value_variable_file_variable_doesnt_exist = "92481"
 variable_get_value_user_variables_variable_doesnt_exist = "92255"
 variable_remove_variable_variable_doesnt_exist = "92010"
 variable_set_value_variable_doesnt_exist = "92603"
+variable_invalid_variable_file = "92536"
+variable_invalid_aion_pid = "92145"
+variable_name_or_value_too_long = "92318"
+variable_table_full = "92774"
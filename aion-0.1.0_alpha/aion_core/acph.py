@@ -2,10 +2,10 @@
 
 try:
     from .config import Aion as _Aion
-    from .utils import aion_data_path as _aion_data_path
+    from .utils import aion_data_path as _aion_data_path, live_module_variables as _live_module_variables
 except ImportError:
     from config import Aion as _Aion
-    from utils import aion_data_path as _aion_data_path
+    from utils import aion_data_path as _aion_data_path, live_module_variables as _live_module_variables
 
 
 def _acph_file() -> str:
@@ -18,6 +18,7 @@ def _acph_file() -> str:
     """
     from colorama import Fore
     from os.path import isfile
+    language = _language()
     if isfile(acph_directory + "/" + language + ".acph") is False:
         print(Fore.RED + "didn't found acph file in your language. Using the default acph file (en_US)" + Fore.RESET)
         return acph_directory + "/en_US.acph"
@@ -25,11 +26,157 @@ def _acph_file() -> str:
         return acph_directory + "/" + language + ".acph"
 
 
-language = _Aion().get_language()
+def _language() -> str:
+    """
+    gets the language of the config (read on every call, so that a long running process notices a language change)
+
+    :return: str
+        returns the language locale
+        syntax: <language locale>
+        example: "en_US"
+
+    :since: 0.1.0
+    """
+    return _Aion().get_language()
+
+
 acph_directory = _aion_data_path + "/language"
-acph_file = _acph_file()
 supported_languages = ["de_DE", "en_US"]
 
+# 'language' and 'acph_file' are read from the (cached) config on every access, so that a long running process notices a language change
+__getattr__ = _live_module_variables(globals(), language=_language, acph_file=_acph_file)
+
+
+class ActivatePhraseMatcher:
+    """
+    finds all activate phrases in a speech input with a single pass over the input (aho-corasick automaton)
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, phrase_dict: dict) -> None:
+        """
+        builds the automaton from the given activate phrases
+
+        :param phrase_dict: dict
+            activate phrases with the value which should be returned if the activate phrase was found
+            syntax: {<activate phrase>: <value>}
+            example: {"tell__and__about": ["skills", "Wikipedia"], "time": ["skills", "CurrentTime"]}
+            NOTE: all parts of an activate phrase which are separated by '__and__' must be in the speech input
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        self._phrases = []
+        self._postings = []
+        atom_ids = {}
+
+        for activate_phrase, value in phrase_dict.items():
+            phrase_atom_ids = []
+            for atom in activate_phrase.lower().split("__and__"):
+                if atom not in atom_ids:
+                    atom_ids[atom] = len(atom_ids)
+                    self._postings.append([])
+                    self._add_atom(atom, atom_ids[atom])
+                if atom_ids[atom] not in phrase_atom_ids:
+                    phrase_atom_ids.append(atom_ids[atom])
+            for atom_id in phrase_atom_ids:
+                self._postings[atom_id].append(len(self._phrases))
+            self._phrases.append((activate_phrase, value, len(phrase_atom_ids)))
+
+        self._build_fail_links()
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def _add_atom(self, atom: str, atom_id: int) -> None:
+        """
+        adds an atom (activate phrase or part of an '__and__' activate phrase) to the trie
+
+        :param atom: str
+            the lowered atom
+            syntax: <atom>
+            example: "tell"
+        :param atom_id: int
+            id of the atom
+            syntax: <atom id>
+            example: 3
+        :return: None
+
+        :since: 0.1.0
+        """
+        state = 0
+        for char in atom:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(atom_id)
+
+    def _build_fail_links(self) -> None:
+        """
+        computes the failure links of the trie (breadth first)
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from collections import deque
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def match(self, speech_input: str) -> list:
+        """
+        returns all activate phrases which are in the given speech input
+
+        :param speech_input: str
+            the speech input
+            syntax: <speech input>
+            example: "Tell me something about Python"
+        :return: list
+            returns the found activate phrases with their values (in the order of the 'phrase_dict' which was given to the class)
+            syntax: [(<activate phrase>, <value>)]
+            example: [("tell__and__about", ["skills", "Wikipedia"])]
+
+        :since: 0.1.0
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        found_atoms = set()
+        state = 0
+        for char in speech_input.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found_atoms.update(output[state])
+
+        hits = {}
+        for atom_id in found_atoms:
+            for phrase_index in self._postings[atom_id]:
+                hits[phrase_index] = hits.get(phrase_index, 0) + 1
+
+        return [self._phrases[phrase_index][:2] for phrase_index in sorted(hits) if hits[phrase_index] == self._phrases[phrase_index][2]]
+
 
 def add_acph(language_locale: str, skill: str, acph_dict: dict = {}) -> None:
     """
@@ -54,17 +201,19 @@ def add_acph(language_locale: str, skill: str, acph_dict: dict = {}) -> None:
     """
     try:
         from ._error_codes import acph_activate_phrase_exist
-        from .utils import BaseXMLWriter
+        from .utils import BaseXMLReader, BaseXMLWriter
     except ImportError:
         from _error_codes import acph_activate_phrase_exist
-        from utils import BaseXMLWriter
+        from utils import BaseXMLReader, BaseXMLWriter
 
-    acph_writer = BaseXMLWriter(acph_directory + "/" + language_locale + ".acph")
-    for acph, method in acph_dict:
-        if exist_acph(language_locale, acph):
-            raise IndexError("Errno: " + acph_activate_phrase_exist + " - The activate phrase " + acph + " already exist")
-        acph_writer.add("<root>", acph, skill=skill, method=method)
-    acph_writer.write()
+    acph_file = acph_directory + "/" + language_locale + ".acph"
+    existing_acphs = set(BaseXMLReader(acph_file).root.childs)
+    with BaseXMLWriter(acph_file).transaction() as acph_writer:
+        for acph, method in acph_dict.items():
+            acph = acph.replace(" ", "_")
+            if acph in existing_acphs:
+                raise IndexError("Errno: " + acph_activate_phrase_exist + " - The activate phrase " + acph + " already exist")
+            acph_writer.add("<root>", acph, skill=skill, method=method)
 
 
 def create_acph_file(language_locale: str, skill_acph_dict_dict: dict = {}) -> None:
@@ -118,10 +267,9 @@ def delete_acph(language_locale: str, acph_list: list = []) -> None:
     except ImportError:
         from utils import BaseXMLWriter
 
-    acph_writer = BaseXMLWriter(acph_directory + "/" + language_locale + ".acph")
-    for item in acph_list:
-        acph_writer.remove("<root>", str(item))
-    acph_writer.write()
+    with BaseXMLWriter(acph_directory + "/" + language_locale + ".acph").transaction() as acph_writer:
+        for item in acph_list:
+            acph_writer.remove("<root>", str(item))
 
 
 def exist_acph(language_locale: str, acph: str) -> bool:
@@ -151,8 +299,32 @@ def exist_acph(language_locale: str, acph: str) -> bool:
     acph = acph.replace(" ", "_")
 
     acph_reader = BaseXMLReader(acph_directory + "/" + language_locale + ".acph")
-    for item in acph_reader.get_infos(["<root>"]).items().index(0):
-        if acph in item["childs"]:
-            return True
-        else:
-            return False
+    for item in acph_reader.find(acph, parent=acph_reader.root.tag):
+        return True
+    return False
+
+
+def read_acph_file(acph_file: str) -> dict:
+    """
+    reads all activate phrases of an activate phrase ('.acph') file
+
+    :param acph_file: str
+        path of the '.acph' file
+        syntax: <filename>
+        example: "/etc/aion_data/language/en_US.acph"
+    :return: dict
+        returns the skill and the method of every activate phrase
+        syntax: {<activate phrase>: [<skill name>, <method>]}
+        example: {"tell__and__about": ["skills", "Wikipedia"], "time": ["skills", "CurrentTime"]}
+
+    :since: 0.1.0
+    """
+    from xml.etree.ElementTree import parse
+
+    phrases = {}
+    for element in parse(acph_file).getroot():
+        try:
+            phrases["__and__".join([phrase.replace("_", " ") for phrase in element.tag.split("__and__")])] = [element.attrib["skill"], element.attrib["method"]]
+        except KeyError:
+            pass
+    return phrases
@@ -0,0 +1,506 @@
+#!/usr/bin/python3
+
+_words = ["about", "alarm", "calendar", "cpu", "current", "date", "forecast", "light", "memory", "music", "news", "next", "play", "processor", "radio", "ram", "song", "start", "stop",
+          "tell", "temperature", "time", "timer", "turn", "usage", "volume", "weather", "wikipedia"]
+
+_benchmark_skill = """#!/usr/bin/python3
+
+try:
+    from {package}.skill import Skill
+except ImportError:
+    from skill import Skill
+
+
+class Echo(Skill):
+
+    def main(self):
+        self.speech_output(self.speech_input)
+"""
+
+_benchmark_phrase_dict = {"time": ["Echo"], "something about": ["Echo"], "song": ["Echo"], "weather": ["Echo"], "cpu__and__usage": ["Echo"], "light": ["Echo"]}
+
+_transcripts = ["what time is it", "tell me something about python", "play the next song", "how is the weather tomorrow", "what is the current cpu usage",
+                "turn the light in the kitchen off", "this sentence does not contain any known activate phrase at all"]
+
+
+def _linear_match(phrase_dict: dict, speech_input: str) -> list:
+    """
+    finds the activate phrases in the speech input the way 'main.main' did before the 'ActivatePhraseMatcher' existed
+
+    :param phrase_dict: dict
+        activate phrases with their values
+        syntax: {<activate phrase>: <value>}
+        example: {"time": ["skills", "CurrentTime"]}
+    :param speech_input: str
+        the speech input
+        syntax: <speech input>
+        example: "What time is it"
+    :return: list
+        returns the found activate phrases with their values
+        syntax: [(<activate phrase>, <value>)]
+        example: [("time", ["skills", "CurrentTime"])]
+
+    :since: 0.1.0
+    """
+    speech_input_lower = speech_input.lower()
+    found = []
+    for activate_phrase, value in phrase_dict.items():
+        activate_phrase_lower = activate_phrase.lower()
+        if "__and__" in activate_phrase_lower:
+            and_found = True
+            for and_phrase in activate_phrase.split("__and__"):
+                if and_phrase.lower() not in speech_input_lower:
+                    and_found = False
+                    break
+            if and_found is True:
+                found.append((activate_phrase, value))
+        elif activate_phrase_lower in speech_input_lower:
+            found.append((activate_phrase, value))
+    return found
+
+
+def _random_phrase_dict(phrase_number: int) -> dict:
+    """
+    creates random activate phrases
+
+    :param phrase_number: int
+        number of activate phrases
+        syntax: <number>
+        example: 2000
+    :return: dict
+        returns the activate phrases with a dummy value
+        syntax: {<activate phrase>: [<main file>, <method>]}
+        example: {"play__and__radio": ["skill_1", "Skill1"]}
+
+    :since: 0.1.0
+    """
+    from random import Random
+
+    random = Random(phrase_number)
+    phrase_dict = {}
+    while len(phrase_dict) < phrase_number:
+        phrase = " ".join(random.sample(_words, random.randint(2, 3)))
+        if random.random() < 0.2:
+            phrase = phrase + "__and__" + random.choice(_words)
+        phrase_dict[phrase] = ["skill_" + str(len(phrase_dict)), "Skill" + str(len(phrase_dict))]
+    return phrase_dict
+
+
+def benchmark_matcher(phrase_dict: dict = None, transcripts: list = None, phrase_number: int = 2000, repeat: int = 100) -> dict:
+    """
+    compares the time the old linear activate phrase scan and the 'ActivatePhraseMatcher' need to find the activate phrases in a speech input
+
+    :param phrase_dict: dict, optional
+        activate phrases which should be used (None = 'phrase_number' random activate phrases)
+        syntax: {<activate phrase>: <value>}
+        example: {"time": ["skills", "CurrentTime"]}
+    :param transcripts: list, optional
+        speech inputs which should be matched (None = some example sentences)
+        syntax: [<speech input>]
+        example: ["What time is it"]
+    :param phrase_number: int, optional
+        number of random activate phrases if no 'phrase_dict' is given
+        syntax: <number>
+        example: 2000
+    :param repeat: int, optional
+        how often every transcript should be matched
+        syntax: <repeat>
+        example: 100
+    :return: dict
+        returns the mean time per speech input in microseconds and the time to build the matcher in milliseconds
+        syntax: {"phrases": <number of activate phrases>, "build_ms": <build time>, "linear_us": <linear scan time>, "matcher_us": <matcher time>, "speedup": <speedup>}
+        example: {"phrases": 2000, "build_ms": 21.3, "linear_us": 812.4, "matcher_us": 9.1, "speedup": 89.3}
+
+    :since: 0.1.0
+    """
+    try:
+        from .acph import ActivatePhraseMatcher
+    except ImportError:
+        from acph import ActivatePhraseMatcher
+
+    from time import perf_counter
+
+    if phrase_dict is None:
+        phrase_dict = _random_phrase_dict(phrase_number)
+    if transcripts is None:
+        transcripts = _transcripts
+
+    start = perf_counter()
+    matcher = ActivatePhraseMatcher(phrase_dict)
+    build_time = perf_counter() - start
+
+    for transcript in transcripts:
+        if matcher.match(transcript) != _linear_match(phrase_dict, transcript):
+            raise AssertionError("The matcher and the linear scan found different activate phrases in '" + transcript + "'")
+
+    start = perf_counter()
+    for i in range(repeat):
+        for transcript in transcripts:
+            _linear_match(phrase_dict, transcript)
+    linear_time = (perf_counter() - start) / (repeat * len(transcripts))
+
+    start = perf_counter()
+    for i in range(repeat):
+        for transcript in transcripts:
+            matcher.match(transcript)
+    matcher_time = (perf_counter() - start) / (repeat * len(transcripts))
+
+    return {"phrases": len(phrase_dict), "build_ms": round(build_time * 1000, 3), "linear_us": round(linear_time * 1000000, 3), "matcher_us": round(matcher_time * 1000000, 3),
+            "speedup": round(linear_time / matcher_time, 1)}
+
+
+def benchmark_logging(message_number: int = 5000, directory: str = None) -> dict:
+    """
+    compares how many messages per second 'LogFile' can write directly (open, append and close for every message) and buffered
+    every message is written to two files, like 'LogAll' does with a level log file
+
+    :param message_number: int, optional
+        number of messages which should be written
+        syntax: <number>
+        example: 5000
+    :param directory: str, optional
+        directory in which the test log files are created (None = temporary directory)
+        syntax: <directory>
+        example: "/etc/aion_data/logs"
+    :return: dict
+        returns the messages per second
+        syntax: {"messages": <number of messages>, "direct_per_s": <messages per second>, "buffered_per_s": <messages per second>, "speedup": <speedup>}
+        example: {"messages": 5000, "direct_per_s": 9421.7, "buffered_per_s": 151250.3, "speedup": 16.1}
+
+    :since: 0.1.0
+    """
+    try:
+        from . import logging
+    except ImportError:
+        import logging
+
+    from os import remove
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from time import perf_counter
+
+    temporary_directory = None
+    if directory is None:
+        temporary_directory = TemporaryDirectory()
+        directory = temporary_directory.name
+
+    format_values = {"year": 2000, "month": 1, "day": 1, "hour": 0, "minute": 0, "second": 0, "filename": "benchmark.py", "lineno": 1, "levelname": "INFO"}
+
+    def direct_write(fname, msg):
+        # the way 'LogFile._write' wrote before the messages were buffered
+        with open(fname, "a") as file:
+            file.write(msg + "\n")
+
+    results = {}
+    try:
+        for name in ("direct", "buffered"):
+            fnames = [join(directory, "benchmark_" + name + ".log"), join(directory, "benchmark_" + name + "_info.log")]
+            loggers = [logging.LogFile(fname) for fname in fnames]
+            start = perf_counter()
+            for i in range(message_number):
+                for logger in loggers:
+                    if name == "direct":
+                        direct_write(logger.log_fname, logger.format.format(message="Benchmark message " + str(i), **format_values))
+                    else:
+                        logger.info(None, dict(format_values, message="Benchmark message " + str(i)))
+            logging.flush()
+            results[name] = message_number / (perf_counter() - start)
+            for fname in fnames:
+                logging.close_file(fname)  # otherwise the log writer keeps the removed files open
+            for fname in fnames:
+                with open(fname) as file:
+                    if sum(1 for line in file) != message_number:
+                        raise AssertionError("Not all messages were written to " + fname)
+                remove(fname)
+    finally:
+        if temporary_directory is not None:
+            temporary_directory.cleanup()
+
+    return {"messages": message_number, "direct_per_s": round(results["direct"], 1), "buffered_per_s": round(results["buffered"], 1),
+            "speedup": round(results["buffered"] / results["direct"], 1)}
+
+
+def _parse_importtime(output: str) -> list:
+    """
+    parses the output of 'python3 -X importtime'
+
+    :param output: str
+        stderr of the python process
+        syntax: <output>
+        example: "import time: self [us] | cumulative | imported package
+                  import time:       628 |      36005 | aion_core.acph"
+    :return: list
+        returns the name, nesting depth, own and cumulative import time (in microseconds) of every imported module
+        syntax: [(<module name>, <depth>, <self us>, <cumulative us>)]
+        example: [("aion_core.acph", 0, 628, 36005)]
+
+    :since: 0.1.0
+    """
+    imports = []
+    for line in output.split("\n"):
+        if line.startswith("import time:") is False:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or fields[0].strip().isdigit() is False:  # the header line
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), depth, int(fields[0]), int(fields[1])))
+    return imports
+
+
+def benchmark_startup(main_file: str = None, top: int = 15, timeout: float = 120) -> dict:
+    """
+    starts aion with 'python3 -X importtime' until it's ready to listen for the hotword (then it exits) and reports the time to ready and the slowest imports
+
+    :param main_file: str, optional
+        the aion 'main.py' which should be started (None = the one of the aion installation)
+        syntax: <filename>
+        example: "/usr/local/aion-0.1.0_alpha/main.py"
+    :param top: int, optional
+        number of imports which should be returned
+        syntax: <number>
+        example: 15
+    :param timeout: float, optional
+        seconds after which the startup gets aborted
+        syntax: <seconds>
+        example: 120
+    :return: dict
+        returns the time to ready, the time all top level imports took and the imports which took the longest (own time, without the imports they made)
+        syntax: {"ready_ms": <milliseconds>, "import_ms": <milliseconds>, "imports": [(<module name>, <self ms>, <cumulative ms>)]}
+        example: {"ready_ms": 1834.2, "import_ms": 912.5, "imports": [("speech_recognition", 112.4, 180.3)]}
+
+    :since: 0.1.0
+    """
+    try:
+        from . import STARTUP_PROFILE_ENV
+        from .utils import aion_path
+    except ImportError:
+        from __init__ import STARTUP_PROFILE_ENV
+        from utils import aion_path
+
+    from os import environ
+    from os.path import abspath, dirname
+    from re import search
+    from subprocess import run
+    from sys import executable
+
+    if main_file is None:
+        main_file = aion_path + "/main.py"
+
+    environment = dict(environ)
+    environment[STARTUP_PROFILE_ENV] = "1"
+    process = run([executable, "-X", "importtime", abspath(main_file)], cwd=dirname(abspath(main_file)), env=environment, capture_output=True, text=True, timeout=timeout)
+
+    ready = search(r"Ready after ([0-9.]+) ms", process.stdout)
+    if ready is None:
+        errors = [line for line in process.stderr.split("\n") if line.strip() and line.startswith("import time:") is False]
+        raise RuntimeError("aion didn't get ready (exit code " + str(process.returncode) + ")" + (": " + errors[-1] if errors else ""))
+
+    imports = _parse_importtime(process.stderr)
+    slowest = sorted(imports, key=lambda module: module[2], reverse=True)[:top]
+    results = {"ready_ms": float(ready.group(1)), "import_ms": round(sum([module[3] for module in imports if module[1] == 0]) / 1000, 1),
+               "imports": [(name, round(self_us / 1000, 1), round(cumulative_us / 1000, 1)) for name, depth, self_us, cumulative_us in slowest]}
+    return results
+
+
+def benchmark_xml_write(entry_number: int = 10000, directory: str = None) -> dict:
+    """
+    compares how long it takes to add entries to a '.lng' file and write it with a 'BaseXMLWriter' transaction and the old way (serialized and pretty printed via minidom)
+
+    :param entry_number: int, optional
+        number of entries which should be added
+        syntax: <number>
+        example: 10000
+    :param directory: str, optional
+        directory in which the test '.lng' files are created (None = temporary directory)
+        syntax: <directory>
+        example: "/tmp"
+    :return: dict
+        returns the time in milliseconds which both ways took
+        syntax: {"entries": <number of entries>, "minidom_ms": <milliseconds>, "transaction_ms": <milliseconds>, "speedup": <speedup>}
+        example: {"entries": 10000, "minidom_ms": 842.1, "transaction_ms": 31.7, "speedup": 26.6}
+
+    :since: 0.1.0
+    """
+    try:
+        from .utils import BaseXMLReader, BaseXMLWriter
+    except ImportError:
+        from utils import BaseXMLReader, BaseXMLWriter
+
+    import xml.etree.ElementTree as ET
+    from os.path import join
+    from shutil import rmtree
+    from tempfile import mkdtemp
+    from time import perf_counter
+    from xml.dom import minidom
+
+    tmp_directory = None
+    if directory is None:
+        directory = tmp_directory = mkdtemp()
+
+    results = {}
+    try:
+        for name in ("minidom", "transaction"):
+            fname = join(directory, "benchmark_" + name + ".lng")
+            with open(fname, "w") as file:
+                file.write("<en_US>\n</en_US>\n")
+
+            start = perf_counter()
+            if name == "minidom":
+                # the way 'BaseXMLWriter' read and wrote before the transactions
+                root = ET.fromstring("".join([line.replace("\n", "").strip() for line in open(fname, "r")]))
+                for i in range(entry_number):
+                    ET.SubElement(root, "benchmark.entry_" + str(i)).text = "This is the benchmark entry number {number}"
+                with open(fname, "w") as file:
+                    file.write("\n".join(minidom.parseString(ET.tostring(root, "utf-8")).toprettyxml(indent="  ").split("\n")[1:]))
+            else:
+                with BaseXMLWriter(fname).transaction() as lng_writer:
+                    for i in range(entry_number):
+                        lng_writer.add("<root>", "benchmark.entry_" + str(i), text="This is the benchmark entry number {number}")
+            results[name] = perf_counter() - start
+
+            if len(BaseXMLReader(fname).root.childs) != entry_number:
+                raise AssertionError("Not all entries were written to " + fname)
+    finally:
+        if tmp_directory is not None:
+            rmtree(tmp_directory)
+
+    return {"entries": entry_number, "minidom_ms": round(results["minidom"] * 1000, 1), "transaction_ms": round(results["transaction"] * 1000, 1),
+            "speedup": round(results["minidom"] / results["transaction"], 1)}
+
+
+def _load_corpus(corpus) -> list:
+    """
+    loads the speech inputs of a replay corpus
+
+    :param corpus: list or str
+        list of transcripts / '.wav' files, a directory with '.wav' files (with the transcript in a '.txt' file with the same name) or a file with one transcript per line
+        syntax: <corpus>
+        example: "/home/pi/corpus"
+    :return: list
+        returns the transcripts and '.wav' filenames
+        syntax: [<transcript or filename>]
+        example: ["/home/pi/corpus/time.wav", "What time is it"]
+
+    :since: 0.1.0
+    """
+    from glob import glob
+    from os.path import isdir, join
+
+    if isinstance(corpus, list):
+        return corpus
+    elif isdir(corpus):
+        return sorted(glob(join(corpus, "*.wav")))
+    with open(corpus, "r") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def benchmark_pipeline(corpus=None, stt_engine: str = "stub", phrase_dict: dict = None, pool_size: int = 2, repeat: int = 1, language: str = "en_US", timeout: float = 30) -> dict:
+    """
+    replays speech inputs through the same stages as 'main.main' (stt, activate phrase matching, skill worker pool, tts) with the 'stub' tts engine,
+    so that it runs without microphone, snowboy and network
+
+    :param corpus: list or str, optional
+        speech inputs which should be replayed (see '_load_corpus', None = some example sentences)
+        syntax: <corpus>
+        example: "/home/pi/corpus"
+    :param stt_engine: str, optional
+        stt engine which should be used ('stub' reads the transcripts, 'pocketsphinx' / 'google' recognize the '.wav' files)
+        syntax: <stt engine>
+        example: "stub"
+    :param phrase_dict: dict, optional
+        activate phrases with their values (None = activate phrases of a built-in skill that says the speech input)
+        syntax: {<activate phrase>: [<main file>, <method>]}
+        example: {"time": ["skills", "CurrentTime"]}
+    :param pool_size: int, optional
+        number of skill workers
+        syntax: <pool size>
+        example: 2
+    :param repeat: int, optional
+        how often the corpus should be replayed
+        syntax: <repeat>
+        example: 1
+    :param language: str, optional
+        language locale of the speech inputs
+        syntax: <language locale>
+        example: "en_US"
+    :param timeout: float, optional
+        max. seconds to wait for one skill
+        syntax: <seconds>
+        example: 30
+    :return: dict
+        returns the number of commands, the commands per second, the number of commands without activate phrase and the latency statistics per stage (see 'trace.summarize')
+        syntax: {"commands": <number>, "commands_per_s": <commands per second>, "unmatched": <number>, "spans": {<name>: {"count": <count>, "errors": <errors>, "mean": <mean>, "p50": <p50>, "p95": <p95>, "p99": <p99>, "max": <max>}}}
+        example: {"commands": 7, "commands_per_s": 212.4, "unmatched": 1, "spans": {"stt": {"count": 7, "errors": 0, "mean": 0.012, "p50": 0.011, "p95": 0.02, "p99": 0.02, "max": 0.02}}}
+
+    :since: 0.1.0
+    """
+    try:
+        from . import logging, pipeline, trace, TTS_ENGINE_ENV
+        from .acph import ActivatePhraseMatcher
+        from .worker import SkillWorkerPool
+    except ImportError:
+        import logging, pipeline, trace
+        from __init__ import TTS_ENGINE_ENV
+        from acph import ActivatePhraseMatcher
+        from worker import SkillWorkerPool
+
+    from os import environ
+    from os.path import join
+    from shutil import rmtree
+    from sys import path
+    from tempfile import mkdtemp
+    from time import perf_counter
+
+    speech_inputs = _load_corpus(_transcripts if corpus is None else corpus) * repeat
+
+    directory = mkdtemp()
+    if phrase_dict is None:
+        with open(join(directory, "aion_benchmark_skill.py"), "w") as file:
+            file.write(_benchmark_skill.format(package=__package__ or "aion_core"))
+        phrase_dict = {activate_phrase: ["aion_benchmark_skill"] + value for activate_phrase, value in _benchmark_phrase_dict.items()}
+    main_files = list(set(value[0] for value in phrase_dict.values()))
+
+    old_trace_file = trace.trace_file
+    old_tts_engine = environ.get(TTS_ENGINE_ENV)
+    trace.trace_file = join(directory, "benchmark.trace")
+    environ[TTS_ENGINE_ENV] = "stub"
+    path.insert(0, directory)
+
+    # the workers are forked after the changes above, so they use the 'stub' tts engine and the benchmark trace file too
+    skill_pool = SkillWorkerPool(pool_size, 0, {}, {}, main_files, accounting_fname=join(directory, "skills.accounting"))
+    try:
+        phrase_matcher = ActivatePhraseMatcher(phrase_dict)
+        skill_pool.start()
+
+        warm_up_job = pipeline.dispatch(list(phrase_dict)[0].replace("__and__", " "), phrase_matcher, skill_pool)
+        skill_pool.wait(warm_up_job, timeout)
+
+        unmatched = 0
+        start = perf_counter()
+        for speech_input in speech_inputs:
+            trace_id = trace.new_trace()
+            with trace.span("command"):
+                job = pipeline.dispatch(pipeline.recognize(speech_input, stt_engine, language, trace_id), phrase_matcher, skill_pool, trace_id)
+                if job is None:
+                    unmatched += 1
+                elif skill_pool.wait(job, timeout) is False:
+                    skill_pool.cancel(job)
+        elapsed = perf_counter() - start
+
+        logging.flush()
+        summary = trace.summarize(trace.trace_file)
+    finally:
+        skill_pool.close(kill=True)
+        trace.set_trace(None)
+        trace.trace_file = old_trace_file
+        if old_tts_engine is None:
+            environ.pop(TTS_ENGINE_ENV, None)
+        else:
+            environ[TTS_ENGINE_ENV] = old_tts_engine
+        path.remove(directory)
+        rmtree(directory)
+
+    summary["spans"].pop("total", None)
+    return {"commands": len(speech_inputs), "commands_per_s": round(len(speech_inputs) / elapsed, 1), "unmatched": unmatched, "spans": summary["spans"]}
@@ -1,13 +1,43 @@
 #!/usr/bin/python3
 
 try:
-    from .utils import aion_data_path as _aion_data_path, BaseXMLReader as _BaseXMLReader, BaseXMLWriter as _BaseXMLWriter
+    from .utils import aion_data_path as _aion_data_path, get_file_signature as _get_file_signature, BaseXMLReader as _BaseXMLReader, BaseXMLWriter as _BaseXMLWriter
 except ImportError:
-    from utils import aion_data_path as _aion_data_path, BaseXMLReader as _BaseXMLReader, BaseXMLWriter as _BaseXMLWriter
+    from utils import aion_data_path as _aion_data_path, get_file_signature as _get_file_signature, BaseXMLReader as _BaseXMLReader, BaseXMLWriter as _BaseXMLWriter
+
+from threading import Lock as _Lock
 
 
 config_file = _aion_data_path + "/config.xml"
 
+_snapshot = {"signature": None, "values": {}}
+_snapshot_lock = _Lock()
+
+
+def _config_snapshot() -> dict:
+    """
+    returns all aion config values, the config file is only parsed again if it has changed since the last call
+
+    :return: dict
+        returns the texts of all elements in the 'aion' element of the config file
+        syntax: {<element tag>: <element text>}
+        example: {"language": "en_US", "tts_engine": "espeak"}
+
+    :since: 0.1.0
+    """
+    from xml.etree.ElementTree import parse
+
+    signature = _get_file_signature(config_file)
+    with _snapshot_lock:
+        if signature != _snapshot["signature"]:
+            values = {}
+            for aion_element in parse(config_file).getroot().iter("aion"):
+                for config in aion_element:
+                    values[config.tag] = config.text
+            _snapshot["values"] = values
+            _snapshot["signature"] = signature
+        return _snapshot["values"]
+
 
 class Aion:
     """
@@ -24,14 +54,131 @@ class Aion:
 
         :since: 0.1.0
         """
+        self.all_audio_handoffs = ["file", "memory"]
         self.all_listening_modes = ["auto", "manual"]
+        self.all_recognition_queue_policies = ["drop_newest", "drop_oldest"]
         self.all_stt_engines = ["google", "pocketsphinx"]
         self.all_time_formats = ["12", "24"]
         self.all_tts_engines = ["pico2wave", "espeak"]
         self.supported_languages = ["de_DE", "en_US"]
 
-        self._aion_cfg_reader = _BaseXMLReader(config_file)
-        self._aion_cfg_writer = _BaseXMLWriter(config_file)
+        self._aion_cfg_writer_instance = None
+
+    @property
+    def _aion_cfg_writer(self) -> _BaseXMLWriter:
+        """
+        returns the writer for the config file (it's only created if something is changed)
+
+        :return: BaseXMLWriter
+            returns the config file writer
+
+        :since: 0.1.0
+        """
+        if self._aion_cfg_writer_instance is None:
+            self._aion_cfg_writer_instance = _BaseXMLWriter(config_file)
+        return self._aion_cfg_writer_instance
+
+    @staticmethod
+    def _get(tag: str, default: str = None) -> str:
+        """
+        get the text of an element in the 'aion' element of the config file
+
+        :param tag: str
+            tag of the element
+            syntax: <tag>
+            example: "language"
+        :param default: str, optional
+            value which is returned if the element doesn't exist
+            syntax: <default>
+            example: "en_US"
+        :return: str
+            returns the text of the element
+            syntax: <text>
+            example: "en_US"
+
+        :since: 0.1.0
+        """
+        return _config_snapshot().get(tag, default)
+
+    def _set(self, tag: str, text: str) -> None:
+        """
+        sets the text of an element in the 'aion' element of the config file (it's created if it doesn't exist) and updates the config snapshot
+
+        :param tag: str
+            tag of the element
+            syntax: <tag>
+            example: "language"
+        :param text: str
+            new text of the element
+            syntax: <text>
+            example: "de_DE"
+        :return: None
+
+        :since: 0.1.0
+        """
+        if tag in _config_snapshot():
+            self._aion_cfg_writer.update("aion", tag, text=text)
+        else:  # 'update' only changes existing elements, the snapshot would have a value which isn't in the file
+            self._aion_cfg_writer.add("aion", tag, text=text)
+        self._aion_cfg_writer.write()
+        with _snapshot_lock:
+            values = dict(_snapshot["values"])
+            values[tag] = text
+            _snapshot["values"] = values
+            _snapshot["signature"] = _get_file_signature(config_file)
+
+    def get_audio_handoff(self) -> str:
+        """
+        get set audio handoff (how the recorded audio is given from the hotword detector to the speech-to-text engine)
+
+        :return: str
+            returns audio handoff
+            syntax: <audio handoff>
+            example: "memory"
+            NOTE: "memory" passes the recorded audio directly, "file" saves it to a '.wav' file first (for debugging)
+
+        :since: 0.1.0
+        """
+        return self._get("audio_handoff", "memory")
+
+    def get_connectivity_check_interval(self) -> float:
+        """
+        get set interval of the internet connection checks (used if the listening mode is 'auto')
+
+        :return: float
+            returns the seconds between two internet connection checks
+            syntax: <interval>
+            example: 10.0
+
+        :since: 0.1.0
+        """
+        return float(self._get("connectivity_check_interval", "10"))
+
+    def get_connectivity_hysteresis(self) -> int:
+        """
+        get set connectivity hysteresis
+
+        :return: int
+            returns the number of internet connection checks in a row with the same result before the speech-to-text engine is changed
+            syntax: <hysteresis>
+            example: 2
+
+        :since: 0.1.0
+        """
+        return int(self._get("connectivity_hysteresis", "2"))
+
+    def get_hot_skills(self) -> list:
+        """
+        get set hot skills
+
+        :return: list
+            returns the skills which are imported when aion starts (all other skills are imported on their first use)
+            syntax: [<skill name>]
+            example: ["skills"]
+
+        :since: 0.1.0
+        """
+        return [skill_name.strip() for skill_name in (self._get("hot_skills", "") or "").split(",") if skill_name.strip()]
 
     def get_hotword_file(self) -> str:
         """
@@ -45,10 +192,7 @@ class Aion:
         :since: 0.1.0
         """
         from glob import glob
-        for value_list in self._aion_cfg_reader.get_infos(["hotword_file"]).values():
-            for config in value_list:
-                if config["parent"]["tag"] == "aion":
-                    return glob(config["text"])[0]
+        return glob(self._get("hotword_file"))[0]
 
     def get_language(self) -> str:
         """
@@ -61,10 +205,7 @@ class Aion:
 
         :since: 0.1.0
         """
-        for value_list in self._aion_cfg_reader.get_infos(["language"]).values():
-            for config in value_list:
-                if config["parent"]["tag"] == "aion":
-                    return config["text"]
+        return self._get("language")
 
     def get_listening_mode(self) -> str:
         """
@@ -77,26 +218,151 @@ class Aion:
 
         :since: 0.1.0
         """
-        for value_list in self._aion_cfg_reader.get_infos(["listening_mode"]).values():
-            for config in value_list:
-                if config["parent"]["tag"] == "aion":
-                    return config["text"]
+        return self._get("listening_mode")
+
+    def get_max_concurrent_skills(self) -> int:
+        """
+        get set maximum number of skills which are executed at the same time
+
+        :return: int
+            returns the maximum number of concurrently running skills (all other skills are waiting until one is finished)
+            syntax: <max concurrent skills>
+            example: 2
+
+        :since: 0.1.0
+        """
+        return int(self._get("max_concurrent_skills", "2"))
+
+    def get_recognition_queue_depth(self) -> int:
+        """
+        get set recognition queue depth
+
+        :return: int
+            returns the maximum number of recordings which are waiting for the speech recognition
+            syntax: <depth>
+            example: 2
+
+        :since: 0.1.0
+        """
+        return int(self._get("recognition_queue_depth", "2"))
+
+    def get_recognition_queue_policy(self) -> str:
+        """
+        get set recognition queue policy (which recording is dropped if the recognition queue is full)
+
+        :return: str
+            returns the recognition queue policy
+            syntax: <policy>
+            example: "drop_oldest"
+            NOTE: "drop_oldest" drops the longest waiting recording, "drop_newest" drops the new recording
+
+        :since: 0.1.0
+        """
+        return self._get("recognition_queue_policy", "drop_oldest")
+
+    def get_recognition_workers(self) -> int:
+        """
+        get set number of recognition workers
+
+        :return: int
+            returns the number of threads which are converting recordings to text at the same time
+            syntax: <number of workers>
+            example: 1
+
+        :since: 0.1.0
+        """
+        return int(self._get("recognition_workers", "1"))
+
+    def get_skill_cgroup(self) -> str:
+        """
+        get set skill cgroup
+
+        :return: str
+            returns the path of a delegated cgroup (v2) in which every skill worker gets its own cgroup for the memory limit and the cpu time accounting (empty = no cgroup)
+            syntax: <path>
+            example: "/sys/fs/cgroup/aion"
+
+        :since: 0.1.0
+        """
+        return self._get("skill_cgroup") or ""
+
+    def get_skill_cpu_time(self) -> int:
+        """
+        get set skill cpu time limit
+
+        :return: int
+            returns the cpu time in seconds a skill may use, if the skill doesn't define its own limit (0 = no limit)
+            syntax: <seconds>
+            example: 30
+
+        :since: 0.1.0
+        """
+        return int(self._get("skill_cpu_time", "0"))
 
-    def get_pid_manipulation_number(self) -> int:
+    def get_skill_memory_limit(self) -> int:
         """
-        get set pid manipulation number
+        get set skill memory limit
 
         :return: int
-            returns the pid manipulation number
-            syntax: <pid manipulation number>
-            example: 4
+            returns the memory in megabytes a skill worker may use while it executes a skill, if the skill doesn't define its own limit (0 = no limit)
+            syntax: <megabytes>
+            example: 200
 
         :since: 0.1.0
         """
-        for value_list in self._aion_cfg_reader.get_infos(["pid_manipulation_number"]).values():
-            for config in value_list:
-                if config["parent"]["tag"] == "aion":
-                    return int(config["text"])
+        return int(self._get("skill_memory_limit", "0"))
+
+    def get_skill_module_budget(self) -> int:
+        """
+        get set skill module budget
+
+        :return: int
+            returns how many skill main files (which aren't hot skills) a skill worker keeps imported before the least recently used get unloaded (0 = no limit)
+            syntax: <number>
+            example: 10
+
+        :since: 0.1.0
+        """
+        return int(self._get("skill_module_budget", "10"))
+
+    def get_skill_timeout(self) -> int:
+        """
+        get set skill timeout
+
+        :return: int
+            returns the seconds after which a running skill gets killed, if the skill doesn't define its own timeout (0 = no timeout)
+            syntax: <seconds>
+            example: 300
+
+        :since: 0.1.0
+        """
+        return int(self._get("skill_timeout", "0"))
+
+    def get_skill_worker_max_jobs(self) -> int:
+        """
+        get set number of jobs after which a skill worker is recycled
+
+        :return: int
+            returns the number of jobs a skill worker runs before it gets replaced by a fresh one
+            syntax: <max jobs>
+            example: 50
+
+        :since: 0.1.0
+        """
+        return int(self._get("skill_worker_max_jobs", "50"))
+
+    def get_skill_worker_pool_size(self) -> int:
+        """
+        get set number of skill worker processes
+
+        :return: int
+            returns the number of long-lived processes which are executing skills
+            syntax: <pool size>
+            example: 2
+
+        :since: 0.1.0
+        """
+        return int(self._get("skill_worker_pool_size", "2"))
 
     def get_stt_engine(self) -> str:
         """
@@ -109,10 +375,20 @@ class Aion:
 
         :since: 0.1.0
         """
-        for value_list in self._aion_cfg_reader.get_infos(["listening_source"]).values():
-            for config in value_list:
-                if config["parent"]["tag"] == "aion":
-                    return config["text"]
+        return self._get("stt_engine")
+
+    def get_stt_grammar_threshold(self) -> float:
+        """
+        get set threshold of the activate phrase grammar (see 'grammar.recognize')
+
+        :return: float
+            returns the confidence (0 - 1) which pocketsphinx must have in a phrase of the grammar, otherwise the full language model is used (0 = always the full language model)
+            syntax: <threshold>
+            example: 0.5
+
+        :since: 0.1.0
+        """
+        return float(self._get("stt_grammar_threshold", "0.5"))
 
     def get_time_format(self) -> int:
         """
@@ -125,10 +401,20 @@ class Aion:
 
         :since: 0.1.0
         """
-        for value_list in self._aion_cfg_reader.get_infos(["time_format"]).values():
-            for config in value_list:
-                if config["parent"]["tag"] == "aion":
-                    return int(config["text"])
+        return int(self._get("time_format", "12"))
+
+    def get_tts_cache_size(self) -> int:
+        """
+        get set size of the synthesized audio cache
+
+        :return: int
+            returns the max. size of the synthesized audio cache in megabytes (0 = no cache)
+            syntax: <size>
+            example: 50
+
+        :since: 0.1.0
+        """
+        return int(self._get("tts_cache_size", "50"))
 
     def get_tts_engine(self) -> str:
         """
@@ -141,10 +427,7 @@ class Aion:
 
         :since: 0.1.0
         """
-        for value_list in self._aion_cfg_reader.get_infos(["tts_engine"]).values():
-            for config in value_list:
-                if config["parent"]["tag"] == "aion":
-                    return config["text"]
+        return self._get("tts_engine")
 
     @staticmethod
     def reset() -> None:
@@ -157,17 +440,98 @@ class Aion:
         """
         from locale import getdefaultlocale
 
-        _BaseXMLWriter(config_file).remove("config", "aion")
-        aion_cfg_writer = _BaseXMLWriter(config_file)
-        aion_cfg_writer.add("config", "aion")
-        aion_cfg_writer.add("aion", "hotword_file", text="/usr/local/aion-*/etc/Aion.pmdl")
-        aion_cfg_writer.add("aion", "language", text=str(getdefaultlocale()[0]))
-        aion_cfg_writer.add("aion", "listening_mode", text="auto")
-        aion_cfg_writer.add("aion", "pid_manipulation_number", text="4")
-        aion_cfg_writer.add("aion", "stt_engine", text="pocketsphinx")
-        aion_cfg_writer.add("aion", "time_format", text="12")
-        aion_cfg_writer.add("aion", "tts_engine", text="espeak")
-        aion_cfg_writer.write()
+        with _BaseXMLWriter(config_file).transaction() as aion_cfg_writer:
+            aion_cfg_writer.remove("config", "aion")
+            aion_cfg_writer.add("config", "aion")
+            aion_cfg_writer.add("aion", "audio_handoff", text="memory")
+            aion_cfg_writer.add("aion", "connectivity_check_interval", text="10")
+            aion_cfg_writer.add("aion", "connectivity_hysteresis", text="2")
+            aion_cfg_writer.add("aion", "hot_skills", text="")
+            aion_cfg_writer.add("aion", "hotword_file", text="/usr/local/aion-*/etc/Aion.pmdl")
+            aion_cfg_writer.add("aion", "language", text=str(getdefaultlocale()[0]))
+            aion_cfg_writer.add("aion", "listening_mode", text="auto")
+            aion_cfg_writer.add("aion", "max_concurrent_skills", text="2")
+            aion_cfg_writer.add("aion", "recognition_queue_depth", text="2")
+            aion_cfg_writer.add("aion", "recognition_queue_policy", text="drop_oldest")
+            aion_cfg_writer.add("aion", "recognition_workers", text="1")
+            aion_cfg_writer.add("aion", "skill_cgroup", text="")
+            aion_cfg_writer.add("aion", "skill_cpu_time", text="0")
+            aion_cfg_writer.add("aion", "skill_memory_limit", text="0")
+            aion_cfg_writer.add("aion", "skill_module_budget", text="10")
+            aion_cfg_writer.add("aion", "skill_timeout", text="0")
+            aion_cfg_writer.add("aion", "skill_worker_max_jobs", text="50")
+            aion_cfg_writer.add("aion", "skill_worker_pool_size", text="2")
+            aion_cfg_writer.add("aion", "stt_engine", text="pocketsphinx")
+            aion_cfg_writer.add("aion", "stt_grammar_threshold", text="0.5")
+            aion_cfg_writer.add("aion", "time_format", text="12")
+            aion_cfg_writer.add("aion", "tts_cache_size", text="50")
+            aion_cfg_writer.add("aion", "tts_engine", text="espeak")
+        with _snapshot_lock:
+            _snapshot["signature"] = None
+
+    def set_audio_handoff(self, audio_handoff: str) -> None:
+        """
+        sets the audio handoff
+
+        :param audio_handoff: str
+            new audio handoff
+            syntax: <audio handoff>
+            example: "file"
+        :return: None
+
+        :since: 0.1.0
+        """
+        try:
+            from ._error_codes import config_no_supported_audio_handoff
+        except ImportError:
+            from _error_codes import config_no_supported_audio_handoff
+
+        if audio_handoff in self.all_audio_handoffs:
+            self._set("audio_handoff", str(audio_handoff))
+        else:
+            raise ValueError("Errno: " + config_no_supported_audio_handoff + " - " + str(audio_handoff) + " isn't a supported audio handoff. Please choose from these: " + str(self.all_audio_handoffs))
+
+    def set_connectivity_check_interval(self, connectivity_check_interval: float) -> None:
+        """
+        sets the interval of the internet connection checks
+
+        :param connectivity_check_interval: float
+            new seconds between two internet connection checks
+            syntax: <interval>
+            example: 10
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("connectivity_check_interval", str(float(connectivity_check_interval)))
+
+    def set_connectivity_hysteresis(self, connectivity_hysteresis: int) -> None:
+        """
+        sets the connectivity hysteresis
+
+        :param connectivity_hysteresis: int
+            new number of internet connection checks in a row with the same result before the speech-to-text engine is changed
+            syntax: <hysteresis>
+            example: 2
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("connectivity_hysteresis", str(int(connectivity_hysteresis)))
+
+    def set_hot_skills(self, hot_skills: list) -> None:
+        """
+        sets the hot skills
+
+        :param hot_skills: list
+            new skills which are imported when aion starts
+            syntax: [<skill name>]
+            example: ["skills"]
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("hot_skills", ",".join(hot_skills))
 
     def set_hotword_file(self, hotword_file: str) -> None:
         """
@@ -188,8 +552,7 @@ class Aion:
         from os.path import isfile
 
         if isfile(hotword_file):
-            self._aion_cfg_writer.update("aion", "hotword_file", text=str(hotword_file))
-            self._aion_cfg_writer.write()
+            self._set("hotword_file", str(hotword_file))
         else:
             raise FileNotFoundError("Errno: " + config_no_hotword_file_file + " - Couldn't find file '" + hotword_file + "'")
 
@@ -208,14 +571,12 @@ class Aion:
         from colorama import Fore
 
         if language in self.supported_languages:
-            self._aion_cfg_writer.update("aion", "language", text=str(language))
-            self._aion_cfg_writer.write()
+            self._set("language", str(language))
         else:
             print(Fore.RED + "'" + language + "' isn't an official supported language for speech output (type 'aion.Config.supported_languages' to see all supported languages).\n"
                                               "The complete speech output is now in English. You have to create your own '.lng' file to support your language.\n" +
                                               str(self.supported_languages) + " are the supported languages" + Fore.RESET)
-            self._aion_cfg_writer.update("aion", "language", text=str(language))
-            self._aion_cfg_writer.write()
+            self._set("language", str(language))
 
     def set_listening_mode(self, listening_mode: str) -> None:
         """
@@ -235,25 +596,172 @@ class Aion:
             from _error_codes import config_no_supported_listening_mode
 
         if listening_mode in self.all_listening_modes:
-            self._aion_cfg_writer.update("aion", "listening_mode", text=str(listening_mode))
-            self._aion_cfg_writer.write()
+            self._set("listening_mode", str(listening_mode))
         else:
             raise ValueError("Errno: " + config_no_supported_listening_mode + " - " + str(listening_mode) + " isn't a supported listening mode. Please choose from these: " + str(self.all_listening_modes))
 
-    def set_pid_manipulation_number(self, pid_manipulation_number: int) -> None:
+    def set_max_concurrent_skills(self, max_concurrent_skills: int) -> None:
         """
-        sets the pid manipulation number
+        sets the maximum number of skills which are executed at the same time
 
-        :param pid_manipulation_number: int
-            new pid manipulation number
-            syntax: <pid manipulation number>
-            example: 4
+        :param max_concurrent_skills: int
+            new maximum number of concurrently running skills (can't be higher than the skill worker pool size)
+            syntax: <max concurrent skills>
+            example: 2
         :return: None
 
         :since: 0.1.0
         """
-        self._aion_cfg_writer.update("aion", "listening_mode", text=str(pid_manipulation_number))
-        self._aion_cfg_writer.write()
+        self._set("max_concurrent_skills", str(int(max_concurrent_skills)))
+
+    def set_recognition_queue_depth(self, recognition_queue_depth: int) -> None:
+        """
+        sets the recognition queue depth
+
+        :param recognition_queue_depth: int
+            new maximum number of recordings which are waiting for the speech recognition
+            syntax: <depth>
+            example: 2
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("recognition_queue_depth", str(int(recognition_queue_depth)))
+
+    def set_recognition_queue_policy(self, recognition_queue_policy: str) -> None:
+        """
+        sets the recognition queue policy
+
+        :param recognition_queue_policy: str
+            new recognition queue policy
+            syntax: <policy>
+            example: "drop_newest"
+        :return: None
+
+        :since: 0.1.0
+        """
+        try:
+            from ._error_codes import config_no_supported_recognition_queue_policy
+        except ImportError:
+            from _error_codes import config_no_supported_recognition_queue_policy
+
+        if recognition_queue_policy in self.all_recognition_queue_policies:
+            self._set("recognition_queue_policy", str(recognition_queue_policy))
+        else:
+            raise ValueError("Errno: " + config_no_supported_recognition_queue_policy + " - " + str(recognition_queue_policy) + " isn't a supported recognition queue policy. Please choose from these: " +
+                             str(self.all_recognition_queue_policies))
+
+    def set_recognition_workers(self, recognition_workers: int) -> None:
+        """
+        sets the number of recognition workers
+
+        :param recognition_workers: int
+            new number of threads which are converting recordings to text at the same time
+            syntax: <number of workers>
+            example: 2
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("recognition_workers", str(int(recognition_workers)))
+
+    def set_skill_cgroup(self, skill_cgroup: str) -> None:
+        """
+        sets the skill cgroup
+
+        :param skill_cgroup: str
+            new path of a delegated (writable) cgroup (v2) without own processes, in which every skill worker gets its own cgroup (empty = no cgroup)
+            syntax: <path>
+            example: "/sys/fs/cgroup/aion"
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("skill_cgroup", str(skill_cgroup))
+
+    def set_skill_cpu_time(self, skill_cpu_time: int) -> None:
+        """
+        sets the skill cpu time limit
+
+        :param skill_cpu_time: int
+            new cpu time in seconds a skill may use, if the skill doesn't define its own limit (0 = no limit)
+            syntax: <seconds>
+            example: 30
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("skill_cpu_time", str(int(skill_cpu_time)))
+
+    def set_skill_memory_limit(self, skill_memory_limit: int) -> None:
+        """
+        sets the skill memory limit
+
+        :param skill_memory_limit: int
+            new memory in megabytes a skill worker may use while it executes a skill, if the skill doesn't define its own limit (0 = no limit)
+            syntax: <megabytes>
+            example: 200
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("skill_memory_limit", str(int(skill_memory_limit)))
+
+    def set_skill_module_budget(self, skill_module_budget: int) -> None:
+        """
+        sets the skill module budget
+
+        :param skill_module_budget: int
+            new number of skill main files (which aren't hot skills) a skill worker keeps imported before the least recently used get unloaded (0 = no limit)
+            syntax: <number>
+            example: 10
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("skill_module_budget", str(int(skill_module_budget)))
+
+    def set_skill_timeout(self, skill_timeout: int) -> None:
+        """
+        sets the skill timeout
+
+        :param skill_timeout: int
+            new seconds after which a running skill gets killed, if the skill doesn't define its own timeout (0 = no timeout)
+            syntax: <seconds>
+            example: 300
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("skill_timeout", str(int(skill_timeout)))
+
+    def set_skill_worker_max_jobs(self, skill_worker_max_jobs: int) -> None:
+        """
+        sets the number of jobs after which a skill worker is recycled
+
+        :param skill_worker_max_jobs: int
+            new number of jobs per skill worker
+            syntax: <max jobs>
+            example: 50
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("skill_worker_max_jobs", str(int(skill_worker_max_jobs)))
+
+    def set_skill_worker_pool_size(self, skill_worker_pool_size: int) -> None:
+        """
+        sets the number of skill worker processes
+
+        :param skill_worker_pool_size: int
+            new number of skill worker processes
+            syntax: <pool size>
+            example: 2
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("skill_worker_pool_size", str(int(skill_worker_pool_size)))
 
     def set_stt_engine(self, stt_engine: str) -> None:
         """
@@ -273,11 +781,24 @@ class Aion:
             from _error_codes import config_no_supported_listening_source
 
         if stt_engine in self.all_stt_engines:
-            self._aion_cfg_writer.update("aion", "stt_engine", text=str(stt_engine))
-            self._aion_cfg_writer.write()
+            self._set("stt_engine", str(stt_engine))
         else:
             raise ValueError("Errno: " + config_no_supported_listening_source + " - " + str(stt_engine) + " isn't a supported listening source. Please choose from these: " + str(self.all_stt_engines))
 
+    def set_stt_grammar_threshold(self, stt_grammar_threshold: float) -> None:
+        """
+        sets the threshold of the activate phrase grammar
+
+        :param stt_grammar_threshold: float
+            new confidence (0 - 1) which pocketsphinx must have in a phrase of the grammar (0 = always the full language model)
+            syntax: <threshold>
+            example: 0.6
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("stt_grammar_threshold", str(float(stt_grammar_threshold)))
+
     def set_time_format(self, time_format: str) -> None:
         """
         sets the time format
@@ -296,11 +817,24 @@ class Aion:
             from _error_codes import config_no_supported_time_format
 
         if str(time_format) in self.all_time_formats:
-            self._aion_cfg_writer.update("aion", "time_format", text=str(time_format))
-            self._aion_cfg_writer.write()
+            self._set("time_format", str(time_format))
         else:
             raise ValueError("Error: " + config_no_supported_time_format + " - " + str(time_format) + " isn't a supported time format. Please choose from these: " + str(self.all_time_formats))
 
+    def set_tts_cache_size(self, tts_cache_size: int) -> None:
+        """
+        sets the size of the synthesized audio cache
+
+        :param tts_cache_size: int
+            new max. size of the synthesized audio cache in megabytes (0 = no cache)
+            syntax: <size>
+            example: 50
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._set("tts_cache_size", str(int(tts_cache_size)))
+
     def set_tts_engine(self, tts_engine: str) -> None:
         """
         sets the text-to-speech engine
@@ -319,8 +853,7 @@ class Aion:
             from _error_codes import config_no_supported_tts_engine
 
         if tts_engine in self.all_tts_engines:
-            self._aion_cfg_writer.update("aion", "tts_engine", text=str(tts_engine))
-            self._aion_cfg_writer.write()
+            self._set("tts_engine", str(tts_engine))
         else:
             raise ValueError("Errno: " + config_no_supported_tts_engine + " - " +str(tts_engine) + " isn't a supported tts engine. Please choose from these: " + str(self.all_tts_engines))
 
@@ -430,22 +963,10 @@ def get_entry(name: str, parent_name: str = None, parent_attrib: dict = None) ->
     cfg_reader = _BaseXMLReader(config_file)
     return_dict = {}
 
-    if parent_name:
-        for value_list in cfg_reader.get_infos([name]).values():
-            for entry in value_list:
-                if entry["parent"] == parent_name:
-                    if parent_attrib:
-                        if entry["attrib"] == parent_attrib:
-                            return_dict["text"] = entry["text"]
-                            return_dict["attrib"] = entry["attrib"]
-                            break
-                    else:
-                        return_dict["text"] = entry["text"]
-                        return_dict["attrib"] = entry["attrib"]
-                        break
-    else:
-        return_dict["text"] = cfg_reader.get_infos([name]).items().index(0)["text"]
-        return_dict["attrib"] = cfg_reader.get_infos([name]).items().index(0)["attrib"]
+    for entry in cfg_reader.find(name, parent=parent_name or None, attrib=parent_attrib or None):
+        return_dict["text"] = entry.text
+        return_dict["attrib"] = entry.attrib
+        break
 
     return return_dict
 
@@ -0,0 +1,274 @@
+#!/usr/bin/python3
+
+try:
+    from .config import Aion as _Aion
+    from .utils import aion_data_path as _aion_data_path, live_module_variables as _live_module_variables
+except ImportError:
+    from config import Aion as _Aion
+    from utils import aion_data_path as _aion_data_path, live_module_variables as _live_module_variables
+
+grammar_directory = _aion_data_path + "/grammar"
+
+# characters which have a meaning in jsgf and can't be part of a word
+_jsgf_special_characters = set(";=|*+<>()[]{}/\\\"")
+
+
+def _threshold() -> float:
+    """
+    gets the 'stt_grammar_threshold' of the config (read on every call, so that a long running process notices a change)
+
+    :return: float
+        returns the threshold
+        syntax: <threshold>
+        example: 0.5
+
+    :since: 0.1.0
+    """
+    return _Aion().get_stt_grammar_threshold()
+
+
+# 'threshold' is read from the (cached) config on every access
+__getattr__ = _live_module_variables(globals(), threshold=_threshold)
+
+
+def _acph_phrases(acph_file: str) -> dict:
+    """
+    reads the activate phrases of an '.acph' file from the compiled manifest or, if it's missing or stale, from the file itself
+
+    :param acph_file: str
+        path of the '.acph' file
+        syntax: <filename>
+        example: "/etc/aion_data/language/en_US.acph"
+    :return: dict
+        returns the main file and the method of every activate phrase
+        syntax: {<activate phrase>: [<main file>, <method>]}
+        example: {"tell__and__about": ["skills", "Wikipedia"], "time": ["skills", "CurrentTime"]}
+
+    :since: 0.1.0
+    """
+    try:
+        from .acph import read_acph_file
+        from .manifest import load as load_manifest
+    except ImportError:
+        from acph import read_acph_file
+        from manifest import load as load_manifest
+
+    manifest = load_manifest()
+    if manifest is not None:
+        phrase_dict = manifest.phrases(acph_file)
+        if phrase_dict is not None:
+            return phrase_dict
+    return read_acph_file(acph_file)
+
+
+def _dictionary_words(language_locale: str) -> set:
+    """
+    reads all words of the pocketsphinx pronunciation dictionary of a language (words which aren't in it can't be in a grammar)
+
+    :param language_locale: str
+        language locale
+        syntax: <language locale>
+        example: "en_US"
+    :return: set
+        returns the words or None if 'speech_recognition' or the dictionary isn't installed
+        syntax: {<word>}
+        example: {"about", "time", "tell"}
+
+    :since: 0.1.0
+    """
+    from importlib.util import find_spec
+    from os.path import dirname, isfile
+
+    spec = find_spec("speech_recognition")
+    if spec is None or spec.origin is None:
+        return None
+    for directory in (language_locale, language_locale.replace("_", "-")):
+        dictionary_file = dirname(spec.origin) + "/pocketsphinx-data/" + directory + "/pronounciation-dictionary.dict"
+        if isfile(dictionary_file):
+            words = set()
+            with open(dictionary_file, "r", encoding="utf-8", errors="replace") as file:
+                for line in file:
+                    if line.strip():
+                        words.add(line.split()[0].split("(")[0].lower())  # alternative pronunciations are written as 'word(2)'
+            return words
+    return None
+
+
+def _grammar_phrase(activate_phrase: str, words: set = None) -> str:
+    """
+    converts an activate phrase to the words which must be spoken
+
+    :param activate_phrase: str
+        the activate phrase
+        syntax: <activate phrase>
+        example: "ip_address"
+    :param words: set, optional
+        words of the pronunciation dictionary (None = every word is allowed)
+        syntax: {<word>}
+        example: {"address", "ip"}
+    :return: str
+        returns the spoken words or None if the activate phrase can't be in the grammar
+        (activate phrases with '__and__' are never in it, because their skills need the free text between the parts, e.g. the topic of 'tell__and__about')
+        syntax: <words>
+        example: "ip address"
+
+    :since: 0.1.0
+    """
+    if "__and__" in activate_phrase:
+        return None
+    phrase_words = activate_phrase.lower().replace("_", " ").split()
+    if not phrase_words:
+        return None
+    for word in phrase_words:
+        if _jsgf_special_characters.intersection(word) or (words is not None and word not in words):
+            return None
+    return " ".join(phrase_words)
+
+
+def compile(language_locale: str = None) -> dict:
+    """
+    compiles the activate phrases of the '.acph' files into jsgf grammars, which pocketsphinx uses as fast first pass before the full language model (see 'recognize')
+
+    :param language_locale: str, optional
+        language locale whose grammar should be compiled (None = all languages which have an '.acph' file)
+        syntax: <language locale>
+        example: "en_US"
+    :return: dict
+        returns how many activate phrases are in the grammar of every language
+        syntax: {<language locale>: <number of phrases>}
+        example: {"de_DE": 6, "en_US": 7}
+
+    :since: 0.1.0
+    """
+    try:
+        from .language import language_directory
+        from .utils import _atomic_write
+    except ImportError:
+        from language import language_directory
+        from utils import _atomic_write
+    from os import listdir, makedirs, remove
+    from os.path import isfile
+    from xml.etree.ElementTree import ParseError
+
+    if language_locale is None:
+        try:
+            language_locales = sorted(fname[:-5] for fname in listdir(language_directory) if fname.endswith(".acph"))
+        except OSError:
+            language_locales = []
+    else:
+        language_locales = [language_locale]
+
+    makedirs(grammar_directory, exist_ok=True)
+    counts = {}
+    for locale in language_locales:
+        acph_file = language_directory + "/" + locale + ".acph"
+        try:
+            phrase_dict = _acph_phrases(acph_file) if isfile(acph_file) else {}
+        except ParseError:  # a broken file is reported by the activate phrase matcher, the grammar is only left out
+            phrase_dict = {}
+
+        words = _dictionary_words(locale)
+        phrases = sorted(set(phrase for phrase in (_grammar_phrase(activate_phrase, words) for activate_phrase in phrase_dict) if phrase is not None))
+
+        fname = grammar_file(locale)
+        if phrases:
+            _atomic_write(fname, "#JSGF V1.0;\n\ngrammar " + locale + ";\n\npublic <" + locale + "> = " + " | ".join(phrases) + ";\n")
+        elif isfile(fname):
+            remove(fname)
+        if isfile(grammar_directory + "/" + locale + ".fsg"):  # 'speech_recognition' caches the converted grammar and would keep using the old one
+            remove(grammar_directory + "/" + locale + ".fsg")
+        counts[locale] = len(phrases)
+    return counts
+
+
+def grammar_file(language_locale: str) -> str:
+    """
+    returns the filename of the grammar of a language
+
+    :param language_locale: str
+        language locale
+        syntax: <language locale>
+        example: "en_US"
+    :return: str
+        returns the filename
+        syntax: <filename>
+        example: "/etc/aion_data/grammar/en_US.jsgf"
+
+    :since: 0.1.0
+    """
+    return grammar_directory + "/" + language_locale + ".jsgf"
+
+
+def is_stale(language_locale: str) -> bool:
+    """
+    checks if the grammar of a language is older than its '.acph' file
+
+    :param language_locale: str
+        language locale
+        syntax: <language locale>
+        example: "en_US"
+    :return: bool
+        returns True if the grammar must be compiled again
+        syntax: <boolean>
+        example: False
+
+    :since: 0.1.0
+    """
+    try:
+        from .language import language_directory
+    except ImportError:
+        from language import language_directory
+    from os import stat
+
+    try:
+        acph_time = stat(language_directory + "/" + language_locale + ".acph").st_mtime_ns
+    except OSError:
+        return False
+    try:
+        return stat(grammar_file(language_locale)).st_mtime_ns <= acph_time  # equal times: the file may have been changed after the grammar within the time resolution
+    except OSError:  # no grammar, e.g. because no activate phrase can be in it
+        return True
+
+
+def recognize(audio, language: str, threshold: float = None) -> str:
+    """
+    decodes audio with the activate phrase grammar of a language
+
+    :param audio: speech_recognition.AudioData
+        the recorded audio
+        syntax: <audio>
+        example: sr.AudioData(b"...", 16000, 2)
+    :param language: str
+        language locale of the audio
+        syntax: <language locale>
+        example: "en_US"
+    :param threshold: float, optional
+        confidence (0 - 1) which pocketsphinx must have in the recognized phrase (None = the 'stt_grammar_threshold' from the config)
+        syntax: <threshold>
+        example: 0.5
+    :return: str
+        returns the recognized activate phrase or None if no phrase scores above the threshold (then the full language model must be used)
+        syntax: <speech input>
+        example: "ip address"
+
+    :since: 0.1.0
+    """
+    import speech_recognition as sr
+    from os.path import isfile
+
+    if threshold is None:
+        threshold = _threshold()
+    fname = grammar_file(language)
+    if threshold <= 0 or isfile(fname) is False:
+        return None
+
+    try:
+        decoder = sr.Recognizer().recognize_sphinx(audio_data=audio, language=language, grammar=fname, show_all=True)
+    except RuntimeError:  # e.g. the grammar was replaced while it was converted
+        return None
+    hypothesis = decoder.hyp()
+    if hypothesis is None or not hypothesis.hypstr:
+        return None
+    if decoder.get_logmath().exp(hypothesis.prob) < threshold:
+        return None
+    return hypothesis.hypstr
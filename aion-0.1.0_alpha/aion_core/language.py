@@ -2,10 +2,26 @@
 
 try:
     from .config import Aion as _Aion
-    from .utils import aion_data_path as _aion_data_path
+    from .utils import aion_data_path as _aion_data_path, get_file_signature as _get_file_signature, live_module_variables as _live_module_variables
 except ImportError:
     from config import Aion as _Aion
-    from utils import aion_data_path as _aion_data_path
+    from utils import aion_data_path as _aion_data_path, get_file_signature as _get_file_signature, live_module_variables as _live_module_variables
+
+from threading import Lock as _Lock
+
+
+def _language() -> str:
+    """
+    gets the language of the config (read on every call, so that a long running process notices a language change)
+
+    :return: str
+        returns the language locale
+        syntax: <language locale>
+        example: "en_US"
+
+    :since: 0.1.0
+    """
+    return _Aion().get_language()
 
 
 def _language_file() -> str:
@@ -21,18 +37,147 @@ def _language_file() -> str:
     """
     from colorama import Fore
     from os.path import isfile
+    language = _language()
     if isfile(language_directory + "/" + language + ".lng") is False:
+        if language in _missing_languages:  # 'language_file' is got for every 'start', the warning is only printed once
+            return language_directory + "/en_US.lng"
+        _missing_languages.add(language)
         print(Fore.RED + "didn't found language file in your language. Using the default language file (en_US)" + Fore.RESET)
         return language_directory + "/en_US.lng"
     else:
         return language_directory + "/" + language + ".lng"
 
 
-language = _Aion().get_language()
 language_directory = _aion_data_path + "/language"
-language_file = _language_file()
 supported_languages = ["de_DE", "en_US"]
 
+# 'language' and 'language_file' are read from the (cached) config on every access, so that a long running process notices a language change
+__getattr__ = _live_module_variables(globals(), language=_language, language_file=_language_file)
+
+_catalogs = {}
+_catalogs_lock = _Lock()
+_missing_languages = set()
+
+
+def _catalog(lng_file: str) -> dict:
+    """
+    returns all entries of a '.lng' file, the file is only parsed again if it has changed since the last call
+
+    :param lng_file: str
+        path of the '.lng' file
+        syntax: <filename>
+        example: "/etc/aion_data/language/en_US.lng"
+    :return: dict
+        returns the compiled text variants (see '_compile_template') of every entry
+        syntax: {<skill>.<entry>: [<compiled text>]}
+        example: {"test_skill.test_entry": [(("This is a ", "test"),)]}
+
+    :since: 0.1.0
+    """
+    try:
+        from .manifest import load as load_manifest
+    except ImportError:
+        from manifest import load as load_manifest
+
+    signature = _get_file_signature(lng_file)
+    with _catalogs_lock:
+        if lng_file in _catalogs and _catalogs[lng_file]["signature"] == signature:
+            return _catalogs[lng_file]["entries"]
+
+        manifest = load_manifest()
+        texts = None
+        if manifest is not None:
+            texts = manifest.entries(lng_file)
+        if texts is None:
+            texts = _read_lng_file(lng_file)
+        entries = {entry: [_compile_template(variant) for variant in variants] for entry, variants in texts.items()}
+
+        _catalogs[lng_file] = {"signature": signature, "entries": entries}
+        return entries
+
+
+def _compile_template(text: str) -> (str, tuple):
+    """
+    splits a text into literal parts and format fields, so that it hasn't to be parsed again every time it's formatted
+
+    :param text: str
+        the text
+        syntax: <text>
+        example: "The processor uses {cpu_usage} percent"
+    :return: (str, tuple)
+        returns the literal parts with the name of the field after it or the text itself if it uses format specs or conversions
+        syntax: ((<literal text>, <field name>),)
+        example: (("The processor uses ", "cpu_usage"), (" percent", None))
+
+    :since: 0.1.0
+    """
+    from string import Formatter
+
+    compiled = []
+    try:
+        for literal_text, field_name, format_spec, conversion in Formatter().parse(text):
+            if field_name is not None and (format_spec or conversion or field_name.isidentifier() is False):
+                return text
+            compiled.append((literal_text, field_name))
+    except ValueError:
+        return text
+    return tuple(compiled)
+
+
+def _read_lng_file(lng_file: str) -> dict:
+    """
+    reads all entries of a '.lng' file
+
+    :param lng_file: str
+        path of the '.lng' file
+        syntax: <filename>
+        example: "/etc/aion_data/language/en_US.lng"
+    :return: dict
+        returns the text variants of every entry
+        syntax: {<skill>.<entry>: [<text>]}
+        example: {"test_skill.test_entry": ["This is a {test}"]}
+
+    :since: 0.1.0
+    """
+    from ast import literal_eval
+    from xml.etree.ElementTree import parse
+
+    entries = {}
+    for element in parse(lng_file).getroot().iter():
+        text = element.text or ""
+        variants = [text]
+        if text.startswith("[") and text.endswith("]"):
+            try:
+                variants = [str(variant) for variant in literal_eval(text)]
+            except (SyntaxError, ValueError):
+                pass
+        entries[element.tag] = variants
+    return entries
+
+
+def _render(compiled: (str, tuple), values: dict) -> str:
+    """
+    formats a with '_compile_template' compiled text
+
+    :param compiled: (str, tuple)
+        the compiled text
+        syntax: ((<literal text>, <field name>),)
+        example: (("The processor uses ", "cpu_usage"), (" percent", None))
+    :param values: dict
+        dictionary to format the text
+        syntax: {<field name>: <value>}
+        example: {"cpu_usage": 12.5}
+    :return: str
+        returns the formatted text
+        syntax: <text>
+        example: "The processor uses 12.5 percent"
+
+    :since: 0.1.0
+    """
+    if isinstance(compiled, str):
+        return compiled.format(**values)
+    return "".join([literal_text if field_name is None else literal_text + format(values[field_name]) for literal_text, field_name in compiled])
+
 
 def add_entry(language_locale: str, skill: str, entry_dict: dict = {}) -> None:
     """
@@ -65,16 +210,16 @@ def add_entry(language_locale: str, skill: str, entry_dict: dict = {}) -> None:
     if isfile(lng_file) is False:
         raise FileNotFoundError("Errno: " + language_lng_file_doesnt_exist + " - The file " + lng_file + " doesn't exist")
     try:
-        from .utils import BaseXMLWriter
+        from .utils import BaseXMLReader, BaseXMLWriter
     except ImportError:
-        from utils import BaseXMLWriter
+        from utils import BaseXMLReader, BaseXMLWriter
 
-    lng_adder = BaseXMLWriter(lng_file)
-    for entry, text in entry_dict.items():
-        if exist_entry(language_locale, skill, entry) is True:
-            raise IndexError("Errno: " + language_entry_already_exist + " - The entry " + entry + " already exist")
-        lng_adder.add("<root>", skill + "." + str(entry), text=str(text))
-    lng_adder.write()
+    existing_entries = set(BaseXMLReader(lng_file).root.childs)
+    with BaseXMLWriter(lng_file).transaction() as lng_adder:
+        for entry, text in entry_dict.items():
+            if skill + "." + str(entry) in existing_entries:
+                raise IndexError("Errno: " + language_entry_already_exist + " - The entry " + entry + " already exist")
+            lng_adder.add("<root>", skill + "." + str(entry), text=str(text))
 
 
 def create_lng_file(language_locale: str, extra_dict: dict = {}, **extra: dict) -> None:
@@ -145,10 +290,9 @@ def delete_entry(language_locale: str, skill: str, entry_list: list = []) -> Non
     except ImportError:
         from utils import BaseXMLWriter
 
-    lng_writer = BaseXMLWriter(language_directory + "/" + language_locale + ".lng")
-    for item in entry_list:
-        lng_writer.remove("<root>", str(skill) + "." + str(item))
-    lng_writer.write()
+    with BaseXMLWriter(language_directory + "/" + language_locale + ".lng").transaction() as lng_writer:
+        for item in entry_list:
+            lng_writer.remove("<root>", str(skill) + "." + str(item))
 
 
 def exist_entry(language_locale: str, skill: str, entry: str) -> bool:
@@ -182,11 +326,29 @@ def exist_entry(language_locale: str, skill: str, entry: str) -> bool:
     entry = entry.replace(" ", "_")
 
     lng_reader = BaseXMLReader(language_directory + "/" + language_locale + ".lng")
-    for item in lng_reader.get_infos(["<root>"]).items().index(0):
-        if skill + "." + entry in item["childs"]:
-            return True
-        else:
-            return False
+    for item in lng_reader.find(skill + "." + entry, parent=lng_reader.root.tag):
+        return True
+    return False
+
+
+def load_catalog(lng_file: str = None) -> int:
+    """
+    parses a '.lng' file into the entry catalog of this process if it has changed (e.g. after a skill was installed), so that the next 'start' doesn't have to do it
+
+    :param lng_file: str, optional
+        path of the '.lng' file (None = the file of the current language)
+        syntax: <filename>
+        example: "/etc/aion_data/language/en_US.lng"
+    :return: int
+        returns the number of entries in the catalog
+        syntax: <number of entries>
+        example: 42
+
+    :since: 0.1.0
+    """
+    if lng_file is None:
+        lng_file = _language_file()
+    return len(_catalog(lng_file))
 
 
 def start(skill: str, entry: str, format: dict = {}) -> str:
@@ -212,20 +374,8 @@ def start(skill: str, entry: str, format: dict = {}) -> str:
 
     :since: 0.1.0
     """
-    from ast import literal_eval
     from random import choice
 
-    try:
-        from .utils import BaseXMLReader
-    except ImportError:
-        from utils import BaseXMLReader
-
-    lng_reader = BaseXMLReader(language_file)
-    for item in lng_reader.get_infos([skill + "." + entry]).values().index(0):
-        try:
-            if item["text"].startswith("[") and item["text"].endswith("]"):
-                return str(choice(literal_eval(item["text"]))).format(**format)
-            else:
-                return str(item["text"]).format(**format)
-        except SyntaxError:
-            return str(item["text"]).format(**format)
+    variants = _catalog(_language_file()).get(skill + "." + entry)
+    if variants:
+        return _render(choice(variants), format)
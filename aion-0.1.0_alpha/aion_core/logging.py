@@ -1,7 +1,352 @@
 #!/usr/bin/python3
 
+from threading import Lock as _Lock
 from time import time as _time
 
+_writer = None
+_writer_lock = _Lock()
+
+
+class _LogWriter:
+    """
+    background thread which writes the messages of all 'LogFile' instances of a process
+    the log files stay open and the messages are written in batches
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, flush_interval: float = 1.0, flush_size: int = 65536) -> None:
+        """
+        :param flush_interval: float, optional
+            max. seconds a message waits in the buffer before it gets written
+            syntax: <seconds>
+            example: 1.0
+        :param flush_size: int, optional
+            number of buffered characters after which the buffer gets written immediately
+            syntax: <size>
+            example: 65536
+        :return: None
+
+        :since: 0.1.0
+        """
+        from collections import deque
+        from threading import Event
+
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+
+        self._buffer = deque()
+        self._buffer_size = 0
+        self._files = {}
+        self._files_lock = _Lock()
+        self._thread = None
+        self._wake_up = Event()
+
+    def _file(self, fname: str, mode: str):
+        """
+        returns the open file object of a log file (must be called with '_files_lock')
+
+        :param fname: str
+            filename of the log file
+            syntax: <filename>
+            example: "/etc/aion_data/logs/aion.log"
+        :param mode: str
+            mode in which the file is opened the first time
+            syntax: <mode>
+            example: "a"
+        :return: file object
+
+        :since: 0.1.0
+        """
+        file = self._files.get(fname)
+        if file is None:
+            file = self._files[fname] = open(fname, mode)
+        return file
+
+    def _reopen_replaced(self, fname: str) -> None:
+        """
+        closes the open file object of a log file if the file was renamed or removed (e.g. rotated by another process), so that it's opened again (must be called with '_files_lock')
+
+        :param fname: str
+            filename of the log file
+            syntax: <filename>
+            example: "/etc/aion_data/logs/aion.trace"
+        :return: None
+
+        :since: 0.1.0
+        """
+        from os import fstat, stat
+
+        file = self._files.get(fname)
+        if file is None:
+            return
+        try:
+            if stat(fname).st_ino == fstat(file.fileno()).st_ino:
+                return
+        except OSError:  # the file doesn't exist anymore
+            pass
+        del self._files[fname]
+        try:
+            file.close()
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        """
+        main loop of the writer thread
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        while True:
+            self._wake_up.wait(self.flush_interval)
+            self._wake_up.clear()
+            self.flush()
+
+    def close(self) -> None:
+        """
+        writes all buffered messages and closes the log files
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        self.flush()
+        with self._files_lock:
+            for file in self._files.values():
+                file.close()
+            self._files = {}
+
+    def close_file(self, fname: str) -> None:
+        """
+        writes all buffered messages and closes the open file object of a log file (e.g. before the file gets removed)
+
+        :param fname: str
+            filename of the log file
+            syntax: <filename>
+            example: "/etc/aion_data/logs/aion.log"
+        :return: None
+
+        :since: 0.1.0
+        """
+        self.flush()
+        with self._files_lock:
+            file = self._files.pop(fname, None)
+            if file is not None:
+                file.close()
+
+    def flush(self) -> None:
+        """
+        writes all buffered messages to their log files
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from traceback import print_exc
+
+        with self._files_lock:
+            self._buffer_size = 0
+            written = set()
+            while self._buffer:
+                fname, mode, message = self._buffer.popleft()
+                try:
+                    if fname not in written:
+                        self._reopen_replaced(fname)
+                    self._file(fname, mode).write(message)
+                    written.add(fname)
+                except OSError:
+                    print_exc()
+            for fname in written:
+                try:
+                    self._files[fname].flush()
+                except OSError:
+                    print_exc()
+
+    def rotate(self, fname: str, max_size: int) -> bool:
+        """
+        renames a log file to '<fname>.old' if it's bigger than 'max_size' (the buffered messages are written before and the file is opened again for the next message)
+
+        :param fname: str
+            filename of the log file
+            syntax: <filename>
+            example: "/etc/aion_data/logs/aion.trace"
+        :param max_size: int
+            max. size of the file in bytes
+            syntax: <size>
+            example: 1048576
+        :return: bool
+            returns True if the file was rotated
+            syntax: <boolean>
+            example: False
+
+        :since: 0.1.0
+        """
+        from os import replace, stat
+
+        self.flush()
+        with self._files_lock:
+            try:
+                if stat(fname).st_size <= max_size:
+                    return False
+                replace(fname, fname + ".old")
+            except OSError:
+                return False
+            self._reopen_replaced(fname)
+            return True
+
+    def write(self, fname: str, mode: str, message: str) -> None:
+        """
+        puts a message into the buffer
+
+        :param fname: str
+            filename of the log file
+            syntax: <filename>
+            example: "/etc/aion_data/logs/aion.log"
+        :param mode: str
+            mode in which the file is opened the first time
+            syntax: <mode>
+            example: "a"
+        :param message: str
+            message (with line break) that should be written
+            syntax: <message>
+            example: "[2020-1-1 0:0:0] - main.py(line: 34) - INFO: Test message\n"
+        :return: None
+
+        :since: 0.1.0
+        """
+        if self._thread is None:
+            from threading import Thread
+
+            try:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+            except RuntimeError:  # e.g. while the interpreter shuts down
+                self._thread = None
+                self.write_sync(fname, mode, message)
+                return
+        # 'deque.append' is thread safe, so the callers never wait for the disk
+        self._buffer.append((fname, mode, message))
+        self._buffer_size += len(message)
+        if self._buffer_size >= self.flush_size:
+            self._wake_up.set()
+
+    def write_sync(self, fname: str, mode: str, message: str) -> None:
+        """
+        writes all buffered messages and then the given message directly to the log file
+
+        :param fname: str
+            filename of the log file
+            syntax: <filename>
+            example: "/etc/aion_data/logs/aion.log"
+        :param mode: str
+            mode in which the file is opened the first time
+            syntax: <mode>
+            example: "a"
+        :param message: str
+            message (with line break) that should be written
+            syntax: <message>
+            example: "[2020-1-1 0:0:0] - main.py(line: 34) - CRITICAL: Test message\n"
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._buffer.append((fname, mode, message))
+        self.flush()
+
+
+def _get_writer() -> _LogWriter:
+    """
+    returns the log writer of the current process
+
+    :return: _LogWriter
+
+    :since: 0.1.0
+    """
+    global _writer
+
+    if _writer is not None:
+        return _writer
+    with _writer_lock:
+        if _writer is None:
+            from atexit import register
+
+            _writer = _LogWriter()
+            register(_writer.close)
+        return _writer
+
+
+def _reset_writer() -> None:
+    """
+    drops the inherited log writer in a forked process (the writer thread of the parent doesn't exist there)
+
+    :return: None
+
+    :since: 0.1.0
+    """
+    global _writer, _writer_lock
+
+    _writer = None
+    _writer_lock = _Lock()
+
+
+def close_file(fname: str) -> None:
+    """
+    writes all buffered log messages of this process and closes the log file (see '_LogWriter.close_file')
+
+    :param fname: str
+        filename of the log file
+        syntax: <filename>
+        example: "/etc/aion_data/logs/aion.log"
+    :return: None
+
+    :since: 0.1.0
+    """
+    if _writer is not None:
+        _writer.close_file(fname)
+
+
+def flush() -> None:
+    """
+    writes all buffered log messages of this process, should be called before the process gets killed
+
+    :return: None
+
+    :since: 0.1.0
+    """
+    if _writer is not None:
+        _writer.flush()
+
+
+def rotate(fname: str, max_size: int) -> bool:
+    """
+    renames a log file to '<fname>.old' if it's bigger than 'max_size' (see '_LogWriter.rotate')
+
+    :param fname: str
+        filename of the log file
+        syntax: <filename>
+        example: "/etc/aion_data/logs/aion.trace"
+    :param max_size: int
+        max. size of the file in bytes
+        syntax: <size>
+        example: 1048576
+    :return: bool
+        returns True if the file was rotated
+        syntax: <boolean>
+        example: False
+
+    :since: 0.1.0
+    """
+    return _get_writer().rotate(fname, max_size)
+
+
+try:
+    from os import register_at_fork as _register_at_fork
+    _register_at_fork(after_in_child=_reset_writer)
+except ImportError:
+    pass
+
 
 class LogAll:
     """
@@ -98,6 +443,13 @@ class LogAll:
         self._lineno = caller_infos.lineno
         self._start_time = _time()
 
+        # the loggers are created once, because creating them calls 'inspect.stack', which is very slow
+        self._console_logger = LogConsole(console_log_format)
+        self._file_loggers = {None: LogFile(log_fname, format=file_log_format)}
+        for fname in (critical_fname, debug_fname, error_fname, info_fname, warning_fname):
+            if fname is not None and fname not in self._file_loggers:
+                self._file_loggers[fname] = LogFile(fname, format=file_log_format)
+
     def _format(self, levelname: str, message: str, lineno: int = None) -> dict:
         """
         returns a dict with custom entries
@@ -200,10 +552,11 @@ class LogAll:
 
         :since: 0.1.0
         """
-        LogFile(self.log_fname, format=self._file_log_format).critical(msg, self._format("CRITICAL", msg, lineno=lineno))
+        format_values = self._format("CRITICAL", msg, lineno=lineno)
+        self._file_loggers[None].critical(msg, format_values)
         if self.critical_fname is not None:
-            LogFile(self.critical_fname, format=self._file_log_format).critical(msg, self._format("CRITICAL", msg, lineno=lineno))
-        LogConsole(self._console_log_format).critical(msg, self._format("CRITICAL", msg, lineno=lineno))
+            self._file_loggers[self.critical_fname].critical(msg, format_values)
+        self._console_logger.critical(msg, format_values)
 
     def debug(self, msg: str, lineno: int = None) -> None:
         """
@@ -221,10 +574,11 @@ class LogAll:
 
         :since: 0.1.0
         """
-        LogFile(self.log_fname, format=self._file_log_format).debug(msg, self._format("DEBUG", msg, lineno=lineno))
+        format_values = self._format("DEBUG", msg, lineno=lineno)
+        self._file_loggers[None].debug(msg, format_values)
         if self.debug_fname is not None:
-            LogFile(self.debug_fname, format=self._file_log_format).debug(msg, self._format("DEBUG", msg, lineno=lineno))
-        LogConsole(self._console_log_format).debug(msg, self._format("DEBUG", msg, lineno=lineno))
+            self._file_loggers[self.debug_fname].debug(msg, format_values)
+        self._console_logger.debug(msg, format_values)
 
     def error(self, msg: str, lineno=None) -> None:
         """
@@ -242,10 +596,11 @@ class LogAll:
 
         :since: 0.1.0
         """
-        LogFile(self.log_fname, format=self._file_log_format).error(msg, self._format("ERROR", msg, lineno=lineno))
+        format_values = self._format("ERROR", msg, lineno=lineno)
+        self._file_loggers[None].error(msg, format_values)
         if self.error_fname is not None:
-            LogFile(self.error_fname, format=self._file_log_format).error(msg, self._format("ERROR", msg, lineno=lineno))
-        LogConsole(self._console_log_format).error(msg, self._format("ERROR", msg, lineno=lineno))
+            self._file_loggers[self.error_fname].error(msg, format_values)
+        self._console_logger.error(msg, format_values)
 
     def info(self, msg: str, lineno=None) -> None:
         """
@@ -263,10 +618,11 @@ class LogAll:
 
         :since: 0.1.0
         """
-        LogFile(self.log_fname, format=self._file_log_format).info(msg, self._format("INFO", msg, lineno=lineno))
+        format_values = self._format("INFO", msg, lineno=lineno)
+        self._file_loggers[None].info(msg, format_values)
         if self.info_fname is not None:
-            LogFile(self.log_fname, format=self._file_log_format).info(msg, self._format("INFO", msg, lineno=lineno))
-        LogConsole(self._console_log_format).info(msg, self._format("INFO", msg, lineno=lineno))
+            self._file_loggers[self.info_fname].info(msg, format_values)
+        self._console_logger.info(msg, format_values)
 
     def warning(self, msg: str, lineno=None) -> None:
         """
@@ -284,10 +640,11 @@ class LogAll:
 
         :since: 0.1.0
         """
-        LogFile(self.log_fname, format=self._file_log_format).warning(msg, self._format("WARNING", msg, lineno=lineno))
+        format_values = self._format("WARNING", msg, lineno=lineno)
+        self._file_loggers[None].warning(msg, format_values)
         if self.warning_fname is not None:
-            LogFile(self.warning_fname, format=self._file_log_format).warning(msg, self._format("WARNING", msg, lineno=lineno))
-        LogConsole(self._console_log_format).warning(msg, self._format("WARNING", msg, lineno=lineno))
+            self._file_loggers[self.warning_fname].warning(msg, format_values)
+        self._console_logger.warning(msg, format_values)
 
 
 class LogConsole:
@@ -526,14 +883,15 @@ class LogFile:
     :since: 0.1.0
     """
 
-    def __init__(self, log_fname: str, mode: str = "a", format: str = "[{year}-{month}-{day} {hour}:{minute}:{second}] - {filename}(line: {lineno}) - {levelname}: {message}") -> None:
+    def __init__(self, log_fname: str, mode: str = "a", format: str = "[{year}-{month}-{day} {hour}:{minute}:{second}] - {filename}(line: {lineno}) - {levelname}: {message}",
+                 buffered: bool = True) -> None:
         """
         :param log_fname: str
             filename of the file to which the logging messages should be saved
             syntax: <fname>
             example: "/home/pi/test.log"
         :param mode: str, optional
-            mode to write on file
+            mode to open the file
             syntax: <mode>
             example: "a"
         :param format: str, optional
@@ -554,6 +912,11 @@ class LogFile:
                 lineno          gives the line number back from which the levelname function was called
                 function        gives the function back from which the levelname function was called
                 message         gives the in levelname function given message back
+        :param buffered: bool, optional
+            if True, the messages are written in batches by a background thread, if False, every message is written directly
+            ('critical' messages are always written directly)
+            syntax: <boolean>
+            example: True
         :return: None
 
         :since: 0.1.0
@@ -561,6 +924,7 @@ class LogFile:
         from datetime import datetime
         from inspect import getframeinfo, stack
 
+        self.buffered = buffered
         self.format = format
         self.log_fname = log_fname
         self.mode = mode
@@ -648,7 +1012,7 @@ class LogFile:
 
         return str(str(hour) + ":" + str(minute) + ":" + str(second))
 
-    def _write(self, msg: str) -> None:
+    def _write(self, msg: str, sync: bool = False) -> None:
         """
         writes the given message to the log file
 
@@ -656,13 +1020,18 @@ class LogFile:
             message that should be write to the file
             syntax: <message>
             example: "Test message"
+        :param sync: bool, optional
+            if True, the message (and all buffered messages) are written before the function returns
+            syntax: <boolean>
+            example: False
         :return: None
 
         :since: 0.1.0
         """
-        with open(self.log_fname, self.mode) as file:
-            file.write(msg + "\n")
-            file.close()
+        if self.buffered is True and sync is False:
+            _get_writer().write(self.log_fname, self.mode, msg + "\n")
+        else:
+            _get_writer().write_sync(self.log_fname, self.mode, msg + "\n")
 
     def critical(self, msg: str, _format_values: dict = None) -> None:
         """
@@ -682,9 +1051,9 @@ class LogFile:
         :since: 0.1.0
         """
         if _format_values is None:
-            self._write(self.format.format(**self._format(levelname="CRITICAL", message=msg)))
+            self._write(self.format.format(**self._format(levelname="CRITICAL", message=msg)), sync=True)
         else:
-            self._write(self.format.format(**_format_values))
+            self._write(self.format.format(**_format_values), sync=True)
 
     def debug(self, msg: str, _format_values: dict = None) -> None:
         """
@@ -0,0 +1,353 @@
+#!/usr/bin/python3
+
+try:
+    from . import acph as _acph, language as _language, plugin as _plugin, skill as _skill
+    from .utils import aion_data_path as _aion_data_path, get_file_signature as _get_file_signature
+except ImportError:
+    import acph as _acph, language as _language, plugin as _plugin, skill as _skill
+    from utils import aion_data_path as _aion_data_path, get_file_signature as _get_file_signature
+
+manifest_file = _aion_data_path + "/manifest.db"
+
+MANIFEST_VERSION = 1
+
+_manifests = {}
+
+
+class Manifest:
+    """
+    read only view of a compiled manifest (see 'compile'), which contains the skills, activate phrases, plugins and language entries of all installed skills and plugins
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, fname: str = None) -> None:
+        """
+        :param fname: str, optional
+            filename of the manifest (None = 'manifest_file')
+            syntax: <filename>
+            example: "/etc/aion_data/manifest.db"
+        :return: None
+
+        :since: 0.1.0
+        """
+        from json import loads
+        from sqlite3 import connect
+
+        if fname is None:
+            fname = manifest_file
+        self.fname = fname
+
+        self._connection = connect("file:" + fname + "?mode=ro", uri=True, check_same_thread=False)
+        self._connection.execute("PRAGMA mmap_size = 4194304")
+        header = dict(self._connection.execute("SELECT key, value FROM header"))
+
+        self.version = int(header["version"])
+        self.created = float(header["created"])
+        self.locales = loads(header["locales"])
+        self.sources = {fname: tuple(signature) if signature is not None else None for fname, signature in loads(header["sources"])}
+
+    def close(self) -> None:
+        """
+        closes the manifest
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._connection.close()
+
+    def entries(self, lng_file: str) -> dict:
+        """
+        returns all entries of a '.lng' file
+
+        :param lng_file: str
+            path of the '.lng' file
+            syntax: <filename>
+            example: "/etc/aion_data/language/en_US.lng"
+        :return: dict
+            returns the text variants of every entry or None if the file isn't in the manifest
+            syntax: {<skill>.<entry>: [<text>]}
+            example: {"test_skill.test_entry": ["This is a {test}"]}
+
+        :since: 0.1.0
+        """
+        from json import loads
+
+        locale = _locale(lng_file, ".lng")
+        if locale not in self.locales["lng"]:
+            return None
+        return {entry: loads(variants) for entry, variants in self._connection.execute("SELECT entry, variants FROM entries WHERE locale = ?", (locale,))}
+
+    def is_stale(self) -> bool:
+        """
+        checks if a source of the manifest was changed, added or removed since it was compiled
+
+        :return: bool
+            returns True if the manifest must be compiled again, False if not
+            syntax: <boolean>
+            example: False
+
+        :since: 0.1.0
+        """
+        return self.version != MANIFEST_VERSION or _source_signatures() != self.sources
+
+    def phrases(self, acph_file: str) -> dict:
+        """
+        returns all activate phrases of an '.acph' file with the main file of their skill
+
+        :param acph_file: str
+            path of the '.acph' file
+            syntax: <filename>
+            example: "/etc/aion_data/language/en_US.acph"
+        :return: dict
+            returns the main file (without '.py') and the method of every activate phrase or None if the file isn't in the manifest
+            syntax: {<activate phrase>: [<main file>, <method>]}
+            example: {"tell__and__about": ["skills", "Wikipedia"], "time": ["skills", "CurrentTime"]}
+
+        :since: 0.1.0
+        """
+        locale = _locale(acph_file, ".acph")
+        if locale not in self.locales["acph"]:
+            return None
+        return {phrase: [main_file, method] for phrase, main_file, method in
+                self._connection.execute("SELECT phrases.phrase, skills.main_file, phrases.method FROM phrases LEFT JOIN skills ON phrases.skill = skills.skill WHERE phrases.locale = ?", (locale,))}
+
+    def plugins(self, type: str) -> dict:
+        """
+        returns all plugins of a type
+
+        :param type: (plugin.RUN_AFTER, plugin.RUN_BEFORE)
+            type of the plugins
+            syntax: <plugin type>
+            example: "run_after"
+        :return: dict
+            returns the plugins of every skill
+            syntax: {<skill name>: {<plugin name>: {"method": <plugin method>, "root_plugin": <root plugin name>, <info>: <value>}}}
+            example: {"Play": {"test_plugin_run_test_2": {"method": "TestPlugin", "root_plugin": "test_plugin", "main_file": "test_plugin.py"}}}
+
+        :since: 0.1.0
+        """
+        from json import loads
+
+        index = {}
+        for skill, plugin_name, infos in self._connection.execute("SELECT skill, plugin, infos FROM plugins WHERE type = ?", (type,)):
+            plugins = index.setdefault(skill, {})
+            if plugin_name:  # skills without plugins are stored with an empty plugin name
+                plugins[plugin_name] = loads(infos)
+        return index
+
+    def skills(self) -> dict:
+        """
+        returns the main files of all installed skills
+
+        :return: dict
+            returns the main file (without '.py') of every skill
+            syntax: {<skill name>: <main file>}
+            example: {"skills": "skills"}
+
+        :since: 0.1.0
+        """
+        return dict(self._connection.execute("SELECT skill, main_file FROM skills"))
+
+
+def _locale(fname: str, extension: str) -> str:
+    """
+    returns the language locale of a file in the language directory
+
+    :param fname: str
+        path of the file
+        syntax: <filename>
+        example: "/etc/aion_data/language/en_US.lng"
+    :param extension: str
+        extension of the file
+        syntax: <extension>
+        example: ".lng"
+    :return: str
+        returns the language locale or None if the file isn't in the language directory
+        syntax: <language locale>
+        example: "en_US"
+
+    :since: 0.1.0
+    """
+    from os.path import abspath, basename, dirname
+
+    if dirname(abspath(fname)) != abspath(_language.language_directory) or fname.endswith(extension) is False:
+        return None
+    return basename(fname)[:-len(extension)]
+
+
+def _reset_manifests() -> None:
+    """
+    forgets the opened manifests in a forked process (sqlite connections can't be shared with a child process)
+
+    :return: None
+
+    :since: 0.1.0
+    """
+    _manifests.clear()
+
+
+def _source_signatures() -> dict:
+    """
+    returns the signatures of all files from which the manifest is compiled
+
+    :return: dict
+        returns the signature (see 'utils.get_file_signature') of every source or None if it doesn't exist
+        syntax: {<filename>: <signature>}
+        example: {"/etc/aion_data/skills/skills.xml": (262311, 1593853741265172000, 412)}
+
+    :since: 0.1.0
+    """
+    from os import listdir
+
+    sources = [_skill.skills_file, _plugin.run_after_file, _plugin.run_before_file]
+    try:
+        sources += [_language.language_directory + "/" + fname for fname in sorted(listdir(_language.language_directory)) if fname.endswith((".acph", ".lng"))]
+    except OSError:
+        pass
+
+    signatures = {}
+    for fname in sources:
+        try:
+            signatures[fname] = _get_file_signature(fname)
+        except OSError:
+            signatures[fname] = None
+    return signatures
+
+
+def compile(fname: str = None) -> dict:
+    """
+    compiles 'skills.xml', the plugin files and all '.acph' and '.lng' files into one sqlite file (the manifest), which can be loaded much faster than parsing all the xml files
+
+    :param fname: str, optional
+        filename of the manifest (None = 'manifest_file')
+        syntax: <filename>
+        example: "/etc/aion_data/manifest.db"
+    :return: dict
+        returns how many items of every kind were compiled
+        syntax: {"skills": <number>, "phrases": <number>, "plugins": <number>, "entries": <number>}
+        example: {"skills": 1, "phrases": 7, "plugins": 0, "entries": 21}
+
+    :since: 0.1.0
+    """
+    from json import dumps
+    from os import close, remove, replace
+    from os.path import basename, dirname, isfile
+    from sqlite3 import connect
+    from tempfile import mkstemp
+    from time import time
+    from xml.etree.ElementTree import ParseError, parse
+
+    if fname is None:
+        fname = manifest_file
+
+    sources = _source_signatures()  # taken before the sources are read, so that a change while compiling makes the manifest stale
+    counts = {"skills": 0, "phrases": 0, "plugins": 0, "entries": 0}
+    locales = {"acph": [], "lng": []}
+
+    file_descriptor, tmp_fname = mkstemp(dir=dirname(fname), prefix="." + basename(fname) + ".")
+    close(file_descriptor)
+    try:
+        connection = connect(tmp_fname)
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("CREATE TABLE header (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        connection.execute("CREATE TABLE skills (skill TEXT PRIMARY KEY, main_file TEXT NOT NULL)")
+        connection.execute("CREATE TABLE phrases (locale TEXT NOT NULL, phrase TEXT NOT NULL, skill TEXT NOT NULL, method TEXT NOT NULL, PRIMARY KEY (locale, phrase))")
+        connection.execute("CREATE TABLE plugins (type TEXT NOT NULL, skill TEXT NOT NULL, plugin TEXT NOT NULL, infos TEXT)")
+        connection.execute("CREATE TABLE entries (locale TEXT NOT NULL, entry TEXT NOT NULL, variants TEXT NOT NULL, PRIMARY KEY (locale, entry))")
+        connection.execute("CREATE INDEX plugins_type ON plugins (type)")
+
+        if isfile(_skill.skills_file):
+            for skill_element in parse(_skill.skills_file).getroot():
+                main_file = skill_element.findtext("main_file")
+                if main_file:
+                    connection.execute("INSERT OR REPLACE INTO skills VALUES (?, ?)", (skill_element.tag, "".join(main_file.split(".")[:-1])))
+                    counts["skills"] += 1
+
+        for type, plugin_file in ((_plugin.RUN_AFTER, _plugin.run_after_file), (_plugin.RUN_BEFORE, _plugin.run_before_file)):
+            for skill, plugins in _plugin._read_plugin_file(plugin_file).items():
+                if not plugins:
+                    connection.execute("INSERT INTO plugins VALUES (?, ?, '', NULL)", (type, skill))
+                for plugin_name, infos in plugins.items():
+                    connection.execute("INSERT INTO plugins VALUES (?, ?, ?, ?)", (type, skill, plugin_name, dumps(infos)))
+                    counts["plugins"] += 1
+
+        for source in sources:
+            if sources[source] is None:
+                continue
+            try:
+                if source.endswith(".acph"):
+                    locale = basename(source)[:-5]
+                    rows = [(locale, phrase, skill, method) for phrase, (skill, method) in _acph.read_acph_file(source).items()]
+                    connection.executemany("INSERT OR REPLACE INTO phrases VALUES (?, ?, ?, ?)", rows)
+                    locales["acph"].append(locale)
+                    counts["phrases"] += len(rows)
+                elif source.endswith(".lng"):
+                    locale = basename(source)[:-4]
+                    rows = [(locale, entry, dumps(variants)) for entry, variants in _language._read_lng_file(source).items()]
+                    connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", rows)
+                    locales["lng"].append(locale)
+                    counts["entries"] += len(rows)
+            except ParseError:  # a broken file stays out of the manifest and is parsed (and reported) by its own reader
+                continue
+
+        connection.executemany("INSERT INTO header VALUES (?, ?)", [("version", str(MANIFEST_VERSION)),
+                                                                     ("created", str(time())),
+                                                                     ("locales", dumps(locales)),
+                                                                     ("sources", dumps(sorted(sources.items())))])
+        connection.commit()
+        connection.close()
+        replace(tmp_fname, fname)
+    except BaseException:
+        if isfile(tmp_fname):
+            remove(tmp_fname)
+        raise
+
+    _manifests.pop(fname, None)
+    return counts
+
+
+def load(fname: str = None) -> Manifest:
+    """
+    returns the compiled manifest if it's up to date
+
+    :param fname: str, optional
+        filename of the manifest (None = 'manifest_file')
+        syntax: <filename>
+        example: "/etc/aion_data/manifest.db"
+    :return: Manifest
+        returns the manifest or None if it doesn't exist, can't be read or is stale (then the xml sources must be used)
+
+    :since: 0.1.0
+    """
+    from sqlite3 import Error
+
+    if fname is None:
+        fname = manifest_file
+
+    try:
+        signature = _get_file_signature(fname)
+    except OSError:
+        return None
+
+    cached = _manifests.get(fname)
+    if cached is not None and cached[0] == signature:
+        manifest = cached[1]
+    else:
+        try:
+            manifest = Manifest(fname)
+        except (Error, KeyError, ValueError):
+            return None
+        _manifests[fname] = (signature, manifest)
+
+    if manifest.is_stale():
+        return None
+    return manifest
+
+
+try:
+    from os import register_at_fork as _register_at_fork
+    _register_at_fork(after_in_child=_reset_manifests)
+except ImportError:
+    pass
@@ -0,0 +1,359 @@
+#!/usr/bin/python3
+
+try:
+    from .grammar import recognize as _recognize_grammar
+    from .trace import record as _record, span as _span
+except ImportError:
+    from grammar import recognize as _recognize_grammar
+    from trace import record as _record, span as _span
+
+from time import time as _time
+from traceback import print_exc as _print_exc
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+drop_policies = [DROP_NEWEST, DROP_OLDEST]
+
+
+def _stt_google(audio, language: str) -> str:
+    """
+    converts audio to text with the google speech recognition
+
+    :param audio: speech_recognition.AudioData or str
+        the recorded audio or the filename of a '.wav' file
+        syntax: <audio>
+        example: "/tmp/aion_recording.wav"
+    :param language: str
+        language locale of the audio
+        syntax: <language locale>
+        example: "en_US"
+    :return: str
+        returns the recognized text
+        syntax: <speech input>
+        example: "What time is it"
+
+    :since: 0.1.0
+    """
+    import speech_recognition as sr
+
+    return sr.Recognizer().recognize_google(audio_data=_load_audio(audio), language=language)
+
+
+def _stt_pocketsphinx(audio, language: str) -> str:
+    """
+    converts audio to text with pocketsphinx (offline)
+    the audio is decoded with the activate phrase grammar first (see 'grammar.recognize') and only if no activate phrase scores above the threshold with the full language model
+
+    :param audio: speech_recognition.AudioData or str
+        the recorded audio or the filename of a '.wav' file
+        syntax: <audio>
+        example: "/tmp/aion_recording.wav"
+    :param language: str
+        language locale of the audio
+        syntax: <language locale>
+        example: "en_US"
+    :return: str
+        returns the recognized text
+        syntax: <speech input>
+        example: "What time is it"
+
+    :since: 0.1.0
+    """
+    import speech_recognition as sr
+
+    audio = _load_audio(audio)
+    speech_input = _recognize_grammar(audio, language)
+    if speech_input is not None:
+        return speech_input
+    return sr.Recognizer().recognize_sphinx(audio_data=audio, language=language)
+
+
+def _stt_stub(audio, language: str) -> str:
+    """
+    stt engine for benchmarks, which 'recognizes' the transcript of a recording without any speech recognition
+
+    :param audio: str
+        the filename of a '.wav' file (the transcript is read from the '.txt' file with the same name) or the transcript itself
+        syntax: <audio>
+        example: "/home/pi/corpus/time.wav"
+    :param language: str
+        language locale of the audio (unused)
+        syntax: <language locale>
+        example: "en_US"
+    :return: str
+        returns the transcript
+        syntax: <speech input>
+        example: "What time is it"
+
+    :since: 0.1.0
+    """
+    from os.path import splitext
+
+    if isinstance(audio, str) is False:
+        return ""
+    if audio.endswith(".wav"):
+        with open(splitext(audio)[0] + ".txt", "r") as file:
+            return file.read().strip()
+    return audio
+
+
+def _load_audio(audio):
+    """
+    loads the audio of a '.wav' file
+
+    :param audio: speech_recognition.AudioData or str
+        the recorded audio or the filename of a '.wav' file
+        syntax: <audio>
+        example: "/tmp/aion_recording.wav"
+    :return: speech_recognition.AudioData
+
+    :since: 0.1.0
+    """
+    import speech_recognition as sr
+
+    if isinstance(audio, sr.AudioData):
+        return audio
+    with sr.AudioFile(audio) as source:
+        return sr.Recognizer().record(source)
+
+
+stt_engines = {"google": _stt_google, "pocketsphinx": _stt_pocketsphinx, "stub": _stt_stub}
+
+
+def dispatch(speech_input: str, phrase_matcher, skill_pool, trace_id: str = None) -> int:
+    """
+    searches the activate phrases in the speech input and hands the skill of the first found activate phrase to the skill worker pool (or task table)
+
+    :param speech_input: str
+        the speech input
+        syntax: <speech input>
+        example: "What time is it"
+    :param phrase_matcher: acph.ActivatePhraseMatcher
+        matcher with all activate phrases
+    :param skill_pool: worker.SkillWorkerPool or task.TaskTable
+        pool or task table which executes the skill
+    :param trace_id: str, optional
+        id of the trace of the voice command
+        syntax: <trace id>
+        example: "3f2a9c1e04b7d865"
+    :return: int
+        returns the id of the skill job (or task) or None if no activate phrase was found
+        syntax: <job id>
+        example: 3
+
+    :since: 0.1.0
+    """
+    with _span("matching", trace_id):
+        matches = phrase_matcher.match(speech_input.lower())
+    if not matches:
+        return None
+    activate_phrase, value = matches[0]
+    return skill_pool.submit(value[0], value[1], speech_input, activate_phrase, trace_id)
+
+
+def recognize(audio, stt_engine: str, language: str, trace_id: str = None) -> str:
+    """
+    converts audio to text
+
+    :param audio: speech_recognition.AudioData or str
+        the recorded audio or the filename of a '.wav' file (the 'stub' engine also takes a transcript)
+        syntax: <audio>
+        example: "/tmp/aion_recording.wav"
+    :param stt_engine: str
+        name of the stt engine (key of 'stt_engines')
+        syntax: <stt engine>
+        example: "pocketsphinx"
+    :param language: str
+        language locale of the audio
+        syntax: <language locale>
+        example: "en_US"
+    :param trace_id: str, optional
+        id of the trace of the voice command
+        syntax: <trace id>
+        example: "3f2a9c1e04b7d865"
+    :return: str
+        returns the recognized text
+        syntax: <speech input>
+        example: "What time is it"
+
+    :since: 0.1.0
+    """
+    with _span("stt", trace_id):
+        return stt_engines[stt_engine](audio, language)
+
+
+class RecognitionQueue:
+    """
+    bounded queue between the hotword detector and the speech recognition
+    the detector only puts the recorded audio into the queue and listens again immediately, while one or more worker threads are taking the recordings out of the queue and handle them (speech recognition, matching, ...)
+    if the queue is full, the oldest waiting or the new recording is dropped (see 'drop_policies'). the time a recording has waited is written to the trace as span 'recognition.queue'
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, handler, depth: int = 2, policy: str = DROP_OLDEST, workers: int = 1, on_drop=None) -> None:
+        """
+        :param handler: callable
+            function which is called by the workers with every recording and its trace id
+            syntax: <handler>
+            example: lambda audio, trace_id: print(recognize(audio, "pocketsphinx", "en_US", trace_id))
+        :param depth: int, optional
+            maximum number of recordings which are waiting in the queue
+            syntax: <depth>
+            example: 2
+        :param policy: str, optional
+            which recording is dropped if the queue is full (DROP_OLDEST or DROP_NEWEST)
+            syntax: <policy>
+            example: DROP_OLDEST
+        :param workers: int, optional
+            number of worker threads
+            syntax: <number of workers>
+            example: 1
+        :param on_drop: callable, optional
+            function which is called with every dropped recording and its trace id (e.g. to remove its '.wav' file)
+            syntax: <callback>
+            example: lambda audio, trace_id: print("dropped " + trace_id)
+        :return: None
+
+        :since: 0.1.0
+        """
+        from collections import deque
+        from threading import Condition
+
+        self.handler = handler
+        self.depth = max(1, int(depth))
+        self.policy = policy if policy in drop_policies else DROP_OLDEST
+        self.worker_number = max(1, int(workers))
+        self.on_drop = on_drop
+
+        self.dropped = 0
+        self.processed = 0
+
+        self._condition = Condition()
+        self._queue = deque()
+        self._stopped = False
+        self._workers = []
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _drop(self, item: tuple) -> None:
+        """
+        reports a dropped recording (must be called without the lock held)
+
+        :param item: tuple
+            the dropped recording, its trace id and the time it was put into the queue
+            syntax: (<audio>, <trace id>, <put time>)
+            example: ("/tmp/aion_recording.wav", "3f2a9c1e04b7d865", 1593853741.26)
+        :return: None
+
+        :since: 0.1.0
+        """
+        audio, trace_id, put_time = item
+        _record("recognition.queue", put_time, _time() - put_time, trace_id, "dropped")
+        if self.on_drop is not None:
+            try:
+                self.on_drop(audio, trace_id)
+            except Exception:
+                _print_exc()
+
+    def _work(self) -> None:
+        """
+        main loop of a worker thread
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                audio, trace_id, put_time = self._queue.popleft()
+            _record("recognition.queue", put_time, _time() - put_time, trace_id)
+            try:
+                self.handler(audio, trace_id)
+            except Exception:  # a failed recognition mustn't stop the worker
+                _print_exc()
+            with self._condition:
+                self.processed += 1
+
+    def put(self, audio, trace_id: str = None) -> bool:
+        """
+        puts a recording into the queue (it never blocks)
+
+        :param audio: speech_recognition.AudioData or str
+            the recorded audio or the filename of a '.wav' file
+            syntax: <audio>
+            example: "/tmp/aion_recording.wav"
+        :param trace_id: str, optional
+            id of the trace of the voice command
+            syntax: <trace id>
+            example: "3f2a9c1e04b7d865"
+        :return: bool
+            returns True if the recording was put into the queue, False if it was dropped because the queue is full and the policy is DROP_NEWEST
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        item = (audio, trace_id, _time())
+        dropped_item = None
+        with self._condition:
+            if len(self._queue) >= self.depth:
+                self.dropped += 1
+                if self.policy == DROP_NEWEST:
+                    dropped_item = item
+                else:
+                    dropped_item = self._queue.popleft()
+            if dropped_item is not item:
+                self._queue.append(item)
+                self._condition.notify()
+        if dropped_item is not None:
+            self._drop(dropped_item)
+        return dropped_item is not item
+
+    def start(self) -> None:
+        """
+        starts the worker threads
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from threading import Thread
+
+        self._stopped = False
+        while len(self._workers) < self.worker_number:
+            worker = Thread(target=self._work, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        stops the worker threads after their current recording (waiting recordings are dropped)
+
+        :param timeout: float, optional
+            max. seconds to wait for every worker (None = no limit)
+            syntax: <seconds>
+            example: 5
+        :return: None
+
+        :since: 0.1.0
+        """
+        from threading import current_thread
+
+        with self._condition:
+            self._stopped = True
+            dropped_items = list(self._queue)
+            self._queue.clear()
+            self._condition.notify_all()
+        for item in dropped_items:
+            self._drop(item)
+        for worker in self._workers:
+            if worker is not current_thread():  # a worker can't wait for itself, e.g. if the handler stops the queue
+                worker.join(timeout)
+        self._workers = []
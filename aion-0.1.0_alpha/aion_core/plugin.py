@@ -1,13 +1,13 @@
 #!/usr/bin/python3
 
 try:
-    from .utils import aion_data_path as _aion_data_path, BaseXMLReader as _BaseXMLReader
+    from .utils import aion_data_path as _aion_data_path
 except ImportError:
-    from utils import aion_data_path as _aion_data_path, BaseXMLReader as _BaseXMLReader
+    from utils import aion_data_path as _aion_data_path
 
 
 RUN_AFTER = "run_after"
-RUN_BEFORE = "run_after"
+RUN_BEFORE = "run_before"
 
 
 run_after_path = _aion_data_path + "/plugins/run_after"
@@ -16,6 +16,9 @@ run_before_path = _aion_data_path + "/plugins/run_before"
 run_after_file = _aion_data_path + "/plugins/run_after/run_after.xml"
 run_before_file = _aion_data_path + "/plugins/run_before/run_before.xml"
 
+_plugin_modules = {}
+_registries = {}
+
 
 class RunAfter:
     """
@@ -91,6 +94,215 @@ class RunBefore:
         pass
 
 
+class PluginRegistry:
+    """
+    index of all installed plugins of one type, keyed by the skill to which they belong
+    the index is built once and gets updated incrementally if a plugin is installed or removed
+    the registry can be used like a dict ('registry[<skill name>]' returns the plugins of the skill)
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, type: (RUN_AFTER, RUN_BEFORE)) -> None:
+        """
+        :param type: (RUN_AFTER, RUN_BEFORE)
+            type of the plugins
+            syntax: <plugin type>
+            example: RUN_AFTER
+        :return: None
+
+        :since: 0.1.0
+        """
+        from threading import Lock
+
+        self.type = type
+        if type == RUN_AFTER:
+            self.fname = run_after_file
+        else:
+            self.fname = run_before_file
+
+        self._index = {}
+        self._lock = Lock()
+        self._owners = {}
+        self._signature = None
+
+        self.load()
+
+    def __contains__(self, skill: str) -> bool:
+        return skill in self._index
+
+    def __getitem__(self, skill: str) -> dict:
+        return self._index[skill]
+
+    def __iter__(self):
+        return iter(list(self._index))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, skill: str, plugin_name: str, infos: dict) -> None:
+        """
+        adds a plugin to the index
+
+        :param skill: str
+            name of the skill to which the plugin belongs
+            syntax: <skill name>
+            example: "Play"
+        :param plugin_name: str
+            name (pseudonym) of the plugin
+            syntax: <plugin name>
+            example: "test_plugin_run_test_2"
+        :param infos: dict
+            infos of the plugin
+            syntax: {"method": <plugin method>, "root_plugin": <root plugin name>, <info>: <value>}
+            example: {"method": "TestPlugin", "root_plugin": "test_plugin", "main_file": "test_plugin.py"}
+        :return: None
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            plugins = dict(self._index.get(skill, {}))
+            plugins[plugin_name] = infos
+            self._index[skill] = plugins  # replaced instead of changed, so that skills which use the old slice aren't affected
+            self._owners[plugin_name] = skill
+
+    def all(self) -> dict:
+        """
+        returns all plugins
+
+        :return: dict
+            returns the plugins of every skill
+            syntax: {<skill name>: {<plugin name>: {"method": <plugin method>, "root_plugin": <root plugin name>, <info>: <value>}}}
+            example: {"Play": {"test_plugin_run_test_2": {"method": "TestPlugin", "root_plugin": "test_plugin", "main_file": "test_plugin.py"}}}
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            return dict(self._index)
+
+    def get(self, skill: str, default: dict = None) -> dict:
+        """
+        returns the plugins of a skill
+
+        :param skill: str
+            name of the skill
+            syntax: <skill name>
+            example: "Play"
+        :param default: dict, optional
+            value which is returned if the skill has no plugins (None = an empty dict)
+        :return: dict
+            returns the plugins of the skill
+            syntax: {<plugin name>: {"method": <plugin method>, "root_plugin": <root plugin name>, <info>: <value>}}
+            example: {"test_plugin_run_test_2": {"method": "TestPlugin", "root_plugin": "test_plugin", "main_file": "test_plugin.py"}}
+
+        :since: 0.1.0
+        """
+        try:
+            return self._index[skill]
+        except KeyError:
+            return {} if default is None else default
+
+    def infos(self, plugin_name: str) -> dict:
+        """
+        returns the infos of a plugin
+
+        :param plugin_name: str
+            name (pseudonym) of the plugin
+            syntax: <plugin name>
+            example: "test_plugin_run_test_2"
+        :return: dict
+            returns the infos of the plugin or None if the plugin isn't installed
+            syntax: {"method": <plugin method>, "root_plugin": <root plugin name>, <info>: <value>}
+            example: {"method": "TestPlugin", "root_plugin": "test_plugin", "main_file": "test_plugin.py"}
+
+        :since: 0.1.0
+        """
+        skill = self._owners.get(plugin_name)
+        if skill is None:
+            return None
+        return self._index.get(skill, {}).get(plugin_name)
+
+    def load(self) -> None:
+        """
+        (re)builds the index from the compiled manifest (see 'manifest.compile') or from the plugin file if the manifest is missing or stale
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        try:
+            from .manifest import load as load_manifest
+            from .utils import get_file_signature
+        except ImportError:
+            from manifest import load as load_manifest
+            from utils import get_file_signature
+
+        try:
+            signature = get_file_signature(self.fname)
+        except OSError:  # no plugin file (yet)
+            signature = None
+
+        manifest = load_manifest()
+        if manifest is not None:
+            index = manifest.plugins(self.type)
+        else:
+            index = _read_plugin_file(self.fname)
+        owners = {plugin_name: skill for skill, plugins in index.items() for plugin_name in plugins}
+
+        with self._lock:
+            self._index = index
+            self._owners = owners
+            self._signature = signature
+
+    def refresh(self) -> bool:
+        """
+        rebuilds the index if the plugin file was changed by another process
+
+        :return: bool
+            returns True if the index was rebuilt, False if not
+            syntax: <boolean>
+            example: False
+
+        :since: 0.1.0
+        """
+        try:
+            from .utils import get_file_signature
+        except ImportError:
+            from utils import get_file_signature
+
+        try:
+            signature = get_file_signature(self.fname)
+        except OSError:
+            signature = None
+        if signature == self._signature:
+            return False
+        self.load()
+        return True
+
+    def remove(self, plugin_name: str) -> None:
+        """
+        removes a plugin from the index
+
+        :param plugin_name: str
+            name (pseudonym) of the plugin
+            syntax: <plugin name>
+            example: "test_plugin_run_test_2"
+        :return: None
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            skill = self._owners.pop(plugin_name, None)
+            if skill is None:
+                return
+            plugins = dict(self._index.get(skill, {}))
+            infos = plugins.pop(plugin_name, {})
+            self._index[skill] = plugins
+        main_file = infos.get("main_file")
+        if main_file:
+            _plugin_modules.pop((self.type, "".join(main_file.split(".")[:-1]) or main_file), None)
+
+
 def create_run_after_plugin_file(author: str,
                                  plugin_name: str,
                                  main_file: str,
@@ -340,14 +552,14 @@ def execute_aion_file_type_plugin(fname: str) -> None:
             plugin_run_after_additional_directories_already_exist, plugin_run_before_additional_directories_already_exist, plugin_python3_module_not_found
         from .acph import add_acph
         from .language import add_entry, language_directory
-        from .utils import remove_space, BaseXMLReader, BaseXMLWriter
+        from .utils import remove_space, BaseXMLReader, BaseXMLWriter, FileLock
     except ImportError:
         from _error_codes import plugin_couldnt_find_key, plugin_couldnt_find_plugin_type, plugin_illegal_run_after_pseudonym, plugin_run_after_pseudonym_already_exist,\
             plugin_illegal_run_before_pseudonym, plugin_run_before_pseudonym_already_exist, plugin_file_doesnt_exist_in_setup_dir, plugin_directory_doesnt_exist_in_setup_dir,\
             plugin_run_after_additional_directories_already_exist, plugin_run_before_additional_directories_already_exist, plugin_python3_module_not_found
         from acph import add_acph
         from language import add_entry, language_directory
-        from utils import remove_space, BaseXMLReader, BaseXMLWriter
+        from utils import remove_space, BaseXMLReader, BaseXMLWriter, FileLock
 
     from ast import literal_eval
     from importlib import import_module
@@ -392,94 +604,92 @@ def execute_aion_file_type_plugin(fname: str) -> None:
 
     # ----- #
 
-    if plugin_type == RUN_AFTER:
-        for pseudonym in plugin_methods:
-            if pseudonym == "run_after":
-                raise NameError("Errno: " + plugin_illegal_run_after_pseudonym + " - Illegal name '" + pseudonym + "' in " + str(plugin_methods))
-            try:
-                if pseudonym in get_all_run_after_plugins()[skill]:
+    with FileLock(_aion_data_path):  # no other installation or save may change aion_data between the checks and the installation
+        if plugin_type == RUN_AFTER:
+            for pseudonym in plugin_methods:
+                if pseudonym == "run_after":
+                    raise NameError("Errno: " + plugin_illegal_run_after_pseudonym + " - Illegal name '" + pseudonym + "' in " + str(plugin_methods))
+                if skill not in get_plugin_registry(RUN_AFTER):
+                    is_skill = False
+                elif pseudonym in get_plugin_registry(RUN_AFTER)[skill]:
                     raise NameError("Errno: " + plugin_run_before_pseudonym_already_exist + " - The plugin pseudonym " + plugin_name + " already exist")
-            except KeyError:
-                is_skill = False
-                pass
-
-    elif plugin_type == RUN_BEFORE:
-        for pseudonym in plugin_methods:
-            if pseudonym == "run_before":
-                raise NameError("Errno: " + plugin_illegal_run_before_pseudonym + " - Illegal name '" + pseudonym + "' in " + str(plugin_methods))
-            try:
-                if pseudonym in get_all_run_before_plugins()[skill]:
-                    raise NameError("Errno: " + plugin_run_after_pseudonym_already_exist + " - The plugin pseudonym " + plugin_name + " already exist")
-            except KeyError:
-                is_skill = False
-                pass
 
-    if path.isfile(setup_dir + "/" + main_file) is False:
-        raise FileNotFoundError("Errno: " + plugin_file_doesnt_exist_in_setup_dir + " - The file " + main_file + " doesn't exist in setup dir (" + setup_dir + ")")
-
-    for directory in additional_directories:
-        if path.isdir(setup_dir + "/" + directory) is False:
-            raise NotADirectoryError("Errno: " + plugin_directory_doesnt_exist_in_setup_dir + " - The directory " + directory + " doesn't exist in setup dir (" + setup_dir + ")")
-        if plugin_type == RUN_AFTER:
-            if directory in listdir(run_after_path):
-                raise IsADirectoryError("Errno: " + plugin_run_after_additional_directories_already_exist + " - The directory " + directory + " already exist in " + run_after_path)
         elif plugin_type == RUN_BEFORE:
-            if directory in listdir(run_before_path):
-                raise IsADirectoryError("Errno: " + plugin_run_before_additional_directories_already_exist + " - The directory " + directory + " already exist in " + run_before_path)
-
-    # ----- #
-
-    for package in required_python3_packages:
-        call("pip3 install " + package, shell=True)
-        try:
-            import_module(package)
-        except ModuleNotFoundError:
-            raise ModuleNotFoundError("Errno: " + plugin_python3_module_not_found + " - Couldn't install the required python3 package '" + package + "'")
-
-    dat_writer = None
+            for pseudonym in plugin_methods:
+                if pseudonym == "run_before":
+                    raise NameError("Errno: " + plugin_illegal_run_before_pseudonym + " - Illegal name '" + pseudonym + "' in " + str(plugin_methods))
+                if skill not in get_plugin_registry(RUN_BEFORE):
+                    is_skill = False
+                elif pseudonym in get_plugin_registry(RUN_BEFORE)[skill]:
+                    raise NameError("Errno: " + plugin_run_after_pseudonym_already_exist + " - The plugin pseudonym " + plugin_name + " already exist")
 
-    if plugin_type == RUN_AFTER:
-        copy(main_file, run_after_path + "/" + main_file)
+        if path.isfile(setup_dir + "/" + main_file) is False:
+            raise FileNotFoundError("Errno: " + plugin_file_doesnt_exist_in_setup_dir + " - The file " + main_file + " doesn't exist in setup dir (" + setup_dir + ")")
 
         for directory in additional_directories:
-            copytree(directory, run_after_path + "/" + directory)
-
-        for language in language_locales:
-            add_entry(language, plugin_name, language_dict)
-
-        dat_writer = BaseXMLWriter(run_after_file)
-
-        if is_skill is False:
-            dat_writer.add("run_after", skill, type="skill")
-            dat_writer.write()
+            if path.isdir(setup_dir + "/" + directory) is False:
+                raise NotADirectoryError("Errno: " + plugin_directory_doesnt_exist_in_setup_dir + " - The directory " + directory + " doesn't exist in setup dir (" + setup_dir + ")")
+            if plugin_type == RUN_AFTER:
+                if directory in listdir(run_after_path):
+                    raise IsADirectoryError("Errno: " + plugin_run_after_additional_directories_already_exist + " - The directory " + directory + " already exist in " + run_after_path)
+            elif plugin_type == RUN_BEFORE:
+                if directory in listdir(run_before_path):
+                    raise IsADirectoryError("Errno: " + plugin_run_before_additional_directories_already_exist + " - The directory " + directory + " already exist in " + run_before_path)
+
+        # ----- #
+
+        for package in required_python3_packages:
+            call("pip3 install " + package, shell=True)
+            try:
+                import_module(package)
+            except ModuleNotFoundError:
+                raise ModuleNotFoundError("Errno: " + plugin_python3_module_not_found + " - Couldn't install the required python3 package '" + package + "'")
 
-    elif plugin_type == RUN_BEFORE:
-        copy(main_file, run_after_path + "/" + main_file)
+        dat_writer = None
 
-        for directory in additional_directories:
-            copytree(directory, run_after_path + "/" + directory)
+        if plugin_type == RUN_AFTER:
+            copy(main_file, run_after_path + "/" + main_file)
 
-        for language in language_locales:
-            add_entry(language, plugin_name, language_dict)
+            for directory in additional_directories:
+                copytree(directory, run_after_path + "/" + directory)
 
-        dat_writer = BaseXMLWriter(run_before_file)
+            for language in language_locales:
+                add_entry(language, plugin_name, language_dict)
 
-        if is_skill is False:
-            dat_writer.add("run_before", skill, type="skill")
-            dat_writer.write()
+            dat_writer = BaseXMLWriter(run_after_file)
 
-    for pseudonym, method in plugin_methods.values():
-        dat_writer.add(skill, str(pseudonym), parent_attrib={"type": "skill"}, method=method, root_plugin=plugin_name)
-        dat_writer.add(str(pseudonym), "additional_directories", str(additional_directories))
-        dat_writer.add(str(pseudonym), "author", str(author))
-        dat_writer.add(str(pseudonym), "description", str(description))
-        dat_writer.add(str(pseudonym), "language_dict", str(language_dict))
-        dat_writer.add(str(pseudonym), "language_locales", str(language_locales))
-        dat_writer.add(str(pseudonym), "license", str(license))
-        dat_writer.add(str(pseudonym), "main_file", str(main_file))
-        dat_writer.add(str(pseudonym), "required_python3_packages", str(required_python3_packages))
-        dat_writer.add(str(pseudonym), "version", str(version))
-    dat_writer.write()
+        elif plugin_type == RUN_BEFORE:
+            copy(main_file, run_after_path + "/" + main_file)
+
+            for directory in additional_directories:
+                copytree(directory, run_after_path + "/" + directory)
+
+            for language in language_locales:
+                add_entry(language, plugin_name, language_dict)
+
+            dat_writer = BaseXMLWriter(run_before_file)
+
+        with dat_writer.transaction():
+            if is_skill is False:
+                dat_writer.add(plugin_type, skill, type="skill")
+            for pseudonym, method in plugin_methods.items():
+                dat_writer.add(skill, str(pseudonym), parent_attrib={"type": "skill"}, method=method, root_plugin=plugin_name)
+                dat_writer.add(str(pseudonym), "additional_directories", str(additional_directories))
+                dat_writer.add(str(pseudonym), "author", str(author))
+                dat_writer.add(str(pseudonym), "description", str(description))
+                dat_writer.add(str(pseudonym), "language_dict", str(language_dict))
+                dat_writer.add(str(pseudonym), "language_locales", str(language_locales))
+                dat_writer.add(str(pseudonym), "license", str(license))
+                dat_writer.add(str(pseudonym), "main_file", str(main_file))
+                dat_writer.add(str(pseudonym), "required_python3_packages", str(required_python3_packages))
+                dat_writer.add(str(pseudonym), "version", str(version))
+
+        registry = get_plugin_registry(plugin_type)
+        for pseudonym, method in plugin_methods.items():
+            registry.add(skill, str(pseudonym), {"method": method, "root_plugin": plugin_name, "additional_directories": str(additional_directories), "author": str(author),
+                                                 "description": str(description), "language_dict": str(language_dict), "language_locales": str(language_locales),
+                                                 "license": str(license), "main_file": str(main_file), "required_python3_packages": str(required_python3_packages),
+                                                 "version": str(version)})
 
 
 def execute_plugin_file(fname: str) -> None:
@@ -517,34 +727,12 @@ def get_all_run_after_plugins() -> dict:
 
     :return: dict
         returns dict of all plugins + infos
+        syntax: {<skill name>: {<plugin name>: {"method": <plugin method>, "root_plugin": <root plugin name>, <info>: <value>}}}
+        example: {"Play": {"test_plugin_run_test_2": {"method": "TestPlugin", "root_plugin": "test_plugin", "main_file": "test_plugin.py"}}}
 
     :since: 0.1.0
     """
-    try:
-        from .utils import is_dict_in_dict
-    except ImportError:
-        from utils import is_dict_in_dict
-
-    run_after = {}
-
-    for value in _BaseXMLReader(run_after_file).get_infos("<all>").values():
-        for child in value:
-            attrib = child["attrib"]
-            parent_tag = child["parent"]["tag"]
-            parent_attrib = child["parent"]["attrib"]
-            if is_dict_in_dict({"type": "skill"}, parent_attrib):
-                try:
-                    run_after[parent_tag][child["tag"]] = {"method": attrib["method"], "root_plugin": attrib["root_plugin"]}
-                except KeyError:
-                    run_after[parent_tag] = {}
-            else:
-                for skill in run_after.values():
-                    for plugin in skill:
-                        if plugin == parent_tag:
-                            run_after[skill][plugin][child["tag"]] = child["text"]
-                            break
-
-    return run_after
+    return get_plugin_registry(RUN_AFTER).all()
 
 
 def get_all_run_before_plugins() -> dict:
@@ -553,34 +741,30 @@ def get_all_run_before_plugins() -> dict:
 
     :return: dict
         returns dict of all plugins + infos
+        syntax: {<skill name>: {<plugin name>: {"method": <plugin method>, "root_plugin": <root plugin name>, <info>: <value>}}}
+        example: {"Play": {"test_plugin_run_test_2": {"method": "TestPlugin", "root_plugin": "test_plugin", "main_file": "test_plugin.py"}}}
 
     :since: 0.1.0
     """
-    try:
-        from .utils import is_dict_in_dict
-    except ImportError:
-        from utils import is_dict_in_dict
-
-    run_before = {}
-
-    for value in _BaseXMLReader(run_before_file).get_infos("<all>").values():
-        for child in value:
-            attrib = child["attrib"]
-            parent_tag = child["parent"]["tag"]
-            parent_attrib = child["parent"]["attrib"]
-            if is_dict_in_dict({"type": "skill"}, parent_attrib):
-                try:
-                    run_before[parent_tag][child["tag"]] = {"method": attrib["method"], "root_plugin": attrib["root_plugin"]}
-                except KeyError:
-                    run_before[parent_tag] = {}
-            else:
-                for skill in run_before.values():
-                    for plugin in skill:
-                        if plugin == parent_tag:
-                            run_before[skill][plugin][child["tag"]] = child["text"]
-                            break
-
-    return run_before
+    return get_plugin_registry(RUN_BEFORE).all()
+
+
+def get_plugin_registry(type: (RUN_AFTER, RUN_BEFORE)) -> PluginRegistry:
+    """
+    returns the plugin registry of the current process for the given plugin type
+
+    :param type: (RUN_AFTER, RUN_BEFORE)
+        type of the plugins
+        syntax: <plugin type>
+        example: RUN_AFTER
+    :return: PluginRegistry
+
+    :since: 0.1.0
+    """
+    registry = _registries.get(type)
+    if registry is None:
+        registry = _registries[type] = PluginRegistry(type)
+    return registry
 
 
 def get_run_after_plugin_infos(plugin_name: str) -> dict:
@@ -620,10 +804,7 @@ def get_run_after_plugin_infos(plugin_name: str) -> dict:
 
     :since: 0.1.0
     """
-    for skill in get_all_run_after_plugins().values():
-        for plugin, infos in skill.values():
-            if plugin == plugin_name:
-                return infos
+    return get_plugin_registry(RUN_AFTER).infos(plugin_name)
 
 
 def get_run_before_plugin_infos(plugin_name: str) -> dict:
@@ -663,10 +844,7 @@ def get_run_before_plugin_infos(plugin_name: str) -> dict:
 
     :since: 0.1.0
     """
-    for skill in get_all_run_before_plugins().values():
-        for plugin, infos in skill.values():
-            if plugin == plugin_name:
-                return infos
+    return get_plugin_registry(RUN_BEFORE).infos(plugin_name)
 
 
 def remove_plugin(plugin_name: str, plugin_type: (RUN_AFTER, RUN_BEFORE)) -> None:
@@ -686,25 +864,27 @@ def remove_plugin(plugin_name: str, plugin_type: (RUN_AFTER, RUN_BEFORE)) -> Non
     """
     try:
         from .language import language_directory, delete_entry
-        from .utils import BaseXMLReader, BaseXMLWriter
+        from .utils import BaseXMLReader, BaseXMLWriter, FileLock
     except ImportError:
         from language import language_directory, delete_entry
-        from utils import BaseXMLReader, BaseXMLWriter
+        from utils import BaseXMLReader, BaseXMLWriter, FileLock
 
     from ast import literal_eval
     from os import remove as remove
     from shutil import rmtree
 
-    if plugin_type == RUN_AFTER:
-        plugin_infos = get_run_after_plugin_infos(plugin_name)
-        remove(run_after_path + "/" + plugin_infos["main_file"])
-        for dir in plugin_infos["additional_directories"]:
-            rmtree(run_after_path + "/" + dir)
-        for language in plugin_infos["language_locales"]:
-            delete_entry(language, plugin_name, entry_list=[key.replace(" ", "_") for key in literal_eval(plugin_infos["language_dict"])])
-        remove_xml = BaseXMLWriter(run_after_file)
-        remove_xml.remove(plugin_infos["method"], plugin_name)
-        remove_xml.write()
+    with FileLock(_aion_data_path):
+        if plugin_type == RUN_AFTER:
+            plugin_infos = get_run_after_plugin_infos(plugin_name)
+            remove(run_after_path + "/" + plugin_infos["main_file"])
+            for dir in plugin_infos["additional_directories"]:
+                rmtree(run_after_path + "/" + dir)
+            for language in plugin_infos["language_locales"]:
+                delete_entry(language, plugin_name, entry_list=[key.replace(" ", "_") for key in literal_eval(plugin_infos["language_dict"])])
+            remove_xml = BaseXMLWriter(run_after_file)
+            remove_xml.remove(plugin_infos["method"], plugin_name)
+            remove_xml.write()
+            get_plugin_registry(RUN_AFTER).remove(plugin_name)
 
 
 def _create_befater_plugin_file(type: (RUN_AFTER, RUN_BEFORE),
@@ -877,6 +1057,41 @@ def _create_befater_plugin_file(type: (RUN_AFTER, RUN_BEFORE),
         file.close()
 
 
+def _read_plugin_file(fname: str) -> dict:
+    """
+    reads all plugins of a plugin file with one pass over the tree (skill -> plugin -> infos)
+
+    :param fname: str
+        path of the plugin file
+        syntax: <filename>
+        example: "/etc/aion_data/plugins/run_after/run_after.xml"
+    :return: dict
+        returns the plugins of every skill (an empty dict if the file doesn't exist or is broken)
+        syntax: {<skill name>: {<plugin name>: {"method": <plugin method>, "root_plugin": <root plugin name>, <info>: <value>}}}
+        example: {"Play": {"test_plugin_run_test_2": {"method": "TestPlugin", "root_plugin": "test_plugin", "main_file": "test_plugin.py"}}}
+
+    :since: 0.1.0
+    """
+    from xml.etree.ElementTree import ParseError, parse
+
+    index = {}
+    try:
+        skill_elements = parse(fname).getroot()
+    except (OSError, ParseError):
+        return index
+
+    for skill_element in skill_elements:
+        if skill_element.attrib.get("type") != "skill":
+            continue
+        plugins = index.setdefault(skill_element.tag, {})
+        for plugin_element in skill_element:
+            plugin_infos = {"method": plugin_element.attrib.get("method"), "root_plugin": plugin_element.attrib.get("root_plugin")}
+            for info_element in plugin_element:
+                plugin_infos[info_element.tag] = info_element.text
+            plugins[plugin_element.tag] = plugin_infos
+    return index
+
+
 def _run_befater_plugin(type: (RUN_AFTER, RUN_BEFORE), fname: str, plugin_name: str, activate_phrase: str, speech_input: str) -> None:
     """
     runs a plugin
@@ -886,9 +1101,9 @@ def _run_befater_plugin(type: (RUN_AFTER, RUN_BEFORE), fname: str, plugin_name:
         syntax: <plugin type>
         example: RUN_AFTER
     :param fname: str
-        file path of the plugin file
+        main file of the plugin (the module is cached after the first import)
         syntax: <filename>
-        example: "/home/pi/test.py"
+        example: "test.py"
     :param plugin_name: str
         name of the plugin
         syntax: <plugin name>
@@ -905,6 +1120,15 @@ def _run_befater_plugin(type: (RUN_AFTER, RUN_BEFORE), fname: str, plugin_name:
 
     :since: 0.1.0
     """
+    from importlib import import_module
     from sys import path
-    path.insert(1, _aion_data_path + "/" + type.lower())
-    exec("__import__('" + fname + "')." + plugin_name + "(" + activate_phrase + ", " + speech_input + ").main()")
\ No newline at end of file
+
+    if fname.endswith(".py"):
+        fname = fname[:-3]
+    module = _plugin_modules.get((type, fname))
+    if module is None:
+        plugin_path = run_after_path if type == RUN_AFTER else run_before_path
+        if plugin_path not in path:
+            path.insert(1, plugin_path)
+        module = _plugin_modules[(type, fname)] = import_module(fname)
+    getattr(module, plugin_name)(activate_phrase, speech_input).main()
\ No newline at end of file
@@ -27,19 +27,30 @@ def load_save(name: str, current_save_name: str = None) -> None:
     """
     try:
         from ._error_codes import save_save_not_found
+        from .utils import FileLock
     except ImportError:
         from _error_codes import save_save_not_found
+        from utils import FileLock
 
-    from os import listdir
-    from shutil import copytree, rmtree
+    from os import listdir, replace
+    from shutil import copytree, ignore_patterns, rmtree
 
     if name not in listdir(save_path):
         raise NotADirectoryError("Errno: " + save_save_not_found + " - Couldn't find the save '" + name + "'")
     else:
-        if current_save_name:
-            save(current_save_name)
-        rmtree(_aion_data_path)
-        copytree(save_path + "/" + name, _aion_data_path)
+        with FileLock(_aion_data_path):
+            if current_save_name:
+                save(current_save_name)
+            # the save is copied next to the aion_data directory first and then swapped in, so that no process sees a half copied aion_data
+            new_path = _aion_data_path + ".new"
+            old_path = _aion_data_path + ".old"
+            rmtree(new_path, ignore_errors=True)
+            rmtree(old_path, ignore_errors=True)
+            copytree(save_path + "/" + name, new_path, ignore=ignore_patterns("saves"))
+            replace(_aion_data_path, old_path)
+            replace(new_path, _aion_data_path)
+            replace(old_path + "/saves", save_path)
+            rmtree(old_path)
 
 
 def save(name: str) -> None:
@@ -56,18 +67,19 @@ def save(name: str) -> None:
     """
     try:
         from ._error_codes import save_save_name_already_exist
-        from .utils import BaseXMLWriter
+        from .utils import BaseXMLWriter, FileLock
     except ImportError:
         from _error_codes import save_save_name_already_exist
-        from utils import BaseXMLWriter
+        from utils import BaseXMLWriter, FileLock
 
     from os import listdir
-    from shutil import copytree
+    from shutil import copytree, ignore_patterns
 
-    if name in listdir(save_path):
-        raise NameError("Errno: " + save_save_name_already_exist + " - The save name '" + name + "' already exists")
-    else:
-        copytree(_aion_data_path, save_path + "/" + name)
+    with FileLock(_aion_data_path, False):
+        if name in listdir(save_path):
+            raise NameError("Errno: " + save_save_name_already_exist + " - The save name '" + name + "' already exists")
+        else:
+            copytree(_aion_data_path, save_path + "/" + name, ignore=ignore_patterns("saves"))
 
 
 def saves() -> list:
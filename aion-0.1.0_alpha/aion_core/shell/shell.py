@@ -24,12 +24,23 @@ Commands:
     save <name>                             saves the current aion_data directory (with a name)
     load <version> [name]                   loads a saved aion_data directory (add optional name to save the current aion_data directory with this name)
     saves                                   shows all saved aion_data directory
+    startup-profile                         starts aion until it's ready to listen, shows the time to ready and the slowest imports
     
     pid                                     shows the pid from the running aion process
     kill                                    kills aion
     stop                                    stops aion      
 
+    compile                                 compiles skills, plugins, activate phrases and language files into one fast loadable manifest and the activate phrases into pocketsphinx grammars
     pack <custom skill / plugin directory>  packs the given directory with a custom skill or plugin into one standalone file for installation
+    prerender [tts engine]                  synthesizes all language entries without parameters into the tts cache
+
+    trace [number of voice commands]        shows how long the parts of the last (or all) voice commands took
+    accounting [number of skill runs]       shows how the last (or all) skill runs ended and how much time, cpu time and memory they used
+
+    benchmark matcher [number of phrases]   compares the activate phrase matcher with the old linear scan
+    benchmark logging [number of messages]  compares buffered log writes with writing every message directly
+    benchmark pipeline [corpus] [stt]       replays transcripts / '.wav' files through stt, matching, skills and a stub tts
+    benchmark xml [number of entries]       compares writing a '.lng' file in one transaction with the old minidom write path
 """
 
 
@@ -57,6 +68,53 @@ def main():
         elif command == "start" or command == "run":
             os.system("python3 " + atils.aion_path + "/main.py")
 
+        elif command == "benchmark":
+            errno = "61882"
+            arglen_check(args.command, 2, 4)
+            benchmark_type = args.command[1]
+            import benchmark
+            if benchmark_type == "matcher":
+                if len(args.command) == 3:
+                    results = benchmark.benchmark_matcher(phrase_number=int(args.command[2]))
+                else:
+                    results = benchmark.benchmark_matcher()
+                print("Activate phrases:  " + str(results["phrases"]))
+                print("Matcher build:     " + str(results["build_ms"]) + " ms")
+                print("Linear scan:       " + str(results["linear_us"]) + " µs per speech input")
+                print("Matcher:           " + str(results["matcher_us"]) + " µs per speech input")
+                print("Speedup:           " + str(results["speedup"]) + "x")
+            elif benchmark_type == "logging":
+                if len(args.command) == 3:
+                    results = benchmark.benchmark_logging(message_number=int(args.command[2]))
+                else:
+                    results = benchmark.benchmark_logging()
+                print("Messages:          " + str(results["messages"]))
+                print("Direct writes:     " + str(results["direct_per_s"]) + " messages/s")
+                print("Buffered writes:   " + str(results["buffered_per_s"]) + " messages/s")
+                print("Speedup:           " + str(results["speedup"]) + "x")
+            elif benchmark_type == "pipeline":
+                if len(args.command) == 4:
+                    results = benchmark.benchmark_pipeline(args.command[2], args.command[3])
+                elif len(args.command) == 3:
+                    results = benchmark.benchmark_pipeline(args.command[2])
+                else:
+                    results = benchmark.benchmark_pipeline()
+                print("Commands: " + str(results["commands"]) + " (" + str(results["unmatched"]) + " without activate phrase), " + str(results["commands_per_s"]) + " commands/s (times in ms)")
+                print("{:<18}{:>7}{:>11}{:>11}{:>11}{:>11}".format("stage", "count", "mean", "p50", "p95", "p99"))
+                for name, stats in results["spans"].items():
+                    print("{:<18}{:>7}{:>11}{:>11}{:>11}{:>11}".format(name, stats["count"], stats["mean"], stats["p50"], stats["p95"], stats["p99"]))
+            elif benchmark_type == "xml":
+                if len(args.command) == 3:
+                    results = benchmark.benchmark_xml_write(entry_number=int(args.command[2]))
+                else:
+                    results = benchmark.benchmark_xml_write()
+                print("Entries:           " + str(results["entries"]))
+                print("Minidom write:     " + str(results["minidom_ms"]) + " ms")
+                print("Transaction:       " + str(results["transaction_ms"]) + " ms")
+                print("Speedup:           " + str(results["speedup"]) + "x")
+            else:
+                AionShellError(benchmark_type + " isn't a benchmark. Type 'aion help' to get help", errno)
+
         elif command == "install":
             errno = "77227"
             arglen_check(args.command, 2)
@@ -84,12 +142,19 @@ def main():
                 AionShellError(package + " is an unknowing skill / plugin. Type 'aion help' for help", errno)
 
         elif args.command in ["kill", "stop"]:  # kist
+            errno = "94213"
             arglen_check(args.command, 1)
             is_aion_running(command)
             import variable
             import signal
             avar = variable.Variable()
-            os.kill(int(avar.get_value("AION_PID")), signal.SIGKILL)
+            try:
+                pid = avar.get_aion_pid()
+            except ValueError as error:
+                AionShellError(str(error), errno)
+            else:
+                avar.release()
+                os.kill(pid, signal.SIGKILL)
 
         elif command == "load":
             arglen_check(args.command, 2, 3)
@@ -115,12 +180,34 @@ def main():
             else:
                 AionShellError("couldn't find directory " + dir, no_dir_errno)
 
+        elif command == "compile":
+            arglen_check(args.command, 1)
+            import manifest
+            counts = manifest.compile()
+            print("Compiled " + ", ".join([str(number) + " " + kind for kind, number in counts.items()]) + " into " + manifest.manifest_file)
+            import grammar
+            grammar_counts = grammar.compile()  # after the manifest, so that the grammars are compiled from the new one
+            print("Compiled " + ", ".join([str(number) + " " + locale + " activate phrases" for locale, number in grammar_counts.items()]) + " into the grammars in " + grammar.grammar_directory)
+
         elif command == "pid":
             arglen_check(args.command, 1)
             is_aion_running(command)
             import variable
             avar = variable.Variable()
-            print(avar.get_value("AION_PID"))
+            try:
+                print(avar.get_value(variable.AION_PID))
+            finally:
+                avar.release()
+
+        elif command == "prerender":
+            errno = "58420"
+            arglen_check(args.command, 1, 2)
+            import tts
+            if len(args.command) == 2 and args.command[1] not in tts.stream_engines:
+                AionShellError(args.command[1] + " isn't a supported tts engine. Please choose from these: " + ", ".join(tts.stream_engines), errno)
+            else:
+                rendered, cached = tts.prerender(args.command[1] if len(args.command) == 2 else None)
+                print("Rendered " + str(rendered) + " language entries (" + str(cached) + " were already cached)")
 
         elif command == "save":
             arglen_check(args.command, 2)
@@ -132,6 +219,29 @@ def main():
             import save as asave
             print(" ".join(asave.saves()))
 
+        elif command == "startup-profile":
+            errno = "62194"
+            arglen_check(args.command, 1)
+            import variable
+            from ast import literal_eval
+            avar = variable.Variable()
+            try:  # a crashed aion doesn't reset 'IS_AION_RUNNING', so the pid is checked too
+                running = literal_eval(avar.get_value(variable.IS_AION_RUNNING)) is True and os.path.isdir("/proc/" + avar.get_value(variable.AION_PID))
+            except KeyError:
+                running = False
+            finally:
+                avar.release()
+            if running:
+                AionShellError("aion is running. Stop it with 'aion stop' before profiling the startup", errno)
+            else:
+                import benchmark
+                results = benchmark.benchmark_startup()
+                print("Time to ready:     " + str(results["ready_ms"]) + " ms")
+                print("Top level imports: " + str(results["import_ms"]) + " ms")
+                print("{:<50}{:>11}{:>14}".format("slowest imports", "self (ms)", "cumul. (ms)"))
+                for name, self_ms, cumulative_ms in results["imports"]:
+                    print("{:<50}{:>11}{:>14}".format(name, self_ms, cumulative_ms))
+
         elif command in ["remove", "uninstall"]:  # UnRem
             errno = "07340"
             arglen_check(args.command, 2)
@@ -177,6 +287,39 @@ def main():
             elif geteuid() == 1000:
                 start(False)
 
+        elif command == "trace":
+            errno = "35166"
+            arglen_check(args.command, 1, 2)
+            import trace as atrace
+            if os.path.isfile(atrace.trace_file) is False:
+                AionShellError("couldn't find the trace file " + atrace.trace_file + ". Start aion and say something to create it", errno)
+            else:
+                if len(args.command) == 2:
+                    summary = atrace.summarize(last=int(args.command[1]))
+                else:
+                    summary = atrace.summarize()
+                print("Traces: " + str(summary["traces"]) + " (times in ms)")
+                print("{:<18}{:>7}{:>7}{:>11}{:>11}{:>11}{:>11}".format("span", "count", "errors", "mean", "p50", "p95", "max"))
+                for name, stats in summary["spans"].items():
+                    print("{:<18}{:>7}{:>7}{:>11}{:>11}{:>11}{:>11}".format(name, stats["count"], stats["errors"], stats["mean"], stats["p50"], stats["p95"], stats["max"]))
+
+        elif command == "accounting":
+            errno = "58307"
+            arglen_check(args.command, 1, 2)
+            import worker
+            if os.path.isfile(worker.accounting_file) is False:
+                AionShellError("couldn't find the accounting file " + worker.accounting_file + ". Start aion and run a skill to create it", errno)
+            else:
+                if len(args.command) == 2:
+                    summary = worker.summarize_accounting(last=int(args.command[1]))
+                else:
+                    summary = worker.summarize_accounting()
+                print("Skill runs: " + str(summary["runs"]) + " (times in ms, memory in kb)")
+                print("{:<30}{:>6}{:>11}{:>11}{:>11}{:>11}{:>11}  {}".format("skill", "runs", "mean", "max", "cpu mean", "cpu max", "peak rss", "statuses"))
+                for name, stats in summary["skills"].items():
+                    print("{:<30}{:>6}{:>11}{:>11}{:>11}{:>11}{:>11}  {}".format(name, stats["runs"], stats["mean"], stats["max"], str(stats["cpu_mean"]), str(stats["cpu_max"]),
+                                                                             str(stats["peak_rss"]), ", ".join(status + ": " + str(runs) for status, runs in stats["statuses"].items())))
+
         elif command == "update":
             errno = "43503"
             arglen_check(args.command, 2)
@@ -201,7 +344,10 @@ def main():
             command_variable = args.command[1]
             import variable
             avar = variable.Variable()
-            print(avar.get_value(command_variable))
+            try:
+                print(avar.get_value(command_variable))
+            finally:
+                avar.release()
 
         elif command == "version":
             errno = "56297"
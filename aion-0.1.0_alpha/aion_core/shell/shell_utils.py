@@ -143,7 +143,12 @@ def is_aion_running(command: str) -> None:
     import variable
     from ast import literal_eval
     from colorama import Fore
-    if literal_eval(variable.Variable().get_value(variable.IS_AION_RUNNING)) is False:
+    avar = variable.Variable()
+    try:
+        is_running = literal_eval(avar.get_value(variable.IS_AION_RUNNING))
+    finally:
+        avar.release()
+    if is_running is False:
         print(Fore.RED + command + " can only used if aion is running. Type 'aion run' or 'aion start' to start aion" + Fore.RESET)
         exit(-1)
 
@@ -187,6 +192,40 @@ def yesno(question: str) -> bool:
             print("Please choose 'y' or 'n'")
 
 
+def _compile() -> None:
+    """
+    compiles the manifest again after a skill or plugin was installed or removed (if it fails, aion reads the xml files instead)
+
+    :return: None
+
+    :since: 0.1.0
+    """
+    from colorama import Fore
+    from manifest import compile
+    from sqlite3 import Error
+    try:
+        compile()
+    except (OSError, Error) as error:
+        print(Fore.YELLOW + "Couldn't compile the manifest: " + str(error) + Fore.RESET)
+
+
+def _prerender() -> None:
+    """
+    synthesizes the language entries of a newly installed skill into the tts cache (a missing tts engine doesn't stop the installation)
+
+    :return: None
+
+    :since: 0.1.0
+    """
+    from colorama import Fore
+    from tts import prerender
+    try:
+        rendered, cached = prerender()
+        print("Rendered " + str(rendered) + " language entries")
+    except (OSError, KeyError) as error:
+        print(Fore.YELLOW + "Couldn't prerender the language entries: " + str(error) + Fore.RESET)
+
+
 class Install:
 
     """
@@ -225,6 +264,7 @@ class Install:
         must_be_sudo()
         from plugin import execute_aion_file_type_plugin
         execute_aion_file_type_plugin(fname)
+        _compile()
 
     @staticmethod
     def plugin_from_plugin_file(fname: str) -> None:
@@ -242,6 +282,7 @@ class Install:
         must_be_sudo()
         from plugin import execute_plugin_file
         execute_plugin_file(fname)
+        _compile()
 
     @staticmethod
     def skill_from_aion_file(fname: str) -> None:
@@ -259,6 +300,8 @@ class Install:
         must_be_sudo()
         from skill import execute_aion_file_type_skill
         execute_aion_file_type_skill(fname)
+        _compile()
+        _prerender()
 
     @staticmethod
     def skill_from_skill_file(fname: str) -> None:
@@ -276,6 +319,8 @@ class Install:
         must_be_sudo()
         from skill import execute_skill_file
         execute_skill_file(fname)
+        _compile()
+        _prerender()
 
     @staticmethod
     def respeaker(compatibility_mode: bool = False) -> None:
@@ -397,6 +442,7 @@ class UnRem:  # this class name combine the word uninstall and remove
         must_be_sudo()
         from plugin import RUN_AFTER, remove_plugin
         remove_plugin(name, RUN_AFTER)
+        _compile()
 
     @staticmethod
     def run_before_plugin(name: str) -> None:
@@ -414,6 +460,7 @@ class UnRem:  # this class name combine the word uninstall and remove
         must_be_sudo()
         from plugin import RUN_BEFORE, remove_plugin
         remove_plugin(name, RUN_BEFORE)
+        _compile()
 
     @staticmethod
     def skill(name: str) -> None:
@@ -431,6 +478,7 @@ class UnRem:  # this class name combine the word uninstall and remove
         must_be_sudo()
         from skill import remove_skill
         remove_skill(name)
+        _compile()
 
     @staticmethod
     def respeaker() -> None:
@@ -28,9 +28,9 @@ class Skill:
             syntax: "<speech input>"
             example: "Start the test"
         :param run_after_plugins: dict
-            all run after plugins
+            all run after plugins (a dict or a 'plugin.PluginRegistry'), only the plugins of this skill are used
         :param run_before_plugins: dict
-            all run before plugins
+            all run before plugins (a dict or a 'plugin.PluginRegistry'), only the plugins of this skill are used
         :return: None
 
         :since: 0.1.0
@@ -95,7 +95,8 @@ class Skill:
             from plugin import _run_befater_plugin, RUN_AFTER
 
         if plugin_name in self.run_after_plugins:
-            _run_befater_plugin(RUN_AFTER, plugin_name, self.run_after_plugins[plugin_name]["method"], self.activate_phrase, self.speech_input)
+            plugin_infos = self.run_after_plugins[plugin_name]
+            _run_befater_plugin(RUN_AFTER, plugin_infos["main_file"], plugin_infos["method"], self.activate_phrase, self.speech_input)
 
     def start_run_before_plugin(self, plugin_name: str) -> None:
         """
@@ -115,7 +116,8 @@ class Skill:
             from plugin import _run_befater_plugin, RUN_BEFORE
 
         if plugin_name in self.run_before_plugins:
-            _run_befater_plugin(RUN_BEFORE, plugin_name, self.run_before_plugins[plugin_name]["method"], self.activate_phrase, self.speech_input)
+            plugin_infos = self.run_before_plugins[plugin_name]
+            _run_befater_plugin(RUN_BEFORE, plugin_infos["main_file"], plugin_infos["method"], self.activate_phrase, self.speech_input)
 
     def speech_output(self, speech_output: str) -> None:
         """
@@ -132,10 +134,379 @@ class Skill:
         try:
             from . import speech_output as _speech_output
         except ImportError:
-            from .__init__ import speech_output as _speech_output
+            from __init__ import speech_output as _speech_output
 
         _speech_output(speech_output)
 
+    def speech_output_stream(self, speech_output: str, block: bool = True):
+        """
+        plays a output of an artificial voice from the given words sentence by sentence (recommended for long texts, because the first sentence is played much earlier)
+
+        :param speech_output: str
+            the words to be said
+            syntax: "<speech output words>"
+            example: "Python is a programming language. It was created by Guido van Rossum."
+        :param block: bool, optional
+            if True, the method returns after the words were said, if False, immediately
+            syntax: <boolean>
+            example: True
+        :return: tts.SpeechStream
+            returns the stream, which can be cancelled with 'cancel()'
+
+        :since: 0.1.0
+        """
+        try:
+            from . import speech_output_stream as _speech_output_stream
+        except ImportError:
+            from __init__ import speech_output_stream as _speech_output_stream
+
+        return _speech_output_stream(speech_output, block)
+
+
+class SkillRegistry:
+    """
+    resolves the main files of the installed skills once and keeps the imported skill classes in a table
+    hot skills are imported at boot, all others on their first use and the least recently used ones are unloaded if more of them are imported than the budget allows
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, hot_skills: list = None, module_budget: int = None) -> None:
+        """
+        :param hot_skills: list, optional
+            skills which are imported by 'preload' and are never unloaded (None = 'hot_skills' from the config)
+            syntax: [<skill name>]
+            example: ["skills"]
+        :param module_budget: int, optional
+            number of cold skill main files which are kept imported (0 = no limit, None = 'skill_module_budget' from the config)
+            syntax: <number>
+            example: 10
+        :return: None
+
+        :since: 0.1.0
+        """
+        from collections import OrderedDict
+        from sys import path
+        from threading import Lock
+
+        if hot_skills is None or module_budget is None:
+            try:
+                from .config import Aion
+            except ImportError:
+                from config import Aion
+            aion = Aion()
+            if hot_skills is None:
+                hot_skills = aion.get_hot_skills()
+            if module_budget is None:
+                module_budget = aion.get_skill_module_budget()
+
+        if skills_path not in path:
+            path.insert(0, skills_path)
+
+        self.hot_skills = hot_skills
+        self.module_budget = module_budget
+
+        self._classes = {}
+        self._in_use = {}
+        self._lock = Lock()
+        self._main_files = None
+        self._modules = OrderedDict()
+        self._signature = None
+
+    def _enforce_budget(self, loaded_main_file: str) -> None:
+        """
+        unloads the least recently used cold skill modules which aren't in use if more of them are imported than the module budget allows (must be called with '_lock')
+
+        :param loaded_main_file: str
+            name of the skill main file (without '.py') which was just imported, it's never unloaded
+            syntax: <main file>
+            example: "skills"
+        :return: None
+
+        :since: 0.1.0
+        """
+        from gc import collect
+
+        if self.module_budget <= 0:
+            return
+        hot_main_files = self.hot_main_files()
+        cold_main_files = [main_file for main_file in self._modules if main_file not in hot_main_files]
+        excess = len(cold_main_files) - self.module_budget
+        if excess <= 0:
+            return
+        unloadable_main_files = [main_file for main_file in cold_main_files if main_file != loaded_main_file and not self._in_use.get(main_file)][:excess]
+        if not unloadable_main_files:  # all are in use, they are unloaded when the next skill gets imported
+            return
+        for main_file in unloadable_main_files:
+            self._unload(main_file)
+        collect()  # the functions of a module reference its globals, so it's only freed by the cycle collector
+
+    @staticmethod
+    def _read_main_files() -> dict:
+        """
+        reads the main files of all skills from the compiled manifest or, if it's missing or stale, from 'skills.xml'
+
+        :return: dict
+            returns the main file (without '.py') of every skill
+            syntax: {<skill name>: <main file>}
+            example: {"skills": "skills"}
+
+        :since: 0.1.0
+        """
+        try:
+            from .manifest import load as load_manifest
+            from .utils import BaseXMLReader
+        except ImportError:
+            from manifest import load as load_manifest
+            from utils import BaseXMLReader
+
+        manifest = load_manifest()
+        if manifest is not None:
+            return manifest.skills()
+        return {skill.parent.tag: "".join(skill.text.split(".")[:-1]) for skill in BaseXMLReader(skills_file).find("main_file")}
+
+    @staticmethod
+    def _skills_file_signature() -> tuple:
+        """
+        returns the signature of 'skills.xml'
+
+        :return: tuple
+            returns the signature (see 'utils.get_file_signature') or None if the file doesn't exist
+            syntax: (<inode>, <modification time in ns>, <size>)
+            example: (262311, 1593853741265172000, 412)
+
+        :since: 0.1.0
+        """
+        try:
+            from .utils import get_file_signature
+        except ImportError:
+            from utils import get_file_signature
+
+        try:
+            return get_file_signature(skills_file)
+        except OSError:
+            return None
+
+    def _unload(self, main_file: str) -> None:
+        """
+        removes a skill module from the table and from 'sys.modules' (must be called with '_lock')
+
+        :param main_file: str
+            name of the skill main file (without '.py')
+            syntax: <main file>
+            example: "skills"
+        :return: None
+
+        :since: 0.1.0
+        """
+        from sys import modules
+
+        self._modules.pop(main_file, None)
+        modules.pop(main_file, None)
+        for key in [key for key in self._classes if key[0] == main_file]:
+            del self._classes[key]
+
+    def get_class(self, main_file: str, method: str):
+        """
+        returns a skill class (its main file gets imported if it isn't loaded yet)
+
+        :param main_file: str
+            name of the skill main file (without '.py')
+            syntax: <main file>
+            example: "skills"
+        :param method: str
+            name of the skill class in the main file
+            syntax: <method>
+            example: "CurrentTime"
+        :return: class
+            returns the skill class
+
+        :since: 0.1.0
+        """
+        from importlib import import_module
+
+        with self._lock:
+            skill_class = self._classes.get((main_file, method))
+            if skill_class is not None:
+                self._modules.move_to_end(main_file)
+                return skill_class
+            module = self._modules.get(main_file)
+            if module is None:
+                module = self._modules[main_file] = import_module(main_file)
+                self._enforce_budget(main_file)
+            else:
+                self._modules.move_to_end(main_file)
+            skill_class = self._classes[(main_file, method)] = getattr(module, method)
+            return skill_class
+
+    def hot_main_files(self) -> list:
+        """
+        returns the main files of the hot skills
+
+        :return: list
+            returns the main files (without '.py')
+            syntax: [<main file>]
+            example: ["skills"]
+
+        :since: 0.1.0
+        """
+        main_files = []
+        for skill_name in self.hot_skills:
+            main_file = self.main_file(skill_name)
+            if main_file is not None:
+                main_files.append(main_file)
+        return main_files
+
+    def loaded(self) -> list:
+        """
+        returns all skill modules that are currently loaded (least recently used first)
+
+        :return: list
+            returns the main files (without '.py')
+            syntax: [<main file>]
+            example: ["skills"]
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            return list(self._modules)
+
+    def main_file(self, skill_name: str) -> str:
+        """
+        returns the main file of a skill (the compiled manifest or 'skills.xml' is only read on the first call)
+
+        :param skill_name: str
+            name of the skill
+            syntax: <skill name>
+            example: "skills"
+        :return: str
+            returns the main file (without '.py') or None if the skill isn't installed
+            syntax: <main file>
+            example: "skills"
+
+        :since: 0.1.0
+        """
+        if self._main_files is None:
+            self._signature = self._skills_file_signature()
+            self._main_files = self._read_main_files()
+        return self._main_files.get(skill_name)
+
+    def preload(self, main_files: list = None) -> list:
+        """
+        imports the hot skills (and the given main files)
+
+        :param main_files: list, optional
+            additional main files (without '.py') which should be imported
+            syntax: [<main file>]
+            example: ["skills"]
+        :return: list
+            returns the main files which couldn't be imported
+            syntax: [<main file>]
+            example: []
+
+        :since: 0.1.0
+        """
+        from importlib import import_module
+        from traceback import print_exc
+
+        failed = []
+        for main_file in self.hot_main_files() + (main_files or []):
+            with self._lock:
+                if main_file in self._modules:
+                    continue
+                try:
+                    self._modules[main_file] = import_module(main_file)
+                except Exception:
+                    print_exc()
+                    failed.append(main_file)
+        return failed
+
+    def refresh(self) -> bool:
+        """
+        unloads all skill modules and reads the main files again if 'skills.xml' was changed by another process (a skill was installed, updated or removed)
+
+        :return: bool
+            returns True if the skills were reloaded, False if not
+            syntax: <boolean>
+            example: False
+
+        :since: 0.1.0
+        """
+        if self._main_files is None or self._skills_file_signature() == self._signature:
+            return False
+        with self._lock:
+            for main_file in list(self._modules):
+                self._unload(main_file)
+        self.reload()
+        return True
+
+    def reload(self) -> None:
+        """
+        reads the main files of all skills again (e.g. after a skill was installed or removed) and swaps them in at once
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        signature = self._skills_file_signature()
+        self._main_files = self._read_main_files()
+        self._signature = signature
+
+    def use(self, main_file: str, method: str):
+        """
+        returns the skill class (see 'get_class') and keeps its main file from being unloaded until the 'with' block is left
+
+        syntax: with <SkillRegistry>.use(<main file>, <method>) as <skill class>:
+        example: with get_registry().use("skills", "CurrentTime") as skill_class:
+                     skill_class("time", "What time is it", {}, {}).main()
+
+        :param main_file: str
+            name of the skill main file (without '.py')
+            syntax: <main file>
+            example: "skills"
+        :param method: str
+            name of the skill class in the main file
+            syntax: <method>
+            example: "CurrentTime"
+        :return: contextmanager
+            returns a context manager which returns the skill class
+
+        :since: 0.1.0
+        """
+        from contextlib import contextmanager
+
+        @contextmanager
+        def use():
+            with self._lock:
+                self._in_use[main_file] = self._in_use.get(main_file, 0) + 1
+            try:
+                yield self.get_class(main_file, method)
+            finally:
+                with self._lock:
+                    self._in_use[main_file] -= 1
+                    if self._in_use[main_file] == 0:
+                        del self._in_use[main_file]
+
+        return use()
+
+
+_registry = None
+
+
+def get_registry() -> SkillRegistry:
+    """
+    returns the skill registry of the current process (forked processes share the already loaded skills with their parent)
+
+    :return: SkillRegistry
+
+    :since: 0.1.0
+    """
+    global _registry
+
+    if _registry is None:
+        _registry = SkillRegistry()
+    return _registry
+
 
 def create_skill_file(activate_phrases: dict,
                       author: str,
@@ -147,6 +518,7 @@ def create_skill_file(activate_phrases: dict,
                       description: str = "",
                       language_dict: dict = {},
                       license: str = "",
+                      limits: dict = {},
                       required_python3_packages: list = []) -> None:
     """
     creates a file from which a skill can be installed
@@ -196,6 +568,11 @@ def create_skill_file(activate_phrases: dict,
         license of the skill
         syntax: <license>
         example: "MPL-2.0"
+    :param limits: dict, optional
+        limits for all classes of the skill ('timeout' and 'cpu_time' in seconds, 'memory' in megabytes, 0 = no limit) and optional different limits for single classes
+        syntax: {<limit>: <value>, <method>: {<limit>: <value>}}
+        example: {"timeout": 60, "cpu_time": 10, "MyTestMethod": {"timeout": 0}}
+        NOTE: a skill which exceeds one of its limits gets killed
     :param required_python3_packages: list, optional
         list of python3 packages your package needs for correct execution
         syntax: [<python3 package>]
@@ -208,12 +585,16 @@ def create_skill_file(activate_phrases: dict,
         from ._error_codes import skill_author_must_be_str, skill_language_locales_must_be_list_or_tuple, skill_skill_name_must_be_str, skill_main_file_must_be_str, skill_main_file_not_found,\
             skill_main_file_name_must_be_skill_name, skill_version_must_be_str, skill_additional_directories_must_be_list_or_tuple, skill_couldnt_find_additional_directories_directory,\
             skill_description_must_be_str, skill_language_dict_must_be_dict, skill_language_dict_character_must_be_in_alphabet, skill_license_must_be_str,\
-            skill_required_python3_package_must_be_list_or_tuple, skill_activate_phrases_must_be_dict, skill_activate_phrases_character_must_be_in_alphabet
+            skill_required_python3_package_must_be_list_or_tuple, skill_activate_phrases_must_be_dict, skill_activate_phrases_character_must_be_in_alphabet, skill_limits_must_be_dict,\
+            skill_limits_invalid_limit
+        from .worker import limit_names
     except ImportError:
         from _error_codes import skill_author_must_be_str, skill_language_locales_must_be_list_or_tuple, skill_skill_name_must_be_str, skill_main_file_must_be_str, skill_main_file_not_found,\
             skill_main_file_name_must_be_skill_name, skill_version_must_be_str, skill_additional_directories_must_be_list_or_tuple, skill_couldnt_find_additional_directories_directory,\
             skill_description_must_be_str, skill_language_dict_must_be_dict, skill_language_dict_character_must_be_in_alphabet, skill_license_must_be_str,\
-            skill_required_python3_package_must_be_list_or_tuple, skill_activate_phrases_must_be_dict, skill_activate_phrases_character_must_be_in_alphabet
+            skill_required_python3_package_must_be_list_or_tuple, skill_activate_phrases_must_be_dict, skill_activate_phrases_character_must_be_in_alphabet, skill_limits_must_be_dict,\
+            skill_limits_invalid_limit
+        from worker import limit_names
 
     from os import getcwd, listdir
 
@@ -273,6 +654,15 @@ def create_skill_file(activate_phrases: dict,
         raise TypeError("Errno: " + skill_license_must_be_str + " - Argument 'license' must be str, got " + type(license).__name__)
     write_dict["license"] = license
 
+    if isinstance(limits, dict) is False:
+        raise TypeError("Errno: " + skill_limits_must_be_dict + " - Argument 'limits' must be dict, got " + type(limits).__name__)
+    for key, value in limits.items():
+        for limit, limit_value in (value.items() if isinstance(value, dict) else [(key, value)]):
+            if limit not in limit_names or isinstance(limit_value, (int, float)) is False or limit_value < 0:
+                raise ValueError("Errno: " + skill_limits_invalid_limit + " - " + str(limit) + " in " + str(key) + " must be one of " + str(limit_names) + " with a positive number (0 = no limit) as value")
+    if limits:
+        write_dict["limits"] = limits
+
     if isinstance(required_python3_packages, (list, tuple)) is False:
         raise TypeError("Errno: " + skill_required_python3_package_must_be_list_or_tuple + " - Argument 'required_python3_packages' must be list or tuple, got " + type(required_python3_packages).__name__)
     write_dict["required_python3_packages"] = required_python3_packages
@@ -365,11 +755,11 @@ def execute_aion_file_type_skill(fname: str) -> None:
             skill_couldnt_install_python3_package
         from .acph import add_acph
         from .language import add_entry, language_directory
-        from .utils import BaseXMLReader, BaseXMLWriter
+        from .utils import BaseXMLReader, BaseXMLWriter, FileLock
     except ImportError:
         from acph import add_acph
         from language import add_entry, language_directory
-        from utils import BaseXMLReader, BaseXMLWriter
+        from utils import BaseXMLReader, BaseXMLWriter, FileLock
         from _error_codes import skill_couldnt_find_key, skill_skill_already_exist, skill_file_doesnt_exist, skill_directory_doesnt_exist, skill_directory_already_exist, \
             skill_couldnt_install_python3_package
 
@@ -396,55 +786,57 @@ def execute_aion_file_type_skill(fname: str) -> None:
         description = setup_dict["description"]
         language_dict = literal_eval(setup_dict["language_dict"])
         license = setup_dict["license"]
+        limits = literal_eval(setup_dict.get("limits", "{}"))  # skill files of older versions don't have limits
         required_python3_packages = literal_eval(setup_dict["required_python3_packages"])
     except KeyError as error:
         raise KeyError("Errno: " + skill_couldnt_find_key + " - Couldn't find key " + str(error) + " in " + fname)
 
     # ----- #
 
-    if skill_name in get_all_skills():
-        raise NameError("Errno: " + skill_skill_already_exist + " - The skill " + skill_name + " already exist")
+    with FileLock(_aion_data_path):  # no other installation or save may change aion_data between the checks and the installation
+        if skill_name in get_all_skills():
+            raise NameError("Errno: " + skill_skill_already_exist + " - The skill " + skill_name + " already exist")
 
-    if path.isfile(setup_dir + "/" + main_file) is False:
-        raise FileNotFoundError("Errno: " + skill_file_doesnt_exist + " - The file " + main_file + " doesn't exist in setup dir (" + setup_dir + ")")
+        if path.isfile(setup_dir + "/" + main_file) is False:
+            raise FileNotFoundError("Errno: " + skill_file_doesnt_exist + " - The file " + main_file + " doesn't exist in setup dir (" + setup_dir + ")")
 
-    for directory in additional_directories:
-        if path.isdir(setup_dir + "/" + directory) is False:
-            raise NotADirectoryError("Errno: " + skill_directory_doesnt_exist + " - The directory " + directory + " doesn't exist in setup dir (" + setup_dir + ")")
-        if directory in listdir(skills_path):
-            raise IsADirectoryError("Errno: " + skill_directory_already_exist + " - The directory " + directory + " already exist in " + skills_path)
+        for directory in additional_directories:
+            if path.isdir(setup_dir + "/" + directory) is False:
+                raise NotADirectoryError("Errno: " + skill_directory_doesnt_exist + " - The directory " + directory + " doesn't exist in setup dir (" + setup_dir + ")")
+            if directory in listdir(skills_path):
+                raise IsADirectoryError("Errno: " + skill_directory_already_exist + " - The directory " + directory + " already exist in " + skills_path)
 
-    # ----- #
+        # ----- #
 
-    for package in required_python3_packages:
-        call("pip3 install " + package, shell=True)
-        try:
-            import_module(package)
-        except ModuleNotFoundError:
-            raise ModuleNotFoundError("Errno: " + skill_couldnt_install_python3_package + " - Couldn't install the required python3 package '" + package + "'")
-
-    copy(main_file, skills_path + "/" + main_file)
-
-    for directory in additional_directories:
-        copytree(directory, skills_path + "/" + directory)
-
-    for language in language_locales:
-        add_acph(language, skill_name, activate_phrases)
-        add_entry(language, skill_name, language_dict)
-
-    dat_writer = BaseXMLWriter(skills_file)
-
-    dat_writer.add("<root>", str(skill_name), author=str(author))
-    dat_writer.add(str(skill_name), "activate_phrases", str(activate_phrases))
-    dat_writer.add(str(skill_name), "additional_directories", str(additional_directories))
-    dat_writer.add(str(skill_name), "description", str(description))
-    dat_writer.add(str(skill_name), "language_dict", str(language_dict))
-    dat_writer.add(str(skill_name), "language_locales", str(language_locales))
-    dat_writer.add(str(skill_name), "license", str(license))
-    dat_writer.add(str(skill_name), "main_file", str(main_file))
-    dat_writer.add(str(skill_name), "required_python3_packages", str(required_python3_packages))
-    dat_writer.add(str(skill_name), "version", str(version))
-    dat_writer.write()
+        for package in required_python3_packages:
+            call("pip3 install " + package, shell=True)
+            try:
+                import_module(package)
+            except ModuleNotFoundError:
+                raise ModuleNotFoundError("Errno: " + skill_couldnt_install_python3_package + " - Couldn't install the required python3 package '" + package + "'")
+
+        copy(main_file, skills_path + "/" + main_file)
+
+        for directory in additional_directories:
+            copytree(directory, skills_path + "/" + directory)
+
+        for language in language_locales:
+            add_acph(language, skill_name, activate_phrases)
+            add_entry(language, skill_name, language_dict)
+
+        with BaseXMLWriter(skills_file).transaction() as dat_writer:
+            dat_writer.add("<root>", str(skill_name), author=str(author))
+            dat_writer.add(str(skill_name), "activate_phrases", str(activate_phrases))
+            dat_writer.add(str(skill_name), "additional_directories", str(additional_directories))
+            dat_writer.add(str(skill_name), "description", str(description))
+            dat_writer.add(str(skill_name), "language_dict", str(language_dict))
+            dat_writer.add(str(skill_name), "language_locales", str(language_locales))
+            dat_writer.add(str(skill_name), "license", str(license))
+            if limits:
+                dat_writer.add(str(skill_name), "limits", str(limits))
+            dat_writer.add(str(skill_name), "main_file", str(main_file))
+            dat_writer.add(str(skill_name), "required_python3_packages", str(required_python3_packages))
+            dat_writer.add(str(skill_name), "version", str(version))
 
 
 def execute_skill_file(fname: str) -> None:
@@ -491,7 +883,7 @@ def get_all_skills() -> list:
         from .utils import BaseXMLReader
     except ImportError:
         from utils import BaseXMLReader
-    return BaseXMLReader(skills_file).get_infos("<root>").items().index(0)[0]["childs"]
+    return BaseXMLReader(skills_file).root.childs
 
 
 def get_skill_infos(skill_name: str) -> dict:
@@ -537,16 +929,12 @@ def get_skill_infos(skill_name: str) -> dict:
     from ast import literal_eval
     skill_reader = BaseXMLReader(skills_file)
     return_dict = {"skill_name": skill_name}
-    for value_list in skill_reader.get_infos("<all>").values():
-        for skill in value_list:
+    for skill in skill_reader.find(skill_name, parent=skill_reader.root.tag):
+        for info in skill.element:
             try:
-                if skill["parent"]["tag"] == skill_name:
-                    try:
-                        return_dict[skill["tag"]] = literal_eval(skill["text"])
-                    except (EOFError, SyntaxError, ValueError):
-                        return_dict[skill["tag"]] = skill["text"]
-            except KeyError:
-                pass
+                return_dict[info.tag] = literal_eval(info.text)
+            except (EOFError, SyntaxError, ValueError):
+                return_dict[info.tag] = info.text
     return return_dict
 
 
@@ -565,21 +953,22 @@ def remove_skill(skill_name: str) -> None:
     try:
         from .acph import delete_acph
         from .language import language_directory, delete_entry
-        from .utils import BaseXMLReader, BaseXMLWriter
+        from .utils import BaseXMLReader, BaseXMLWriter, FileLock
     except ImportError:
         from acph import delete_acph
         from language import language_directory, delete_entry
-        from utils import BaseXMLReader, BaseXMLWriter
+        from utils import BaseXMLReader, BaseXMLWriter, FileLock
 
     from os import remove as os_remove
     from shutil import rmtree
-    skill_infos = get_skill_infos(skill_name)
-    os_remove(skills_path + "/" + skill_infos["main_file"])
-    for dir in skill_infos["additional_directories"]:
-        rmtree(skills_path + "/" + dir)
-    for language in skill_infos["language_locales"]:
-        delete_acph(language, [acph_dict["activate_phrase"] for acph_dict in skill_infos["activate_phrases"]])
-        delete_entry(language, skill_name, entry_list=[key.replace(" ", "_") for key in skill_infos["language_dict"]])
-    remove_xml = BaseXMLWriter(skills_file)
-    remove_xml.remove("<root>", skill_name)
-    remove_xml.write()
+    with FileLock(_aion_data_path):
+        skill_infos = get_skill_infos(skill_name)
+        os_remove(skills_path + "/" + skill_infos["main_file"])
+        for dir in skill_infos["additional_directories"]:
+            rmtree(skills_path + "/" + dir)
+        for language in skill_infos["language_locales"]:
+            delete_acph(language, [acph_dict["activate_phrase"] for acph_dict in skill_infos["activate_phrases"]])
+            delete_entry(language, skill_name, entry_list=[key.replace(" ", "_") for key in skill_infos["language_dict"]])
+        remove_xml = BaseXMLWriter(skills_file)
+        remove_xml.remove("<root>", skill_name)
+        remove_xml.write()
@@ -0,0 +1,442 @@
+#!/usr/bin/python3
+
+try:
+    from .skill import skills_file as _skills_file
+    from .worker import limit_names as _limit_names
+except ImportError:
+    from skill import skills_file as _skills_file
+    from worker import limit_names as _limit_names
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+CANCELLED = "cancelled"
+KILLED = "killed"
+TIMEOUT = "timeout"
+CPU_LIMIT = "cpu_limit"
+MEMORY_LIMIT = "memory_limit"
+
+finished_states = (DONE, ERROR, CANCELLED, KILLED, TIMEOUT, CPU_LIMIT, MEMORY_LIMIT)
+
+# state of a task per job status of the 'worker.SkillWorkerPool'
+_status_states = {"done": DONE, "error": ERROR, "killed": KILLED, "timeout": TIMEOUT, "cpu_limit": CPU_LIMIT, "memory_limit": MEMORY_LIMIT}
+
+
+def get_skill_limits() -> dict:
+    """
+    returns the limits of all skills which have a 'limits' element in the skills file
+    a 'limits' element contains a dict with the limits for all classes of the skill ('timeout' and 'cpu_time' in seconds, 'memory' in megabytes, 0 = no limit)
+    and optional dicts with different limits for single classes
+
+    :return: dict
+        returns the limits per skill main file (without '.py')
+        syntax: {<main file>: {<limit>: <value>, <method>: {<limit>: <value>}}}
+        example: {"skills": {"timeout": 120, "cpu_time": 30, "Play": {"timeout": 0, "cpu_time": 0}}}
+
+    :since: 0.1.0
+    """
+    from ast import literal_eval
+    from xml.etree.ElementTree import parse
+
+    limits = {}
+    for skill in parse(_skills_file).getroot():
+        main_file = skill.findtext("main_file")
+        skill_limits = skill.findtext("limits")
+        if main_file and skill_limits:
+            try:
+                skill_limits = literal_eval(skill_limits)
+            except (SyntaxError, ValueError):
+                continue
+            if isinstance(skill_limits, dict):
+                limits["".join(main_file.split(".")[:-1])] = skill_limits
+    return limits
+
+
+def get_skill_priorities() -> dict:
+    """
+    returns the priorities of all skills which have a 'priority' element in the skills file (skills with a higher priority are started first, the default is 0)
+
+    :return: dict
+        returns the priority per skill main file (without '.py')
+        syntax: {<main file>: <priority>}
+        example: {"skills": 0}
+
+    :since: 0.1.0
+    """
+    from xml.etree.ElementTree import parse
+
+    priorities = {}
+    for skill in parse(_skills_file).getroot():
+        main_file = skill.findtext("main_file")
+        priority = skill.findtext("priority")
+        if main_file and priority:
+            try:
+                priorities["".join(main_file.split(".")[:-1])] = int(priority)
+            except ValueError:
+                pass
+    return priorities
+
+
+class TaskTable:
+    """
+    table of all skill runs (tasks) of the daemon, which are executed by a 'worker.SkillWorkerPool'
+    the tasks are started by priority (and in order of submission if the priority is equal), but only 'max_tasks' at the same time. all other tasks are waiting in the table.
+    a running task has its own process group (the one of its worker), so cancelling a task also kills all processes the skill has started
+    every task can have limits ('timeout', 'cpu_time' and 'memory'), a task which exceeds one of them is killed and ends with the state TIMEOUT, CPU_LIMIT or MEMORY_LIMIT
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, skill_pool, max_tasks: int = None, priorities: dict = None, history_size: int = 100, limits: dict = None, default_limits: dict = None) -> None:
+        """
+        :param skill_pool: worker.SkillWorkerPool
+            pool which executes the tasks (the table sets its 'on_status')
+        :param max_tasks: int, optional
+            maximum number of tasks which are running at the same time (None = pool size, it can't be higher than the pool size)
+            syntax: <max tasks>
+            example: 2
+        :param priorities: dict, optional
+            priority per skill main file (see 'get_skill_priorities'), which is used if a task is submitted without priority
+            syntax: {<main file>: <priority>}
+            example: {"skills": 0}
+        :param history_size: int, optional
+            number of finished tasks which are kept in the table
+            syntax: <history size>
+            example: 100
+        :param limits: dict, optional
+            limits per skill main file (see 'get_skill_limits'), which are used if a task is submitted without limits
+            syntax: {<main file>: {<limit>: <value>, <method>: {<limit>: <value>}}}
+            example: {"skills": {"timeout": 120, "Play": {"timeout": 0}}}
+        :param default_limits: dict, optional
+            limits of all skills which don't define the limit themselves
+            syntax: {<limit>: <value>}
+            example: {"timeout": 300, "cpu_time": 0, "memory": 0}
+        :return: None
+
+        :since: 0.1.0
+        """
+        from collections import deque
+        from threading import Condition, Lock
+
+        self.skill_pool = skill_pool
+        self.max_tasks = max_tasks
+        self.priorities = priorities or {}
+        self.history_size = max(0, int(history_size))
+        self.limits = limits or {}
+        self.default_limits = default_limits or {}
+
+        self._lock = Lock()
+        self._task_finished = Condition(self._lock)
+        self._next_task_id = 0
+        self._tasks = {}
+        self._queue = []
+        self._jobs = {}
+        self._active = 0
+        self._finished = deque()
+
+        skill_pool.on_status = self._on_status
+
+    def _dispatch(self) -> None:
+        """
+        hands the waiting tasks with the highest priority to the skill pool, until 'max_tasks' tasks are running (must be called with the lock held)
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from heapq import heappop
+
+        max_tasks = self.skill_pool.pool_size if self.max_tasks is None else max(1, min(int(self.max_tasks), self.skill_pool.pool_size))
+        while self._queue and self._active < max_tasks:
+            negative_priority, task_id = heappop(self._queue)
+            task = self._tasks.get(task_id)
+            if task is None or task["state"] != QUEUED:  # cancelled while waiting
+                continue
+            task["state"] = RUNNING
+            task["job_id"] = self.skill_pool.submit(task["main_file"], task["method"], task["speech_input"], task["activate_phrase"], task["trace_id"], task["submit_time"], task["limits"])
+            self._jobs[task["job_id"]] = task_id
+            self._active += 1
+
+    def _finish(self, task: dict, state: str) -> None:
+        """
+        marks a task as finished and starts the next waiting tasks (must be called with the lock held)
+
+        :param task: dict
+            the task
+        :param state: str
+            the final state of the task
+            syntax: <state>
+            example: DONE
+        :return: None
+
+        :since: 0.1.0
+        """
+        from time import time
+
+        if task["state"] == RUNNING:
+            self._active -= 1
+            self._jobs.pop(task["job_id"], None)
+        task["state"] = state
+        task["end_time"] = time()
+        self._finished.append(task["task_id"])
+        while len(self._finished) > self.history_size:
+            self._tasks.pop(self._finished.popleft(), None)
+        self._task_finished.notify_all()
+        self._dispatch()
+
+    def _limits(self, main_file: str, method: str) -> dict:
+        """
+        returns the limits of a skill class
+
+        :param main_file: str
+            name of the skill main file (without '.py')
+            syntax: <main file>
+            example: "skills"
+        :param method: str
+            name of the skill class in the main file
+            syntax: <method>
+            example: "Play"
+        :return: dict
+            returns the default limits, overwritten by the limits of the skill and of the skill class
+            syntax: {<limit>: <value>}
+            example: {"timeout": 0, "cpu_time": 30, "memory": 0}
+
+        :since: 0.1.0
+        """
+        limits = {name: value for name, value in self.default_limits.items() if name in _limit_names}
+        skill_limits = self.limits.get(main_file, {})
+        for source in (skill_limits, skill_limits.get(method, {})):
+            if isinstance(source, dict):
+                limits.update({name: value for name, value in source.items() if name in _limit_names})
+        return limits
+
+    def _on_status(self, status: str, job_id: int, pid: int, usage: dict = None) -> None:
+        """
+        updates the task of a job (called by the supervisor thread of the skill pool)
+
+        :param status: str
+            status of the job ('start', 'done', 'error', 'killed', 'timeout', 'cpu_limit' or 'memory_limit')
+            syntax: <status>
+            example: "done"
+        :param job_id: int
+            id of the job
+            syntax: <job id>
+            example: 3
+        :param pid: int
+            pid of the worker which executes the job
+            syntax: <pid>
+            example: 1234
+        :param usage: dict, optional
+            the cpu time (in seconds) and peak resident memory (in kilobytes) of a finished job
+            syntax: {"cpu_time": <seconds>, "peak_rss": <kilobytes>}
+            example: {"cpu_time": 0.42, "peak_rss": 24576}
+        :return: None
+
+        :since: 0.1.0
+        """
+        from os import getpgid
+        from time import time
+
+        with self._lock:
+            task = self._tasks.get(self._jobs.get(job_id))
+            if task is None:
+                return
+            if status == "start":
+                task["pid"] = pid
+                task["start_time"] = time()
+                try:
+                    task["pgid"] = getpgid(pid)
+                except ProcessLookupError:
+                    pass
+            else:
+                if usage is not None:
+                    task["cpu_time"] = usage.get("cpu_time")
+                    task["peak_rss"] = usage.get("peak_rss")
+                self._finish(task, _status_states.get(status, KILLED))
+
+    def cancel(self, task_id: int) -> bool:
+        """
+        cancels a task, a waiting task is removed from the table and a running one is killed together with all processes it has started
+
+        :param task_id: int
+            id of the task
+            syntax: <task id>
+            example: 3
+        :return: bool
+            returns True if the task was waiting or running and got cancelled, False if not
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None or task["state"] in finished_states:
+                return False
+            job_id = task["job_id"]
+            self._finish(task, CANCELLED)
+        if job_id is not None:
+            self.skill_pool.cancel(job_id)
+        return True
+
+    def cancel_skill(self, main_file: str, method: str = None) -> list:
+        """
+        cancels all waiting and running tasks of a skill
+
+        :param main_file: str
+            name of the skill main file (without '.py')
+            syntax: <main file>
+            example: "skills"
+        :param method: str, optional
+            name of the skill class in the main file (None = all classes of the main file)
+            syntax: <method>
+            example: "Play"
+        :return: list
+            returns the ids of the cancelled tasks
+            syntax: [<task id>]
+            example: [3, 5]
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            task_ids = [task_id for task_id, task in self._tasks.items()
+                        if task["state"] not in finished_states and task["main_file"] == main_file and (method is None or task["method"] == method)]
+        return [task_id for task_id in task_ids if self.cancel(task_id)]
+
+    def get(self, task_id: int) -> dict:
+        """
+        returns infos about a task
+
+        :param task_id: int
+            id of the task
+            syntax: <task id>
+            example: 3
+        :return: dict
+            returns a copy of the task or None if the task isn't (anymore) in the table
+            syntax: {"task_id": <task id>, "main_file": <main file>, "method": <method>, "speech_input": <speech input>, "activate_phrase": <activate phrase>, "trace_id": <trace id>,
+                     "priority": <priority>, "limits": <limits>, "state": <state>, "job_id": <job id>, "pid": <pid>, "pgid": <process group id>,
+                     "submit_time": <time>, "start_time": <time>, "end_time": <time>, "cpu_time": <seconds>, "peak_rss": <kilobytes>}
+            example: {"task_id": 3, "main_file": "skills", "method": "Play", "speech_input": "play a song", "activate_phrase": "play", "trace_id": None,
+                      "priority": 0, "limits": {"timeout": 0}, "state": "running", "job_id": 3, "pid": 1234, "pgid": 1234,
+                      "submit_time": 1593853741.26, "start_time": 1593853741.27, "end_time": None, "cpu_time": None, "peak_rss": None}
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return dict(task) if task is not None else None
+
+    def latest(self) -> int:
+        """
+        returns the newest task which is waiting or running
+
+        :return: int
+            returns the id of the task or None if no task is waiting or running
+            syntax: <task id>
+            example: 3
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            for task_id in sorted(self._tasks, reverse=True):
+                if self._tasks[task_id]["state"] not in finished_states:
+                    return task_id
+        return None
+
+    def submit(self, main_file: str, method: str, speech_input: str, activate_phrase: str, trace_id: str = None, priority: int = None, limits: dict = None) -> int:
+        """
+        adds a skill run to the table, it's started as soon as less than 'max_tasks' tasks with a higher or equal priority are running or waiting before it
+
+        :param main_file: str
+            name of the skill main file (without '.py')
+            syntax: <main file>
+            example: "skills"
+        :param method: str
+            name of the skill class in the main file
+            syntax: <method>
+            example: "CurrentTime"
+        :param speech_input: str
+            complete spoken words
+            syntax: <speech input>
+            example: "What time is it"
+        :param activate_phrase: str
+            activate phrase that called the skill
+            syntax: <activate phrase>
+            example: "time"
+        :param trace_id: str, optional
+            id of the trace to which the spans of the task belong (None = no tracing)
+            syntax: <trace id>
+            example: "3f2a9c1e04b7d865"
+        :param priority: int, optional
+            priority of the task (None = the priority of the skill in 'priorities' or 0)
+            syntax: <priority>
+            example: 10
+        :param limits: dict, optional
+            limits of the task (see 'worker.SkillWorkerPool.submit', None = the limits of the skill in 'limits' or the 'default_limits')
+            syntax: {<limit>: <value>}
+            example: {"timeout": 60, "cpu_time": 30, "memory": 200}
+        :return: int
+            returns the id of the task
+            syntax: <task id>
+            example: 3
+
+        :since: 0.1.0
+        """
+        from heapq import heappush
+        from time import time
+
+        if priority is None:
+            priority = self.priorities.get(main_file, 0)
+        if limits is None:
+            limits = self._limits(main_file, method)
+        with self._lock:
+            self._next_task_id += 1
+            task_id = self._next_task_id
+            self._tasks[task_id] = {"task_id": task_id, "main_file": main_file, "method": method, "speech_input": speech_input, "activate_phrase": activate_phrase,
+                                    "trace_id": trace_id, "priority": priority, "limits": limits, "state": QUEUED, "job_id": None, "pid": None, "pgid": None,
+                                    "submit_time": time(), "start_time": None, "end_time": None, "cpu_time": None, "peak_rss": None}
+            heappush(self._queue, (-priority, task_id))
+            self._dispatch()
+        return task_id
+
+    def tasks(self, states: (list, tuple) = None) -> list:
+        """
+        returns all tasks in the table
+
+        :param states: list or tuple, optional
+            only tasks with one of these states are returned (None = all tasks)
+            syntax: [<state>]
+            example: [QUEUED, RUNNING]
+        :return: list
+            returns copies of the tasks (see 'get') in order of their submission
+            syntax: [<task>]
+            example: [{"task_id": 3, "main_file": "skills", "method": "Play", "state": "running", ...}]
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            return [dict(self._tasks[task_id]) for task_id in sorted(self._tasks) if states is None or self._tasks[task_id]["state"] in states]
+
+    def wait(self, task_id: int, timeout: float = None) -> bool:
+        """
+        waits until a task is finished (or cancelled)
+
+        :param task_id: int
+            id of the task
+            syntax: <task id>
+            example: 3
+        :param timeout: float, optional
+            max. seconds to wait (None = no limit)
+            syntax: <seconds>
+            example: 10
+        :return: bool
+            returns True if the task is finished, False if the timeout expired
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        with self._task_finished:
+            return self._task_finished.wait_for(lambda: task_id not in self._tasks or self._tasks[task_id]["state"] in finished_states, timeout)
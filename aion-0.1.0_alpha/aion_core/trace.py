@@ -0,0 +1,249 @@
+#!/usr/bin/python3
+
+try:
+    from .logging import _get_writer, rotate as _rotate
+    from .utils import aion_data_path as _aion_data_path
+except ImportError:
+    from logging import _get_writer, rotate as _rotate
+    from utils import aion_data_path as _aion_data_path
+
+trace_file = _aion_data_path + "/logs/aion.trace"
+
+TRACE_ID_ENV = "AION_TRACE_ID"
+
+_max_trace_file_size = 1048576
+_trace_id = None
+
+# order in which the spans of a voice command are summarized
+span_order = ["recording", "recognition.queue", "stt", "matching", "skill.queue", "skill.run_before", "skill.main", "skill.run_after", "tts.first_audio", "tts.cache_hit", "tts.synthesis", "tts.playback", "command"]
+
+
+class Span:
+    """
+    measures the duration of a part of a voice command and writes it to the trace file
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, name: str, trace_id: str = None) -> None:
+        """
+        :param name: str
+            name of the span
+            syntax: <name>
+            example: "stt"
+        :param trace_id: str, optional
+            id of the trace to which the span belongs (None = the current trace)
+            syntax: <trace id>
+            example: "3f2a9c1e04b7d865"
+        :return: None
+
+        :since: 0.1.0
+        """
+        self.name = name
+        self.trace_id = trace_id
+
+        self._start = None
+        self._start_counter = None
+
+    def __enter__(self):
+        from time import perf_counter, time
+
+        self._start = time()
+        self._start_counter = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        from time import perf_counter
+
+        record(self.name, self._start, perf_counter() - self._start_counter, self.trace_id, "ok" if exc_type is None else "error")
+
+
+def current_trace() -> str:
+    """
+    returns the id of the current trace
+
+    :return: str
+        returns the trace id or None if there is no trace
+        syntax: <trace id>
+        example: "3f2a9c1e04b7d865"
+
+    :since: 0.1.0
+    """
+    from os import environ
+
+    if _trace_id is None:
+        return environ.get(TRACE_ID_ENV)
+    return _trace_id
+
+
+def new_trace() -> str:
+    """
+    starts a new trace (one per voice command)
+
+    :return: str
+        returns the id of the new trace
+        syntax: <trace id>
+        example: "3f2a9c1e04b7d865"
+
+    :since: 0.1.0
+    """
+    from uuid import uuid4
+
+    _rotate(trace_file, _max_trace_file_size)
+
+    trace_id = uuid4().hex[:16]
+    set_trace(trace_id)
+    return trace_id
+
+
+def read_trace_file(fname: str = None) -> list:
+    """
+    reads all spans from a trace file
+
+    :param fname: str, optional
+        filename of the trace file (None = 'trace_file')
+        syntax: <filename>
+        example: "/etc/aion_data/logs/aion.trace"
+    :return: list
+        returns the spans
+        syntax: [{"trace_id": <trace id>, "name": <name>, "start": <start time>, "duration": <duration in seconds>, "pid": <pid>, "status": <status>}]
+        example: [{"trace_id": "3f2a9c1e04b7d865", "name": "stt", "start": 1577836800.0, "duration": 0.8125, "pid": 1234, "status": "ok"}]
+
+    :since: 0.1.0
+    """
+    if fname is None:
+        fname = trace_file
+
+    spans = []
+    with open(fname, "r") as file:
+        for line in file:
+            try:
+                trace_id, name, start, duration, pid, status = line.split()
+                spans.append({"trace_id": trace_id, "name": name, "start": float(start), "duration": float(duration) / 1000, "pid": int(pid), "status": status})
+            except ValueError:  # e.g. a line which was written by a killed process
+                continue
+    return spans
+
+
+def record(name: str, start: float, duration: float, trace_id: str = None, status: str = "ok") -> None:
+    """
+    writes a span to the trace file (the writes are buffered like the log messages)
+
+    :param name: str
+        name of the span
+        syntax: <name>
+        example: "recording"
+    :param start: float
+        unix time at which the span has started
+        syntax: <start time>
+        example: 1577836800.0
+    :param duration: float
+        duration of the span in seconds
+        syntax: <duration>
+        example: 0.8125
+    :param trace_id: str, optional
+        id of the trace to which the span belongs (None = the current trace)
+        syntax: <trace id>
+        example: "3f2a9c1e04b7d865"
+    :param status: str, optional
+        outcome of the span
+        syntax: <status>
+        example: "ok"
+    :return: None
+
+    :since: 0.1.0
+    """
+    from os import getpid
+
+    if trace_id is None:
+        trace_id = current_trace()
+    if trace_id is None:
+        return
+    _get_writer().write(trace_file, "a", trace_id + " " + name + " " + format(start, ".3f") + " " + format(duration * 1000, ".3f") + " " + str(getpid()) + " " + status + "\n")
+
+
+def set_trace(trace_id: str) -> None:
+    """
+    sets the current trace of this process (the trace id is also inherited by all child processes)
+
+    :param trace_id: str
+        id of the trace
+        syntax: <trace id>
+        example: "3f2a9c1e04b7d865"
+    :return: None
+
+    :since: 0.1.0
+    """
+    global _trace_id
+    from os import environ
+
+    _trace_id = trace_id
+    if trace_id is None:
+        environ.pop(TRACE_ID_ENV, None)
+    else:
+        environ[TRACE_ID_ENV] = trace_id
+
+
+def span(name: str, trace_id: str = None) -> Span:
+    """
+    returns a span which measures the code in its 'with' block
+
+    :param name: str
+        name of the span
+        syntax: <name>
+        example: "stt"
+    :param trace_id: str, optional
+        id of the trace to which the span belongs (None = the current trace)
+        syntax: <trace id>
+        example: "3f2a9c1e04b7d865"
+    :return: Span
+
+    :since: 0.1.0
+    """
+    return Span(name, trace_id)
+
+
+def summarize(fname: str = None, last: int = None) -> dict:
+    """
+    summarizes the spans in a trace file
+
+    :param fname: str, optional
+        filename of the trace file (None = 'trace_file')
+        syntax: <filename>
+        example: "/etc/aion_data/logs/aion.trace"
+    :param last: int, optional
+        number of (newest) traces which should be summarized (None = all)
+        syntax: <number>
+        example: 20
+    :return: dict
+        returns the number of traces and the statistics (in milliseconds) of every span and of the whole voice command ("total")
+        syntax: {"traces": <number of traces>, "spans": {<name>: {"count": <count>, "errors": <errors>, "mean": <mean>, "p50": <p50>, "p95": <p95>, "p99": <p99>, "max": <max>}}}
+        example: {"traces": 1, "spans": {"stt": {"count": 1, "errors": 0, "mean": 812.5, "p50": 812.5, "p95": 812.5, "p99": 812.5, "max": 812.5}}}
+
+    :since: 0.1.0
+    """
+    traces = {}
+    for span_infos in read_trace_file(fname):
+        traces.setdefault(span_infos["trace_id"], []).append(span_infos)
+
+    trace_ids = sorted(traces, key=lambda trace_id: min(span_infos["start"] for span_infos in traces[trace_id]))
+    if last is not None:
+        trace_ids = trace_ids[-last:]
+
+    durations = {}
+    errors = {}
+    for trace_id in trace_ids:
+        for span_infos in traces[trace_id]:
+            durations.setdefault(span_infos["name"], []).append(span_infos["duration"] * 1000)
+            if span_infos["status"] != "ok":
+                errors[span_infos["name"]] = errors.get(span_infos["name"], 0) + 1
+        durations.setdefault("total", []).append((max(span_infos["start"] + span_infos["duration"] for span_infos in traces[trace_id]) -
+                                                  min(span_infos["start"] for span_infos in traces[trace_id])) * 1000)
+
+    spans = {}
+    for name in sorted(durations, key=lambda name: (span_order.index(name) if name in span_order else len(span_order) + (name == "total"), name)):
+        values = sorted(durations[name])
+        spans[name] = {"count": len(values), "errors": errors.get(name, 0), "mean": round(sum(values) / len(values), 3),
+                       "p50": round(values[int(0.5 * (len(values) - 1))], 3), "p95": round(values[int(0.95 * (len(values) - 1))], 3),
+                       "p99": round(values[int(0.99 * (len(values) - 1))], 3), "max": round(values[-1], 3)}
+    return {"traces": len(trace_ids), "spans": spans}
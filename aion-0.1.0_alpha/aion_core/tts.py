@@ -0,0 +1,965 @@
+#!/usr/bin/python3
+
+try:
+    from . import language as _language, speech_output as _speech_output
+    from .config import Aion as _Aion
+    from .logging import flush as _flush
+    from .trace import record as _record
+    from .utils import aion_data_path as _aion_data_path, _get_lock_directory
+except ImportError:
+    import language as _language
+    from __init__ import speech_output as _speech_output
+    from config import Aion as _Aion
+    from logging import flush as _flush
+    from trace import record as _record
+    from utils import aion_data_path as _aion_data_path, _get_lock_directory
+
+cache_directory = _aion_data_path + "/tts_cache"
+
+# 'pico2wave' only writes to files which end with '.wav', so it gets a link to its stdout (in a private directory, see '_pico2wave_command')
+_pico2wave_stdout = None
+
+
+def _connect(client) -> None:
+    """
+    connects a client to the tts server, if the socket belongs to aion (the lock directory is shared with other users, who could create the socket first)
+
+    :param client: socket.socket
+        the client socket
+    :return: None
+
+    :since: 0.1.0
+    """
+    from os import geteuid, lstat
+    from stat import S_ISSOCK
+
+    path = _socket_path()
+    socket_stat = lstat(path)
+    if not S_ISSOCK(socket_stat.st_mode) or socket_stat.st_uid not in (0, geteuid()):
+        raise ConnectionRefusedError("The tts server socket " + path + " doesn't belong to aion")
+    client.connect(path)
+
+
+def _espeak_command(speech_output: str, language: str) -> list:
+    """
+    returns the command which writes the synthesized words as '.wav' to stdout with espeak
+
+    :param speech_output: str
+        the words to be said
+        syntax: <speech output words>
+        example: "This is an test"
+    :param language: str
+        language locale
+        syntax: <language locale>
+        example: "en_US"
+    :return: list
+        returns the command
+        syntax: [<command>, <argument>, ...]
+        example: ["espeak", "-v", "en", "--stdout", "This is an test"]
+
+    :since: 0.1.0
+    """
+    return ["espeak", "-v", language.split("_")[0], "--stdout", str(speech_output)]
+
+
+def _pico2wave_command(speech_output: str, language: str) -> list:
+    """
+    returns the command which writes the synthesized words as '.wav' to stdout with pico2wave
+
+    :param speech_output: str
+        the words to be said
+        syntax: <speech output words>
+        example: "This is an test"
+    :param language: str
+        language locale
+        syntax: <language locale>
+        example: "en_US"
+    :return: list
+        returns the command
+        syntax: [<command>, <argument>, ...]
+        example: ["pico2wave", "--lang=en-US", "--wave=/tmp/tmpa1b2c3d4/stdout.wav", "This is an test."]
+
+    :since: 0.1.0
+    """
+    global _pico2wave_stdout
+
+    if _pico2wave_stdout is None:
+        from atexit import register
+        from os import symlink
+        from shutil import rmtree
+        from tempfile import mkdtemp
+
+        directory = mkdtemp(prefix="aion_tts_")  # only accessible by this user, so nobody else can put a link to another file there
+        symlink("/dev/stdout", directory + "/stdout.wav")
+        register(rmtree, directory, True)
+        _pico2wave_stdout = directory + "/stdout.wav"
+    return ["pico2wave", "--lang=" + language.split("_")[0] + "-" + language.split("_")[1], "--wave=" + _pico2wave_stdout, str(speech_output) + "."]
+
+
+# commands of the tts engines which the server can stream
+stream_engines = {"espeak": _espeak_command, "pico2wave": _pico2wave_command}
+
+
+def _read_wav_header(stream) -> (int, int, int):
+    """
+    reads the header of a '.wav' stream until the start of the audio data
+
+    :param stream: file object
+        stream which starts with a '.wav' header
+    :return: (int, int, int)
+        returns the sample rate, the number of channels and the sample width in bytes
+        syntax: (<sample rate>, <channels>, <sample width>)
+        example: (16000, 1, 2)
+
+    :since: 0.1.0
+    """
+    from struct import unpack_from
+
+    def read(size):
+        data = b""
+        while len(data) < size:
+            chunk = stream.read(size - len(data))
+            if not chunk:
+                raise EOFError("The tts engine didn't write a complete '.wav' header")
+            data += chunk
+        return data
+
+    if read(12)[:4] != b"RIFF":
+        raise ValueError("The tts engine didn't write a '.wav' stream")
+    sample_rate, channels, sample_width = 22050, 1, 2
+    while True:
+        chunk_id, chunk_size = unpack_from("<4sI", read(8))
+        if chunk_id == b"data":
+            return sample_rate, channels, sample_width
+        chunk = read(chunk_size + chunk_size % 2)
+        if chunk_id == b"fmt ":
+            channels, sample_rate = unpack_from("<HI", chunk, 2)
+            sample_width = unpack_from("<H", chunk, 14)[0] // 8
+
+
+def _socket_path() -> str:
+    """
+    returns the path of the unix socket of the tts server (in the lock directory of aion, which isn't writable for other users like '/tmp')
+
+    :return: str
+        returns the path
+        syntax: <path>
+        example: "/run/lock/aion/tts.sock"
+
+    :since: 0.1.0
+    """
+    return _get_lock_directory() + "/tts.sock"
+
+
+def _wav(audio: bytes, sample_rate: int, channels: int, sample_width: int) -> bytes:
+    """
+    creates a '.wav' file from raw audio
+
+    :param audio: bytes
+        the raw audio
+        syntax: <audio>
+        example: b"\\x00\\x00..."
+    :param sample_rate: int
+        sample rate of the audio
+        syntax: <sample rate>
+        example: 16000
+    :param channels: int
+        number of channels
+        syntax: <channels>
+        example: 1
+    :param sample_width: int
+        bytes per sample
+        syntax: <sample width>
+        example: 2
+    :return: bytes
+        returns the content of the '.wav' file
+        syntax: <wav>
+        example: b"RIFF..."
+
+    :since: 0.1.0
+    """
+    from io import BytesIO
+    from wave import open as wave_open
+
+    wav = BytesIO()
+    with wave_open(wav, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(sample_width)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(audio)
+    return wav.getvalue()
+
+
+class AudioCache:
+    """
+    on-disk cache of synthesized '.wav' files, keyed by tts engine, language locale and the (normalized) words
+    if the cache is bigger than its size budget, the least recently used files are removed
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, directory: str = cache_directory, max_size: int = None) -> None:
+        """
+        :param directory: str, optional
+            directory of the cached files
+            syntax: <directory>
+            example: "/etc/aion_data/tts_cache"
+        :param max_size: int, optional
+            max. size of the cache in bytes (None = 'tts_cache_size' from the config)
+            syntax: <size>
+            example: 52428800
+        :return: None
+
+        :since: 0.1.0
+        """
+        if max_size is None:
+            max_size = _Aion().get_tts_cache_size() * 1048576
+
+        self.directory = directory
+        self.max_size = max_size
+
+    def _fname(self, tts_engine: str, language: str, speech_output: str) -> str:
+        """
+        returns the filename of a cached file
+
+        :param tts_engine: str
+            name of the tts engine
+            syntax: <tts engine>
+            example: "pico2wave"
+        :param language: str
+            language locale
+            syntax: <language locale>
+            example: "en_US"
+        :param speech_output: str
+            the words
+            syntax: <speech output words>
+            example: "This is an test"
+        :return: str
+            returns the filename
+            syntax: <filename>
+            example: "/etc/aion_data/tts_cache/3b0c8ac2d2d5e8d0e3a9d1c64b0e2d7c1a1f4e6b.wav"
+
+        :since: 0.1.0
+        """
+        from hashlib import sha1
+
+        return self.directory + "/" + sha1((tts_engine + "|" + language + "|" + normalize(speech_output)).encode("utf-8")).hexdigest() + ".wav"
+
+    def evict(self) -> None:
+        """
+        removes the least recently used files until the cache fits into its size budget
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from os import remove, scandir
+
+        try:
+            files = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in scandir(self.directory) if entry.name.endswith(".wav")]
+        except FileNotFoundError:
+            return
+        size = sum(file[1] for file in files)
+        for mtime, file_size, fname in sorted(files):
+            if size <= self.max_size:
+                break
+            try:
+                remove(fname)
+            except FileNotFoundError:
+                pass
+            size -= file_size
+
+    def get(self, tts_engine: str, language: str, speech_output: str) -> str:
+        """
+        returns the cached file of the given words
+
+        :param tts_engine: str
+            name of the tts engine
+            syntax: <tts engine>
+            example: "pico2wave"
+        :param language: str
+            language locale
+            syntax: <language locale>
+            example: "en_US"
+        :param speech_output: str
+            the words
+            syntax: <speech output words>
+            example: "This is an test"
+        :return: str
+            returns the filename of the cached '.wav' file or None if the words aren't cached
+            syntax: <filename>
+            example: "/etc/aion_data/tts_cache/3b0c8ac2d2d5e8d0e3a9d1c64b0e2d7c1a1f4e6b.wav"
+
+        :since: 0.1.0
+        """
+        from os import utime
+
+        if self.max_size <= 0:
+            return None
+        fname = self._fname(tts_engine, language, speech_output)
+        try:
+            utime(fname)  # the modification time is the 'last used' time
+        except OSError:
+            return None
+        return fname
+
+    def put(self, tts_engine: str, language: str, speech_output: str, audio: bytes) -> str:
+        """
+        adds a synthesized '.wav' file to the cache
+
+        :param tts_engine: str
+            name of the tts engine
+            syntax: <tts engine>
+            example: "pico2wave"
+        :param language: str
+            language locale
+            syntax: <language locale>
+            example: "en_US"
+        :param speech_output: str
+            the words
+            syntax: <speech output words>
+            example: "This is an test"
+        :param audio: bytes
+            content of the '.wav' file
+            syntax: <audio>
+            example: b"RIFF..."
+        :return: str
+            returns the filename of the cached '.wav' file or None if the cache is disabled or not writable
+            syntax: <filename>
+            example: "/etc/aion_data/tts_cache/3b0c8ac2d2d5e8d0e3a9d1c64b0e2d7c1a1f4e6b.wav"
+
+        :since: 0.1.0
+        """
+        from os import getpid, makedirs, replace
+
+        if self.max_size <= 0 or len(audio) > self.max_size:
+            return None
+        fname = self._fname(tts_engine, language, speech_output)
+        try:
+            makedirs(self.directory, exist_ok=True)
+            with open(fname + "." + str(getpid()), "wb") as file:
+                file.write(audio)
+            replace(fname + "." + str(getpid()), fname)
+        except OSError:
+            return None
+        self.evict()
+        return fname
+
+
+class TTSServer:
+    """
+    long-lived process which synthesizes speech outputs and streams them into one open audio sink ('aplay')
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, socket_path: str = None, sink_command: list = None) -> None:
+        """
+        :param socket_path: str, optional
+            path of the unix socket on which the server listens (None = 'tts.sock' in the lock directory)
+            syntax: <path>
+            example: "/run/lock/aion/tts.sock"
+        :param sink_command: list, optional
+            command which plays the raw audio from its stdin ('{rate}', '{channels}' and '{format}' are replaced; None = 'aplay')
+            syntax: [<command>, <argument>, ...]
+            example: ["aplay", "-q", "-t", "raw", "-r", "{rate}", "-c", "{channels}", "-f", "{format}"]
+        :return: None
+
+        :since: 0.1.0
+        """
+        if sink_command is None:
+            sink_command = ["aplay", "-q", "-t", "raw", "-r", "{rate}", "-c", "{channels}", "-f", "{format}"]
+
+        self.sink_command = sink_command
+        self.socket_path = socket_path or _socket_path()
+
+        self._cache = AudioCache()
+        self._playing_until = 0
+        self._sink = None
+        self._sink_format = None
+
+    def _get_sink(self, sample_rate: int, channels: int, sample_width: int):
+        """
+        returns the audio sink for the given audio format (the sink is only restarted if the format changes)
+
+        :param sample_rate: int
+            sample rate of the audio
+            syntax: <sample rate>
+            example: 16000
+        :param channels: int
+            number of channels
+            syntax: <channels>
+            example: 1
+        :param sample_width: int
+            bytes per sample
+            syntax: <sample width>
+            example: 2
+        :return: subprocess.Popen
+
+        :since: 0.1.0
+        """
+        from subprocess import DEVNULL, PIPE, Popen
+
+        sink_format = (sample_rate, channels, sample_width)
+        if self._sink is None or self._sink.poll() is not None or self._sink_format != sink_format:
+            self._close_sink()
+            replacements = {"{rate}": str(sample_rate), "{channels}": str(channels), "{format}": "U8" if sample_width == 1 else "S" + str(sample_width * 8) + "_LE"}
+            self._sink = Popen([replacements.get(argument, argument) for argument in self.sink_command], stdin=PIPE, stdout=DEVNULL)
+            self._sink_format = sink_format
+        return self._sink
+
+    def _close_sink(self) -> None:
+        """
+        closes the audio sink after it has played everything
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        if self._sink is not None:
+            try:
+                self._sink.stdin.close()
+            except OSError:
+                pass
+            self._sink.wait()
+            self._sink = None
+            self._playing_until = 0
+
+    def _cancelled(self, connection) -> bool:
+        """
+        checks if the client has cancelled its request (or has closed the connection, e.g. because its skill got killed)
+
+        :param connection: socket.socket
+            connection to the client (None = the request can't be cancelled)
+        :return: bool
+            returns True if the request was cancelled, False if not
+            syntax: <boolean>
+            example: False
+
+        :since: 0.1.0
+        """
+        from select import select
+
+        if connection is None or not select([connection], [], [], 0)[0]:
+            return False
+        try:
+            data = connection.recv(64)
+        except OSError:
+            return True
+        return data == b"" or b"cancel" in data
+
+    def _open_source(self, speech_output: str, tts_engine: str, language: str):
+        """
+        opens the '.wav' stream of the given words (a cached file or the stdout of a newly started synthesizer)
+
+        :param speech_output: str
+            the words to be said
+            syntax: <speech output words>
+            example: "This is an test"
+        :param tts_engine: str
+            name of the tts engine (key of 'stream_engines')
+            syntax: <tts engine>
+            example: "pico2wave"
+        :param language: str
+            language locale
+            syntax: <language locale>
+            example: "en_US"
+        :return: (file object, subprocess.Popen)
+            returns the stream and the synthesizer process (None if the words were cached)
+
+        :since: 0.1.0
+        """
+        from subprocess import DEVNULL, PIPE, Popen
+
+        cached_fname = self._cache.get(tts_engine, language, speech_output)
+        if cached_fname is not None:  # a cache hit is played without starting the synthesizer
+            return open(cached_fname, "rb"), None
+        synthesizer = Popen(stream_engines[tts_engine](speech_output, language), stdout=PIPE, stderr=DEVNULL)
+        return synthesizer.stdout, synthesizer
+
+    def _stream(self, sentences: list, tts_engine: str, language: str, trace_id: str = None, connection=None) -> bool:
+        """
+        synthesizes the given sentences and streams them into the audio sink, the next sentence is already synthesized while the current one is streamed
+
+        :param sentences: list
+            the sentences to be said
+            syntax: [<sentence>]
+            example: ["This is an test.", "And this is the second sentence."]
+        :param tts_engine: str
+            name of the tts engine (key of 'stream_engines')
+            syntax: <tts engine>
+            example: "pico2wave"
+        :param language: str
+            language locale
+            syntax: <language locale>
+            example: "en_US"
+        :param trace_id: str, optional
+            id of the trace of the voice command
+            syntax: <trace id>
+            example: "3f2a9c1e04b7d865"
+        :param connection: socket.socket, optional
+            connection to the client, which is checked for cancellations
+        :return: bool
+            returns True if all sentences were played, False if the request was cancelled
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        from time import monotonic, sleep, time
+
+        start = time()
+        start_counter = monotonic()
+        playback_start = None
+        sources = [self._open_source(sentences[0], tts_engine, language)] if sentences else []
+        try:
+            for index, sentence in enumerate(sentences):
+                sentence_start = time()
+                sentence_start_counter = monotonic()
+                source, synthesizer = sources[0]
+                if index + 1 < len(sentences):
+                    sources.append(self._open_source(sentences[index + 1], tts_engine, language))
+
+                sample_rate, channels, sample_width = _read_wav_header(source)
+                bytes_per_second = sample_rate * channels * sample_width
+                sink = self._get_sink(sample_rate, channels, sample_width)
+                audio = []
+                while True:
+                    data = source.read(4096)
+                    if not data:
+                        break
+                    if self._cancelled(connection):
+                        self._kill_sink()
+                        return False
+                    if playback_start is None:
+                        playback_start = monotonic()
+                        _record("tts.first_audio", start, playback_start - start_counter, trace_id)
+                    sink.stdin.write(data)
+                    sink.stdin.flush()
+                    self._playing_until = max(self._playing_until, monotonic()) + len(data) / bytes_per_second
+                    audio.append(data)
+
+                source.close()
+                sources.pop(0)
+                if synthesizer is None:
+                    _record("tts.cache_hit", sentence_start, monotonic() - sentence_start_counter, trace_id)
+                else:
+                    synthesizer.wait()
+                    _record("tts.synthesis", sentence_start, monotonic() - sentence_start_counter, trace_id)
+                    if synthesizer.returncode == 0:
+                        self._cache.put(tts_engine, language, sentence, _wav(b"".join(audio), sample_rate, channels, sample_width))
+        finally:
+            for source, synthesizer in sources:
+                source.close()
+                if synthesizer is not None:
+                    synthesizer.kill()
+                    synthesizer.wait()
+
+        # the sink buffers the audio, so the server waits until it should be played completely
+        while monotonic() < self._playing_until:
+            if self._cancelled(connection):
+                self._kill_sink()
+                return False
+            sleep(min(0.05, max(0, self._playing_until - monotonic())))
+        if playback_start is not None:
+            _record("tts.playback", start + (playback_start - start_counter), monotonic() - playback_start, trace_id)
+        return True
+
+    def _kill_sink(self) -> None:
+        """
+        stops the audio sink immediately (the audio in its buffer isn't played)
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        if self._sink is not None:
+            self._sink.kill()
+            self._sink.wait()
+            self._sink = None
+            self._playing_until = 0
+
+    def serve_forever(self) -> None:
+        """
+        answers the requests of the clients (one after another, so that speech outputs never overlap)
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from json import loads
+        from os import remove, umask
+        from socket import AF_UNIX, SOCK_STREAM, socket
+        from traceback import print_exc
+
+        try:
+            remove(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+        server = socket(AF_UNIX, SOCK_STREAM)
+        old_umask = umask(0o077)  # only aion (and its skill workers) may connect
+        try:
+            server.bind(self.socket_path)
+        finally:
+            umask(old_umask)
+        server.listen(16)
+        try:
+            while True:
+                connection, address = server.accept()
+                with connection:
+                    try:
+                        request = loads(connection.makefile("r").readline())
+                        completed = self._stream(request["sentences"], request["tts_engine"], request["language"], request.get("trace_id"), connection)
+                        try:
+                            connection.sendall(b"ok\n" if completed is True else b"cancelled\n")
+                        except OSError:  # the client is already gone
+                            pass
+                    except Exception:
+                        print_exc()
+                        try:
+                            connection.sendall(b"error\n")
+                        except OSError:
+                            pass
+                    _flush()
+        finally:
+            server.close()
+            self._close_sink()
+            try:
+                remove(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+
+def normalize(speech_output: str) -> str:
+    """
+    normalizes words for the audio cache (words which only differ in their whitespaces sound the same)
+
+    :param speech_output: str
+        the words
+        syntax: <speech output words>
+        example: "  This is   an test "
+    :return: str
+        returns the normalized words
+        syntax: <normalized words>
+        example: "This is an test"
+
+    :since: 0.1.0
+    """
+    return " ".join(str(speech_output).split())
+
+
+def prerender(tts_engine: str = None, lng_files: list = None) -> (int, int):
+    """
+    synthesizes every entry of the '.lng' files which has no format fields into the audio cache
+
+    :param tts_engine: str, optional
+        name of the tts engine (key of 'stream_engines', None = the tts engine from the config)
+        syntax: <tts engine>
+        example: "pico2wave"
+    :param lng_files: list, optional
+        the '.lng' files (None = all '.lng' files in the language directory)
+        syntax: [<filename>]
+        example: ["/etc/aion_data/language/en_US.lng"]
+    :return: (int, int)
+        returns the number of newly rendered entries and of entries which were already cached
+        syntax: (<rendered>, <cached>)
+        example: (3, 12)
+
+    :since: 0.1.0
+    """
+    from glob import glob
+    from io import BytesIO
+    from os.path import basename
+    from subprocess import DEVNULL, PIPE, run
+
+    if tts_engine is None:
+        tts_engine = _Aion().get_tts_engine()
+    if lng_files is None:
+        lng_files = sorted(glob(_language.language_directory + "/*.lng"))
+
+    cache = AudioCache()
+    rendered = 0
+    cached = 0
+    for lng_file in lng_files:
+        language = basename(lng_file)[:-len(".lng")]
+        for entry, variants in _language._catalog(lng_file).items():
+            if "." not in entry:  # the root tag
+                continue
+            for compiled in variants:
+                if isinstance(compiled, str) or any(field_name is not None for literal_text, field_name in compiled):
+                    continue
+                speech_output = _language._render(compiled, {})
+                if not speech_output.strip():
+                    continue
+                if cache.get(tts_engine, language, speech_output) is not None:
+                    cached += 1
+                    continue
+                synthesizer = run(stream_engines[tts_engine](speech_output, language), stdout=PIPE, stderr=DEVNULL)
+                if synthesizer.returncode != 0:
+                    continue
+                # the header of a streamed '.wav' has no valid length, so the file is written again
+                stream = BytesIO(synthesizer.stdout)
+                try:
+                    sample_rate, channels, sample_width = _read_wav_header(stream)
+                except (ValueError, EOFError):  # a broken output skips only this entry
+                    continue
+                if cache.put(tts_engine, language, speech_output, _wav(stream.read(), sample_rate, channels, sample_width)) is not None:
+                    rendered += 1
+    return rendered, cached
+
+
+def _serve(socket_path: str) -> None:
+    """
+    entry point of the tts server process
+
+    :param socket_path: str
+        path of the unix socket on which the server listens
+        syntax: <path>
+        example: "/run/lock/aion/tts.sock"
+    :return: None
+
+    :since: 0.1.0
+    """
+    from signal import signal, SIGINT, SIG_IGN
+
+    signal(SIGINT, SIG_IGN)  # the server gets stopped by aion
+    TTSServer(socket_path).serve_forever()
+
+
+def say(speech_output: str, tts_engine: str, language: str, trace_id: str = None, timeout: float = 120) -> bool:
+    """
+    lets the tts server say the given words and waits until they are played
+
+    :param speech_output: str
+        the words to be said
+        syntax: <speech output words>
+        example: "This is an test"
+    :param tts_engine: str
+        name of the tts engine (key of 'stream_engines')
+        syntax: <tts engine>
+        example: "pico2wave"
+    :param language: str
+        language locale
+        syntax: <language locale>
+        example: "en_US"
+    :param trace_id: str, optional
+        id of the trace of the voice command
+        syntax: <trace id>
+        example: "3f2a9c1e04b7d865"
+    :param timeout: float, optional
+        max. seconds to wait for the server
+        syntax: <seconds>
+        example: 120
+    :return: bool
+        returns True if the server has said the words, False if there is no server or it failed (the caller should say the words itself then)
+        syntax: <boolean>
+        example: True
+
+    :since: 0.1.0
+    """
+    from json import dumps
+    from socket import AF_UNIX, SOCK_STREAM, socket
+
+    if tts_engine not in stream_engines:
+        return False
+    try:
+        with socket(AF_UNIX, SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            _connect(client)
+            client.sendall((dumps({"sentences": [str(speech_output)], "tts_engine": tts_engine, "language": language, "trace_id": trace_id}) + "\n").encode("utf-8"))
+            return client.makefile("r").readline().strip() == "ok"
+    except OSError:
+        return False
+
+
+def split_sentences(speech_output: str, min_length: int = 20) -> list:
+    """
+    splits a text into sentences (very short sentences are joined with the next one, because every sentence starts a synthesizer)
+
+    :param speech_output: str
+        the text
+        syntax: <text>
+        example: "Python is a programming language. It was created by Guido van Rossum."
+    :param min_length: int, optional
+        min. length of a sentence
+        syntax: <length>
+        example: 20
+    :return: list
+        returns the sentences
+        syntax: [<sentence>]
+        example: ["Python is a programming language.", "It was created by Guido van Rossum."]
+
+    :since: 0.1.0
+    """
+    from re import split
+
+    sentences = []
+    sentence = ""
+    for part in split(r"(?<=[.!?;:])\s+", normalize(speech_output)):
+        sentence = (sentence + " " + part).strip()
+        if len(sentence) >= min_length:
+            sentences.append(sentence)
+            sentence = ""
+    if sentence:
+        if sentences and len(sentence) < min_length:
+            sentences[-1] = sentences[-1] + " " + sentence
+        else:
+            sentences.append(sentence)
+    return sentences
+
+
+class SpeechStream:
+    """
+    says a long text sentence by sentence, the next sentence is synthesized while the current one is played
+    the output can be cancelled at any time
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, speech_output: str, tts_engine: str, language: str, trace_id: str = None) -> None:
+        """
+        :param speech_output: str
+            the words to be said
+            syntax: <speech output words>
+            example: "Python is a programming language. It was created by Guido van Rossum."
+        :param tts_engine: str
+            name of the tts engine
+            syntax: <tts engine>
+            example: "pico2wave"
+        :param language: str
+            language locale
+            syntax: <language locale>
+            example: "en_US"
+        :param trace_id: str, optional
+            id of the trace of the voice command
+            syntax: <trace id>
+            example: "3f2a9c1e04b7d865"
+        :return: None
+
+        :since: 0.1.0
+        """
+        from threading import Event
+
+        self.language = language
+        self.sentences = split_sentences(speech_output)
+        self.trace_id = trace_id
+        self.tts_engine = tts_engine
+
+        self.completed = None
+        self._cancelled = Event()
+        self._client = None
+        self._thread = None
+
+    def _run(self) -> None:
+        """
+        sends the sentences to the tts server or says them one after another if there is no server
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from json import dumps
+        from socket import AF_UNIX, SOCK_STREAM, socket
+
+        if self.tts_engine in stream_engines:
+            self._client = socket(AF_UNIX, SOCK_STREAM)
+            try:
+                _connect(self._client)
+                self._client.sendall((dumps({"sentences": self.sentences, "tts_engine": self.tts_engine, "language": self.language, "trace_id": self.trace_id}) + "\n").encode("utf-8"))
+                self.completed = self._client.makefile("r").readline().strip() == "ok"
+                return
+            except OSError:
+                if self._cancelled.is_set():
+                    self.completed = False
+                    return
+            finally:
+                self._client.close()
+
+        # without server the sentences can't be synthesized in advance
+        for sentence in self.sentences:
+            if self._cancelled.is_set():
+                self.completed = False
+                return
+            _speech_output(sentence)
+        self.completed = True
+
+    def cancel(self) -> None:
+        """
+        stops the output (the current audio is stopped immediately if the tts server plays it)
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._cancelled.set()
+        if self._client is not None:
+            try:
+                self._client.sendall(b"cancel\n")
+            except OSError:
+                pass
+
+    def start(self) -> None:
+        """
+        starts the output in the background
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from threading import Thread
+
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        waits until the output is finished or cancelled
+
+        :param timeout: float, optional
+            max. seconds to wait (None = no limit)
+            syntax: <seconds>
+            example: 10
+        :return: bool
+            returns True if all sentences were said, False if the output was cancelled or isn't finished yet
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.completed is True
+
+
+def start_server(socket_path: str = None):
+    """
+    starts the tts server in a new process
+
+    :param socket_path: str, optional
+        path of the unix socket on which the server listens (None = 'tts.sock' in the lock directory)
+        syntax: <path>
+        example: "/run/lock/aion/tts.sock"
+    :return: multiprocessing.Process
+        returns the server process
+
+    :since: 0.1.0
+    """
+    from multiprocessing import Process
+    from os import remove
+    from os.path import exists
+    from time import sleep
+
+    if socket_path is None:
+        socket_path = _socket_path()
+    try:
+        remove(socket_path)
+    except FileNotFoundError:
+        pass
+    server = Process(target=_serve, args=(socket_path,), daemon=True)
+    server.start()
+    for i in range(50):  # waits max. 5 seconds until the server is listening
+        if exists(socket_path):
+            break
+        sleep(0.1)
+    return server
@@ -1,11 +1,22 @@
 #!/usr/bin/python3
 
+try:
+    from ._error_codes import utils_lock_timeout as _utils_lock_timeout
+except ImportError:
+    from _error_codes import utils_lock_timeout as _utils_lock_timeout
+
+import fcntl as _fcntl
 import xml.etree.ElementTree as _ET
+from collections.abc import Mapping as _Mapping
 from glob import glob as _glob
-from xml.dom import minidom as _minidom
+from os import close as _close, environ as _environ, O_CLOEXEC as _O_CLOEXEC, O_CREAT as _O_CREAT, O_RDONLY as _O_RDONLY, open as _os_open
+from threading import get_ident as _get_ident
+from time import monotonic as _monotonic, sleep as _sleep
+
+AION_DATA_PATH_ENV = "AION_DATA_PATH"
 
-aion_data_path = "/etc/aion_data"
-aion_path = "".join(_glob("/usr/local/aion-*"))
+aion_data_path = _environ.get(AION_DATA_PATH_ENV, "/etc/aion_data")  # another directory is only set for tests
+lock_path = "/run/lock/aion"
 
 
 def get_location_infos_by_ip(ip_address: str = None) -> dict:
@@ -75,6 +86,27 @@ def get_full_directory_data(directory: str) -> list:
     return data
 
 
+def get_file_signature(fname: str) -> tuple:
+    """
+    returns a signature of a file which changes every time the file is changed or replaced
+
+    :param fname: str
+        name of the file
+        syntax: <filename>
+        example: "/etc/aion_data/config.xml"
+    :return: tuple
+        returns the inode, modification time and size of the file
+        syntax: (<inode>, <modification time in ns>, <size>)
+        example: (262311, 1593853741265172000, 412)
+
+    :since: 0.1.0
+    """
+    from os import stat
+
+    file_stat = stat(fname)
+    return file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size
+
+
 def get_full_youtube_audio_url(search_element: str) -> str:
     """
     search youtube for the search element and gives the first youtube url back
@@ -206,6 +238,61 @@ def is_root() -> bool:
         return False
 
 
+def lazy_module_variables(module_globals: dict, **factories):
+    """
+    creates a module '__getattr__' function, which computes the given module variables on their first access and stores them in the module, so that importing the module stays cheap
+    global names don't fall back to the module '__getattr__', so the module itself calls the functions which compute the variables
+
+    :param module_globals: dict
+        the 'globals()' of the module
+    :param factories: kwargs
+        functions without arguments which compute the variables
+        syntax: <variable name>=<function>
+        example: language=lambda: Aion().get_language()
+    :return: function
+        returns the function which must be assigned to '__getattr__' of the module
+        syntax: <function>
+        example: __getattr__ = lazy_module_variables(globals(), language=lambda: Aion().get_language())
+
+    :since: 0.1.0
+    """
+    def get_variable(name: str):
+        if name in module_globals:
+            return module_globals[name]
+        if name not in factories:
+            raise AttributeError("module '" + module_globals["__name__"] + "' has no attribute '" + name + "'")
+        value = module_globals[name] = factories[name]()
+        return value
+
+    return get_variable
+
+
+def live_module_variables(module_globals: dict, **factories):
+    """
+    creates a module '__getattr__' function like 'lazy_module_variables', but the variables are computed again on every access and never stored in the module
+    (for values from the config, which can change while a long running process like a skill worker is using the module. the config is cached, so this is cheap)
+
+    :param module_globals: dict
+        the 'globals()' of the module
+    :param factories: kwargs
+        functions without arguments which compute the variables
+        syntax: <variable name>=<function>
+        example: language=lambda: Aion().get_language()
+    :return: function
+        returns the function which must be assigned to '__getattr__' of the module
+        syntax: <function>
+        example: __getattr__ = live_module_variables(globals(), language=lambda: Aion().get_language())
+
+    :since: 0.1.0
+    """
+    def get_variable(name: str):
+        if name not in factories:
+            raise AttributeError("module '" + module_globals["__name__"] + "' has no attribute '" + name + "'")
+        return factories[name]()
+
+    return get_variable
+
+
 def remove_brackets(string: str) -> str:
     """
     removes all brackets and the text which is between the brackets
@@ -388,6 +475,421 @@ def vlc(url_or_file_path: str, video: bool = False) -> None:
         system('cvlc --play-and-exit --no-video "' + url_or_file_path + '"')
 
 
+class ConnectivityMonitor:
+    """
+    checks in the background if the internet is connected
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, interval: float = 10, hysteresis: int = 2, on_change=None) -> None:
+        """
+        :param interval: float, optional
+            seconds between two checks
+            syntax: <interval>
+            example: 10
+        :param hysteresis: int, optional
+            number of checks in a row which must have the same (new) result before the connection state changes
+            syntax: <hysteresis>
+            example: 2
+        :param on_change: function, optional
+            function which is called (in the background thread) with the new connection state every time it changes
+            syntax: <function>
+            example: lambda connected: print(connected)
+        :return: None
+
+        :since: 0.1.0
+        """
+        from threading import Event
+
+        self.interval = float(interval)
+        self.hysteresis = max(1, int(hysteresis))
+        self.on_change = on_change
+
+        self.connected = None
+
+        self._changed_checks = 0
+        self._stop_event = Event()
+        self._thread = None
+
+    def _check(self) -> None:
+        """
+        checks the connection once and changes the connection state if the hysteresis is reached
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        connected = is_internet_connected()
+        if self.connected is None or connected == self.connected:
+            self._changed_checks = 0
+            if self.connected is None:
+                self.connected = connected
+                if self.on_change is not None:
+                    self.on_change(connected)
+            return
+
+        self._changed_checks += 1
+        if self._changed_checks >= self.hysteresis:
+            self._changed_checks = 0
+            self.connected = connected
+            if self.on_change is not None:
+                self.on_change(connected)
+
+    def _run(self) -> None:
+        """
+        checks the connection every 'interval' seconds until 'stop' is called
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from traceback import print_exc
+
+        while self._stop_event.wait(self.interval) is False:
+            try:
+                self._check()
+            except Exception:  # e.g. an error in 'on_change', the connection must still be checked
+                print_exc()
+
+    def start(self) -> None:
+        """
+        checks the connection once and starts the background checks
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from threading import Thread
+
+        self._check()
+        if self._thread is None:
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        stops the background checks
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._stop_event.set()
+
+
+class FileLock:
+    """
+    reader / writer lock for a file, which works across threads and processes
+    the lock is held via 'fcntl.flock' on a separate lock file in 'lock_path', so that the locked file itself can be replaced atomically.
+    the lock is reentrant for the thread which holds it
+
+    syntax: with FileLock(<filename>, <exclusive>):
+    example: with FileLock("/etc/aion_data/config.xml"):
+                 ...
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, fname: str, exclusive: bool = True, timeout: float = None) -> None:
+        """
+        :param fname: str
+            name of the file (or directory) to lock, it doesn't have to exist
+            syntax: <filename>
+            example: "/etc/aion_data/config.xml"
+        :param exclusive: bool, optional
+            if True, the lock is a writer lock, if False, a reader lock which can be held by multiple threads / processes at the same time
+            syntax: <boolean>
+            example: True
+        :param timeout: float, optional
+            seconds to wait for the lock before a 'TimeoutError' is raised (None waits forever)
+            syntax: <timeout>
+            example: 5
+        :return: None
+
+        :since: 0.1.0
+        """
+        from os.path import realpath
+
+        self.exclusive = exclusive
+        self.fname = fname
+        self.timeout = timeout
+
+        self.lock_fname = _get_lock_directory() + "/" + realpath(fname).strip("/").replace("/", "-") + ".lock"
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    def _flock(self, file_descriptor: int, exclusive: bool) -> None:
+        """
+        locks the lock file
+
+        :param file_descriptor: int
+            file descriptor of the lock file
+            syntax: <file descriptor>
+            example: 5
+        :param exclusive: bool
+            sets if the lock is a writer or a reader lock
+            syntax: <boolean>
+            example: True
+        :return: None
+
+        :since: 0.1.0
+        """
+        operation = _fcntl.LOCK_EX if exclusive is True else _fcntl.LOCK_SH
+        if self.timeout is None:
+            _fcntl.flock(file_descriptor, operation)
+            return
+        end = _monotonic() + self.timeout
+        while True:
+            try:
+                _fcntl.flock(file_descriptor, operation | _fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                if _monotonic() >= end:
+                    raise TimeoutError("Errno: " + _utils_lock_timeout + " - Couldn't lock " + self.fname + " within " + str(self.timeout) + " seconds")
+                _sleep(0.005)
+
+    def acquire(self) -> None:
+        """
+        acquires the lock (if the current thread already holds a reader lock and acquires a writer lock, the lock gets upgraded, which isn't atomic)
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        thread_locks = _held_locks.setdefault(_get_ident(), {})
+        if self.lock_fname in thread_locks:
+            file_descriptor, modes = thread_locks[self.lock_fname]
+            if self.exclusive is True and True not in modes:
+                self._flock(file_descriptor, True)
+            modes.append(self.exclusive is True)
+            return
+
+        # every thread opens the lock file itself, because 'flock' locks belong to the open file and not to the process
+        file_descriptor = _os_open(self.lock_fname, _O_RDONLY | _O_CREAT | _O_CLOEXEC, 0o666)
+        try:
+            self._flock(file_descriptor, self.exclusive)
+        except BaseException:
+            _close(file_descriptor)
+            if not thread_locks:
+                del _held_locks[_get_ident()]
+            raise
+        thread_locks[self.lock_fname] = (file_descriptor, [self.exclusive is True])
+
+    def release(self) -> None:
+        """
+        releases the lock
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        thread_locks = _held_locks[_get_ident()]
+        file_descriptor, modes = thread_locks[self.lock_fname]
+        modes.pop()
+        if not modes:
+            del thread_locks[self.lock_fname]
+            if not thread_locks:
+                del _held_locks[_get_ident()]
+            _close(file_descriptor)
+        elif True not in modes:
+            _fcntl.flock(file_descriptor, _fcntl.LOCK_SH)
+
+
+class LazyModule:
+    """
+    placeholder for a module, which is imported on the first access to one of its attributes
+
+    syntax: <name> = LazyModule(<module name>)
+    example: sr = LazyModule("speech_recognition")
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, module_name: str) -> None:
+        """
+        :param module_name: str
+            name of the module
+            syntax: <module name>
+            example: "speech_recognition"
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._module = None
+        self._module_name = module_name
+
+    def __getattr__(self, name: str):
+        from importlib import import_module
+
+        if self._module is None:
+            self._module = import_module(self._module_name)
+        return getattr(self._module, name)
+
+    def __repr__(self) -> str:
+        return "<LazyModule '" + self._module_name + "'" + (" (imported)" if self._module is not None else "") + ">"
+
+
+def _get_lock_directory() -> str:
+    """
+    returns (and creates if necessary) the directory for the lock files
+
+    :return: str
+        returns the path of the lock directory ('lock_path' or, if it can't be created, a directory in the temp directory)
+        syntax: <path>
+        example: "/run/lock/aion"
+
+    :since: 0.1.0
+    """
+    global _lock_directory
+
+    if _lock_directory is None:
+        from os import chmod, makedirs
+        from tempfile import gettempdir
+
+        for directory in (lock_path, gettempdir() + "/aion_locks"):
+            try:
+                makedirs(directory, exist_ok=True)
+            except OSError:
+                continue
+            try:
+                chmod(directory, 0o1777)  # every aion process (root or not) must be able to create lock files
+            except OSError:  # created by another user
+                pass
+            _lock_directory = directory
+            break
+        else:
+            _lock_directory = gettempdir()
+    return _lock_directory
+
+
+def _reset_held_locks() -> None:
+    """
+    forgets the locks of the parent process in a forked child (the inherited lock files are still locked by the parent)
+
+    :return: None
+
+    :since: 0.1.0
+    """
+    from os import close
+
+    for thread_locks in _held_locks.values():
+        for file_descriptor, modes in thread_locks.values():
+            try:
+                close(file_descriptor)
+            except OSError:
+                pass
+    _held_locks.clear()
+
+
+_held_locks = {}
+_lock_directory = None
+
+try:
+    from os import register_at_fork as _register_at_fork
+    _register_at_fork(after_in_child=_reset_held_locks)
+except ImportError:
+    pass
+
+
+def _atomic_write(fname: str, string: str) -> None:
+    """
+    writes a string to a file via a temporary file which replaces the old file, so that no process can read a half written file
+    (if no temporary file can be created in the directory of the file, the file is overwritten directly)
+
+    :param fname: str
+        name of the file
+        syntax: <filename>
+        example: "/etc/aion_data/config.xml"
+    :param string: str
+        new content of the file
+        syntax: <string>
+        example: "<config></config>"
+    :return: None
+
+    :since: 0.1.0
+    """
+    from os import chmod, chown, remove, replace, stat
+    from os.path import abspath, basename, dirname
+    from tempfile import mkstemp
+
+    try:
+        file_descriptor, tmp_fname = mkstemp(dir=dirname(abspath(fname)), prefix="." + basename(fname) + ".")
+    except PermissionError:  # e.g. the daemon runs as normal user and can only write to the file itself, not to its directory
+        with open(fname, "w", encoding="utf-8") as file:
+            file.write(string)
+        return
+    try:
+        with open(file_descriptor, "w", encoding="utf-8") as file:
+            file.write(string)
+        try:
+            file_stat = stat(fname)
+            chmod(tmp_fname, file_stat.st_mode & 0o7777)
+            chown(tmp_fname, file_stat.st_uid, file_stat.st_gid)
+        except OSError:  # new file or not allowed to change the owner
+            pass
+        replace(tmp_fname, fname)
+    except BaseException:
+        try:
+            remove(tmp_fname)
+        except OSError:
+            pass
+        raise
+
+
+def _indent(element, level: int = 0) -> None:
+    """
+    indents an element and all its children in place (with two spaces per level, like 'minidom.toprettyxml', but without serializing and parsing the tree again)
+
+    :param element: xml.etree.ElementTree.Element
+        the element to indent
+    :param level: int, optional
+        depth of the element in the tree
+        syntax: <level>
+        example: 0
+    :return: None
+
+    :since: 0.1.0
+    """
+    if len(element) == 0:
+        return
+    child_indent = "\n" + "  " * (level + 1)
+    if element.text is None or element.text.strip() == "":
+        element.text = child_indent
+    child = None
+    for child in element:
+        _indent(child, level + 1)
+        if child.tail is None or child.tail.strip() == "":
+            child.tail = child_indent
+    if child.tail.strip() == "":
+        child.tail = "\n" + "  " * level
+
+
+def _pretty_string(root) -> str:
+    """
+    serializes an indented xml tree
+
+    :param root: xml.etree.ElementTree.Element
+        root element of the tree
+    :return: str
+        returns the xml string
+        syntax: <xml tree>
+        example: "<root>
+                    <test_element />
+                  </root>"
+
+    :since: 0.1.0
+    """
+    _indent(root)
+    root.tail = None
+    return _ET.tostring(root, "unicode") + "\n"
+
+
 class BaseXMLBuilder:
     """
     a class to simple build an '.xml' file
@@ -433,11 +935,8 @@ class BaseXMLBuilder:
         :since: 0.1.0
         """
         if string is None:
-            reparsed = _minidom.parseString(_ET.tostring(self._root, "utf-8"))
-        else:
-            reparsed = _minidom.parseString(bytes(string, "utf-8", errors="ignore"))
-        pre_output = reparsed.toprettyxml(indent="  ")
-        return "\n".join(pre_output.split("\n")[1:])
+            return _pretty_string(self._root)
+        return _pretty_string(_ET.fromstring(string))
 
     def create_root_element(self, name: str, text: str = None, attrib: dict = {}, **extra: str) -> None:
         """
@@ -548,7 +1047,7 @@ class BaseXMLBuilder:
         if pretty_print is True:
             return self._prettify()
         else:
-            return _ET.tostring(self._root, "utf-8").decode("ascii")
+            return _ET.tostring(self._root, "unicode")
 
     def write(self, fname: str, mode: str = "w", pretty_print: bool = True) -> None:
         """
@@ -570,9 +1069,151 @@ class BaseXMLBuilder:
 
         :since: 0.1.0
         """
-        with open(fname, mode=mode) as file:
-            file.write(self.get_string(pretty_print))
-            file.close()
+        with FileLock(fname):
+            if mode == "w":
+                _atomic_write(fname, self.get_string(pretty_print))
+            else:
+                with open(fname, mode=mode) as file:
+                    file.write(self.get_string(pretty_print))
+                    file.close()
+
+
+class XMLElementView(_Mapping):
+    """
+    lightweight read only view of an element of a 'BaseXMLReader', which can also be used like the dicts of 'BaseXMLReader.get_infos'
+    (the parent infos and the child tags are only created if they are used)
+
+    :since: 0.1.0
+    """
+
+    __slots__ = ("_element", "_parents")
+
+    _keys = ("parent", "childs", "tag", "text", "attrib")
+
+    def __init__(self, element, parents: dict) -> None:
+        """
+        :param element: xml.etree.ElementTree.Element
+            the element
+        :param parents: dict
+            parent of every element in the file
+            syntax: {<element>: <parent element>}
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._element = element
+        self._parents = parents
+
+    def __getitem__(self, key: str):
+        if key == "parent":
+            parent = self._parents.get(self._element)
+            if parent is None:
+                return {"tag": "", "text": "", "attrib": {}}
+            return {"tag": parent.tag, "text": parent.text, "attrib": parent.attrib}
+        elif key in self._keys:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return "<XMLElementView " + self._element.tag + ">"
+
+    @property
+    def attrib(self) -> dict:
+        return self._element.attrib
+
+    @property
+    def childs(self) -> list:
+        return [child.tag for child in self._element]
+
+    @property
+    def element(self):
+        return self._element
+
+    @property
+    def parent(self):
+        parent = self._parents.get(self._element)
+        if parent is None:
+            return None
+        return XMLElementView(parent, self._parents)
+
+    @property
+    def tag(self) -> str:
+        return self._element.tag
+
+    @property
+    def text(self) -> str:
+        return self._element.text
+
+
+class _XMLInfos(dict):
+    """
+    dict which is returned by 'BaseXMLReader.get_infos' ('index', 'items', 'keys' and 'values' can be indexed)
+
+    :since: 0.1.0
+    """
+
+    def index(self, index: int) -> dict:
+        """
+        index a key-value pair in a dict
+
+        :param index: int
+            index of the key-value pair you want to get
+            syntax: <index>
+            example: 5
+        :return: dict
+            returns the key-value pair of the given index
+            syntax: {<key>: <value>}
+            example: {"test_key": "test_value"}
+
+        :since: 0.1.0
+        """
+        try:
+            from ._error_codes import utils_dict_index_out_of_range
+        except ImportError:
+            from _error_codes import utils_dict_index_out_of_range
+
+        try:
+            key = list(super().keys())[index]
+        except IndexError:
+            raise IndexError("Errno: " + utils_dict_index_out_of_range + " - Dict index out of range")
+        return {key: self[key]}
+
+    def items(self):
+        return _IndexedItems(super().items())
+
+    def keys(self):
+        return _IndexedList(super().keys())
+
+    def values(self):
+        return _IndexedList(super().values())
+
+
+class _IndexedList(list):
+    """
+    list whose 'index' method returns the item at the given index (like the views of the old 'get_infos' did)
+
+    :since: 0.1.0
+    """
+
+    def index(self, index: int):
+        return self[index]
+
+
+class _IndexedItems(_IndexedList):
+    """
+    list of key-value pairs whose 'index' method returns the pair at the given index as dict
+
+    :since: 0.1.0
+    """
+
+    def index(self, index: int) -> dict:
+        return dict([self[index]])
 
 
 class BaseXMLReader:
@@ -600,7 +1241,19 @@ class BaseXMLReader:
         self._tree = _ET.parse(self.fname)
         self._root = self._tree.getroot()
 
-        self.get_infos._root = self._root
+        # index which is built once per parsed file, so that 'find' doesn't have to walk the tree
+        self._elements = [self._root]
+        self._parents = {self._root: None}
+        self._by_tag = {self._root.tag: [self._root]}
+        self._by_parent = {}
+        self._by_tag_parent = {}
+        for parent in self._root.iter():
+            for child in parent:
+                self._elements.append(child)
+                self._parents[child] = parent
+                self._by_tag.setdefault(child.tag, []).append(child)
+                self._by_parent.setdefault(parent.tag, []).append(child)
+                self._by_tag_parent.setdefault((child.tag, parent.tag), []).append(child)
 
     def _prettify(self, string: str = None) -> str:
         """
@@ -620,261 +1273,89 @@ class BaseXMLReader:
 
         :since: 0.1.0
         """
+        from xml.dom import minidom
+
         if string is None:
-            reparsed = _minidom.parseString(_ET.tostring(self._root, "utf-8"))
+            reparsed = minidom.parseString(_ET.tostring(self._root, "utf-8"))
         else:
-            reparsed = _minidom.parseString(bytes(string, "utf-8", errors="ignore"))
+            reparsed = minidom.parseString(bytes(string, "utf-8", errors="ignore"))
         pre_output = reparsed.toprettyxml(indent="  ")
         return "\n".join(pre_output.split("\n")[1:])
 
-    class get_infos(dict):
+    def find(self, tag: str = None, parent: str = None, attrib: dict = None):
         """
-        a modified dict class with indexing items
+        finds elements by their tag, the tag of their parent and / or their attributes (the lookup uses the index of the file, so it doesn't depend on the size of the file)
+
+        :param tag: str, optional
+            tag of the elements (None = all tags)
+            syntax: <element tag>
+            example: "main_file"
+        :param parent: str, optional
+            tag of the parent of the elements (None = all parents)
+            syntax: <parent tag>
+            example: "skills"
+        :param attrib: dict, optional
+            attributes which the elements must have (None = no filter)
+            syntax: {<attribute name>: <attribute value>}
+            example: {"type": "skill"}
+        :return: generator
+            yields a 'XMLElementView' for every found element (in document order)
 
         :since: 0.1.0
         """
+        if tag is not None and parent is not None:
+            elements = self._by_tag_parent.get((tag, parent), [])
+        elif tag is not None:
+            elements = self._by_tag.get(tag, [])
+        elif parent is not None:
+            elements = self._by_parent.get(parent, [])
+        else:
+            elements = self._elements
 
-        def __init__(self, elem_tags: (str, list) = []) -> dict:
-            """
-            get infos about an element in the file
-
-            :param elem_tags: (str, list)
-                name of elements you want to get infos about
-                syntax: [<element tags>]
-                example: ["sub_child"]
-            :return: dict
-                returns a dict of names from the given elements with a list of dictionaries of found elements (complex description xD)
-                syntax: {<element>: [{"parent": {"tag": <parent tag>, "text": <text of the parent element>, "attrib": {<attributes of the parent element>}}, "childs": [<childs of the element>], "tag": <tag of the element>, "text": <text of the element>, "attrib": {<attributes of the element>}}]}
-                example: {"sub_child": [{"parent": {"tag": "root_child", "text": "", "attrib": {"author": "blueShard"}}, "childs": ["sub_child"], "tag": "sub_child", "text": "This is a sub element", "attrib": {}}]}
-
-            :since: 0.1.0
-            """
-            if isinstance(elem_tags, str):
-                elem_tags = [elem_tags]
-
-            child_list = []
-            return_dict = {}
-            for elem in elem_tags:
-                if elem == "<all>":
-                    continue
-                elif elem == "<root>":
-                    return_dict[self._root.tag] = []
-                else:
-                    return_dict[elem] = []
-
-            all_child_list = []
-
-            if "<all>" in elem_tags:
-                if self._root.tag in return_dict:
-                    pass
-                else:
-                    return_dict[self._root.tag] = []
-                return_dict[self._root.tag].append(
-                    {"parent": {"tag": "", "text": "", "attrib": {}}, "childs": [child.tag for child in self._root], "tag": self._root.tag, "text": "", "attrib": self._root.attrib})
-                for root_child in self._root:
-                    if root_child.tag in return_dict:
-                        pass
-                    else:
-                        return_dict[root_child.tag] = []
-                    return_dict[root_child.tag].append(
-                        {"parent": {"tag": self._root.tag, "text": self._root.text, "attrib": self._root.attrib}, "childs": [sub_root_child.tag for sub_root_child in root_child],
-                         "tag": root_child.tag, "text": root_child.text, "attrib": root_child.attrib})
-                    all_child_list.append(root_child)
-                for parent in list(all_child_list):
-                    for child in parent:
-                        if child.tag in return_dict:
-                            pass
-                        else:
-                            return_dict[child.tag] = []
-                        return_dict[child.tag].append(
-                            {"parent": {"tag": parent.tag, "text": parent.text, "attrib": parent.attrib}, "childs": [sub_child.tag for sub_child in child], "tag": child.tag, "text": child.text,
-                             "attrib": child.attrib})
-                        all_child_list.append(child)
-                        if child in all_child_list:
-                            all_child_list.remove(child)
-            else:
-                if self._root.tag in return_dict:
-                    return_dict[self._root.tag].append({"parent": {}, "childs": [child.tag for child in self._root], "tag": self._root.tag, "text": "", "attrib": self._root.attrib})
-                for root_child in self._root:
-                    if root_child.tag in return_dict:
-                        return_dict[root_child.tag].append(
-                            {"parent": {"tag": self._root.tag, "text": self._root.text, "attrib": self._root.attrib}, "childs": [sub_root_child.tag for sub_root_child in root_child],
-                             "tag": root_child.tag, "text": root_child.text, "attrib": root_child.attrib})
-                    else:
-                        child_list.append(root_child)
-                for parent in list(child_list):
-                    for child in parent:
-                        if child.tag in return_dict:
-                            return_dict[child.tag].append(
-                                {"parent": {"tag": parent.tag, "text": parent.text, "attrib": parent.attrib}, "childs": [sub_child.tag for sub_child in child], "tag": child.tag, "text": child.text,
-                                 "attrib": child.attrib})
-                        else:
-                            child_list.append(child)
-                        if child in child_list:
-                            child_list.remove(child)
-
-            self._return_dict = return_dict
-
-            self.items._return_dict_keys = return_dict.keys()
-            self.items._return_dict_values = return_dict.values()
-            self.keys._return_dict_keys = return_dict.keys()
-            self.values._return_dict_values = return_dict.values()
-
-            super().__init__(self._return_dict)
-
-        def __iter__(self):
-            return iter(self._return_dict)
-
-        def __next__(self):
-            return self._return_dict
-
-        def __repr__(self):
-            return self._return_dict
-
-        def __str__(self):
-            return str(self._return_dict)
-
-        def index(self, index: int) -> dict:
-            """
-            index a key-value pair in a dict
-
-            :param index: int
-                index of the key-value pair you want to get
-                syntax: <index>
-                example: 5
-            :return: dict
-                returns the key-value pair of the given index
-                syntax: {<key>: <value>}
-                example: {"test_key": "test_value"}
-
-            :since: 0.1.0
-            """
-            try:
-                from ._error_codes import utils_dict_index_out_of_range
-            except ImportError:
-                from _error_codes import utils_dict_index_out_of_range
-
-            i = 0
-            for key, value in self._return_dict.items():
-                if i == index:
-                    return {key: value}
-                else:
-                    i += 1
-            raise IndexError("Errno: " + utils_dict_index_out_of_range + " - Dict index out of range")
-
-        class items:
-            """
-            a modified items() function from dict with indexing items
-            """
-
-            def __init__(self):
-                pass
-
-            def __getitem__(self, item):
-                return tuple(self._return_dict_items)[item]
-
-            def __iter__(self):
-                return iter(self._return_dict_items)
-
-            def __len__(self):
-                return len(self._return_dict_items)
-
-            def __next__(self):
-                return self._return_dict_items
-
-            def __repr__(self):
-                return self._return_dict_items
-
-            def __str__(self):
-                return str(self._return_dict_items)
-
-            def index(self, index: int):
-                """
-                index a key-value pair in a dict
-
-                :param index: int
-                    index of the key-value pair you want to get
-                    syntax: <index>
-                    example: 5
-                :return: the given index in the values
-
-                :since: 0.1.0
-                """
-                return {list(self._return_dict_keys)[index]: list(self._return_dict_values)[index]}
-
-        class keys:
-            """
-            a modified keys() function from dict with indexing items
-            """
-
-            def __init__(self):
-                pass
-
-            def __iter__(self):
-                return iter(self._return_dict_keys)
-
-            def __len__(self):
-                return len(list(self._return_dict_keys))
-
-            def __next__(self):
-                return self._return_dict_keys
-
-            def __repr__(self):
-                return self._return_dict_keys
-
-            def __str__(self):
-                return str(self._return_dict_keys)
-
-            def index(self, index: int):
-                """
-                index a key in a dict
-
-                :param index: int
-                    index of the key you want to get
-                    syntax: <index>
-                    example: 5
-                :return: the given index in the keys
-
-                :since: 0.1.0
-                """
-                return list(self._return_dict_keys)[index]
-
-        class values:
-            """
-            a modified values() function from dict with indexing items
-            """
-
-            def __init__(self):
-                pass
-
-            def __iter__(self):
-                return iter(self._return_dict_values)
-
-            def __len__(self):
-                return len(list(self._return_dict_values))
+        for element in elements:
+            if attrib and any(element.attrib.get(key) != value for key, value in attrib.items()):
+                continue
+            yield XMLElementView(element, self._parents)
 
-            def __next__(self):
-                return self._return_dict_values
+    def get_infos(self, elem_tags: (str, list) = []) -> dict:
+        """
+        get infos about an element in the file (compatibility wrapper over 'find')
 
-            def __repr__(self):
-                return self._return_dict_values
+        :param elem_tags: (str, list)
+            name of elements you want to get infos about ('<root>' = the root element, '<all>' = all elements)
+            syntax: [<element tags>]
+            example: ["sub_child"]
+        :return: dict
+            returns a dict of names from the given elements with a list of found elements (the elements are 'XMLElementView' objects, which can be used like the dicts below)
+            syntax: {<element>: [{"parent": {"tag": <parent tag>, "text": <text of the parent element>, "attrib": {<attributes of the parent element>}}, "childs": [<childs of the element>], "tag": <tag of the element>, "text": <text of the element>, "attrib": {<attributes of the element>}}]}
+            example: {"sub_child": [{"parent": {"tag": "root_child", "text": "", "attrib": {"author": "blueShard"}}, "childs": ["sub_child"], "tag": "sub_child", "text": "This is a sub element", "attrib": {}}]}
 
-            def __str__(self):
-                return str(self._return_dict_values)
+        :since: 0.1.0
+        """
+        if isinstance(elem_tags, str):
+            elem_tags = [elem_tags]
+
+        return_dict = _XMLInfos()
+        for elem in elem_tags:
+            if elem == "<all>":
+                for element_view in self.find():
+                    return_dict.setdefault(element_view.tag, []).append(element_view)
+            elif elem == "<root>":
+                return_dict[self._root.tag] = [self.root]
+            else:
+                return_dict[elem] = list(self.find(elem))
+        return return_dict
 
-            def index(self, index: int):
-                """
-                index a value in a dict
+    @property
+    def root(self):
+        """
+        returns the root element
 
-                :param index: int
-                    index of the value you want to get
-                    syntax: <index>
-                    example: 5
-                :return: the given index in the values
+        :return: XMLElementView
 
-                :since: 0.1.0
-                """
-                return list(self._return_dict_values)[index]
+        :since: 0.1.0
+        """
+        return XMLElementView(self._root, self._parents)
 
     def get_string(self, pretty_print: bool = True) -> str:
         """
@@ -934,7 +1415,12 @@ class BaseXMLWriter:
         self.auto_write = auto_write
         self.fname = fname
 
-        self._root = _ET.fromstring("".join([item.replace("\n", "").strip() for item in [line for line in open(self.fname, "r")]]))
+        self._pending = []
+        self._replaying = False
+        self._signature = None
+        self._transaction_depth = 0
+        self._transaction_lock = None
+        self._root = self._read()
 
     def _prettify(self, string: str = None) -> str:
         """
@@ -955,11 +1441,79 @@ class BaseXMLWriter:
         :since: 0.1.0
         """
         if string is None:
-            reparsed = _minidom.parseString(_ET.tostring(self._root, "utf-8"))
-        else:
-            reparsed = _minidom.parseString(string)
-        pre_output = reparsed.toprettyxml(indent="  ")
-        return "\n".join(pre_output.split("\n")[1:])
+            return _pretty_string(self._root)
+        return _pretty_string(_ET.fromstring(string))
+
+    def _read(self):
+        """
+        parses the file without the whitespace between the elements and remembers its signature
+
+        :return: xml.etree.ElementTree.Element
+            returns the root element
+
+        :since: 0.1.0
+        """
+        # the signature is taken before parsing, so that a file which is replaced in between is read again on the next write
+        self._signature = get_file_signature(self.fname)
+        root = _ET.parse(self.fname).getroot()
+        for element in root.iter():
+            if element.text is not None:
+                element.text = element.text.strip() or None
+            if element.tail is not None:
+                element.tail = element.tail.strip() or None
+        return root
+
+    def _changed(self) -> None:
+        """
+        writes the xml tree if 'auto_write' is True and no transaction is open
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        if self.auto_write is True and self._transaction_depth == 0 and self._replaying is False:
+            self.write()
+
+    def _record(self, method: str, *args, **kwargs) -> None:
+        """
+        remembers a change which isn't written yet, so that it can be applied again if another process changes the file in the meantime
+
+        :param method: str
+            name of the method which makes the change
+            syntax: <method name>
+            example: "add"
+        :param args: args
+            arguments of the method
+        :param kwargs: kwargs
+            keyword arguments of the method
+        :return: None
+
+        :since: 0.1.0
+        """
+        if self._replaying is False:
+            self._pending.append((method, args, kwargs))
+
+    def _refresh(self) -> None:
+        """
+        reads the file again and applies all unwritten changes to it, if the file was changed by someone else since it was read
+        must be called with the file locked
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        try:
+            if get_file_signature(self.fname) == self._signature:
+                return
+        except FileNotFoundError:
+            return
+        self._root = self._read()
+        self._replaying = True
+        try:
+            for method, args, kwargs in self._pending:
+                getattr(self, method)(*args, **kwargs)
+        finally:
+            self._replaying = False
 
     def add(self, parent_tag: str, elem_tag: str, text: str = None, attrib: dict = {}, parent_attrib: dict = None, **extra: str) -> None:
         """
@@ -993,6 +1547,8 @@ class BaseXMLWriter:
 
         :since: 0.1.0
         """
+        self._record("add", parent_tag, elem_tag, text, attrib, parent_attrib, **extra)
+
         if parent_tag == "<root>":
             parent_tag = self._root.tag
 
@@ -1026,8 +1582,7 @@ class BaseXMLWriter:
                     else:
                         _ET.SubElement(parent, elem_tag, attrib, **extra)
 
-        if self.auto_write is True:
-            self.write()
+        self._changed()
 
     def get_string(self, pretty_print: bool = False) -> str:
         """
@@ -1049,17 +1604,12 @@ class BaseXMLWriter:
 
         :since: 0.1.0
         """
-        string = _ET.tostring(self._root, "utf-8").decode("ascii")
         if pretty_print is True:
-            if "\n" in string:
-                return string
-            else:
-                return self._prettify()
-        else:
-            if "\n" in string:
-                return "".join([line.strip() for line in _ET.tostring(self._root, "utf-8").decode("ascii").split("\n")])
-            else:
-                return string
+            return self._prettify()
+        string = _ET.tostring(self._root, "unicode")
+        if "\n" in string:
+            return "".join([line.strip() for line in string.split("\n")])
+        return string
 
     def remove(self, parent_tag: str, elem_tag: str, parent_attrib: dict = None) -> None:
         """
@@ -1081,6 +1631,8 @@ class BaseXMLWriter:
 
         :since: 0.1.0
         """
+        self._record("remove", parent_tag, elem_tag, parent_attrib)
+
         if parent_tag == "<root>":
             parent_tag = self._root.tag
 
@@ -1102,8 +1654,55 @@ class BaseXMLWriter:
                     else:
                         parent.remove(child)
 
-        if self.auto_write is True:
-            self.write()
+        self._changed()
+
+    def transaction(self):
+        """
+        batches all changes in the 'with' block, which are written (atomically) once at the end of the block
+        the file is locked for the whole block and read again at its start if another process has changed it, so that no change of another process gets lost
+        if an exception is raised in the block, the changes are discarded and the file stays unchanged
+
+        syntax: with <BaseXMLWriter>.transaction():
+        example: with BaseXMLWriter("/etc/aion_data/language/en_US.lng").transaction() as lng_writer:
+                     lng_writer.add("<root>", "test_skill.test_entry", text="The test was successful")
+
+        :return: contextmanager
+            returns a context manager which returns this writer
+
+        :since: 0.1.0
+        """
+        from contextlib import contextmanager
+
+        @contextmanager
+        def transaction():
+            if self._transaction_depth == 0:
+                self._transaction_lock = FileLock(self.fname)
+                self._transaction_lock.acquire()
+                try:
+                    self._refresh()
+                except BaseException:
+                    self._transaction_lock.release()
+                    raise
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    try:
+                        self._pending = []
+                        self._root = self._read()
+                    finally:
+                        self._transaction_lock.release()
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                try:
+                    self.write()
+                finally:
+                    self._transaction_lock.release()
+
+        return transaction()
 
     def update(self, parent_tag: str, elem_tag: str, text: str = None, attrib: dict = {}, parent_attrib: dict = None, **extra: str) -> None:
         """
@@ -1137,6 +1736,8 @@ class BaseXMLWriter:
 
         :since: 0.1.0
         """
+        self._record("update", parent_tag, elem_tag, text, attrib, parent_attrib, **extra)
+
         if parent_tag == "<root>":
             parent_tag = self._root.tag
 
@@ -1177,15 +1778,15 @@ class BaseXMLWriter:
                         for key, value in extra.items():
                             child.set(key, str(value))
 
-        if self.auto_write is True:
-            self.write()
+        self._changed()
 
     def write(self, mode: str = "w", pretty_print: bool = True) -> None:
         """
         writes the xml tree to a file
+        while writing, the file is locked and if another process has changed it since it was read, all changes are applied to its new content before writing
 
         :param mode : str, optional
-            mode to write on file
+            mode to write on file ('w' replaces the file atomically)
             syntax: <mode>
             example: "w"
         :param pretty_print : bool, optional
@@ -1196,9 +1797,22 @@ class BaseXMLWriter:
 
         :since: 0.1.0
         """
-        with open(self.fname, mode=mode) as file:
+        with FileLock(self.fname):
+            if mode == "w":
+                self._refresh()
             if pretty_print is False:
-                file.write(_ET.tostring(self._root, "utf-8").decode("ascii"))
+                string = _ET.tostring(self._root, "unicode")
+            else:
+                string = self._prettify()
+            if mode == "w":
+                _atomic_write(self.fname, string)
             else:
-                file.write(self._prettify())
-            file.close()
+                with open(self.fname, mode=mode) as file:
+                    file.write(string)
+                    file.close()
+            self._pending = []
+            self._signature = get_file_signature(self.fname)
+
+
+# the aion installation is searched on the first access to 'aion_path' and not on every import
+__getattr__ = lazy_module_variables(globals(), aion_path=lambda: "".join(_glob("/usr/local/aion-*")))
@@ -1,12 +1,271 @@
 #!/usr/bin/python3
 
-_aion_variable_file = "/tmp/aion39ewefv90erfte25"
+try:
+    from ._error_codes import variable_invalid_aion_pid as _variable_invalid_aion_pid, variable_invalid_variable_file as _variable_invalid_variable_file, \
+        variable_name_or_value_too_long as _variable_name_or_value_too_long, variable_table_full as _variable_table_full
+    from .utils import aion_data_path as _aion_data_path, AION_DATA_PATH_ENV as _AION_DATA_PATH_ENV, FileLock as _FileLock
+except ImportError:
+    from _error_codes import variable_invalid_aion_pid as _variable_invalid_aion_pid, variable_invalid_variable_file as _variable_invalid_variable_file, \
+        variable_name_or_value_too_long as _variable_name_or_value_too_long, variable_table_full as _variable_table_full
+    from utils import aion_data_path as _aion_data_path, AION_DATA_PATH_ENV as _AION_DATA_PATH_ENV, FileLock as _FileLock
+
+from os import environ as _environ
+from os.path import isdir as _isdir
+from struct import pack_into as _pack_into, unpack_from as _unpack_from
+from zlib import crc32 as _crc32
+
+if _AION_DATA_PATH_ENV in _environ:  # the aion of a test uses its own table, so that it doesn't change the one of a running aion
+    _aion_variable_file = _aion_data_path + "/variables"
+elif _isdir("/dev/shm"):
+    _aion_variable_file = "/dev/shm/aion39ewefv90erfte25"
+else:
+    _aion_variable_file = "/tmp/aion39ewefv90erfte25"
 
 _default_variables = {"IS_AION_RUNNING": "False"}
 
+AION_PID = "AION_PID"
 IS_AION_RUNNING = "IS_AION_RUNNING"
 
 
+class _VariableTable:
+    """
+    fixed-layout hash table in a memory mapped file, which is shared by all aion processes
+
+    layout: 16 byte header (magic, number of slots, slot size) followed by the slots
+    slot: 1 byte state (0 = empty, 1 = used, 2 = removed), 1 byte name length, 2 byte value length, name, value
+
+    :since: 0.1.0
+    """
+
+    _magic = b"AIONVAR1"
+    _header_size = 16
+    _slot_number = 256
+    _slot_size = 256
+    _name_size = 60
+    _value_size = 192
+
+    def __init__(self, fname: str, create: bool = False) -> None:
+        """
+        opens (or creates) the table
+
+        :param fname: str
+            path of the table file
+            syntax: <filename>
+            example: "/dev/shm/aion39ewefv90erfte25"
+        :param create: bool, optional
+            if True, a new, empty table is created (an existing table will be overwritten)
+            syntax: <boolean>
+            example: False
+        :return: None
+
+        :since: 0.1.0
+        """
+        from mmap import mmap
+        from os import close, fstat, geteuid, O_NOFOLLOW, O_RDWR, open as os_open, remove, replace
+        from os.path import basename, dirname
+        from struct import pack
+        from tempfile import mkstemp
+
+        self.fname = fname
+
+        size = self._header_size + self._slot_number * self._slot_size
+        if create is True:
+            # the new table is written to a temporary file with an unpredictable name and the mode 0o600 first,
+            # so that no other process can map a half written table and no other user can change the table (e.g. 'AION_PID')
+            file_descriptor, tmp_fname = mkstemp(dir=dirname(fname), prefix="." + basename(fname) + ".")
+            try:
+                with open(file_descriptor, "wb") as file:
+                    file.write(pack("<8sII", self._magic, self._slot_number, self._slot_size).ljust(size, b"\x00"))
+                with self._locked(True):
+                    replace(tmp_fname, fname)
+            except BaseException:
+                try:
+                    remove(tmp_fname)
+                except OSError:
+                    pass
+                raise
+
+        self._fd = os_open(fname, O_RDWR | O_NOFOLLOW)
+        if fstat(self._fd).st_uid not in (0, geteuid()):  # e.g. a table which another user has created before aion was started
+            close(self._fd)
+            raise ValueError("Errno: " + _variable_invalid_variable_file + " - The variable file " + fname + " belongs to another user")
+        try:
+            self._map = mmap(self._fd, size)
+        except ValueError:
+            close(self._fd)
+            raise ValueError("Errno: " + _variable_invalid_variable_file + " - The variable file " + fname + " is too small")
+        if _unpack_from("<8sII", self._map) != (self._magic, self._slot_number, self._slot_size):
+            self.close()
+            raise ValueError("Errno: " + _variable_invalid_variable_file + " - The variable file " + fname + " has an unknown format")
+
+    def _locked(self, exclusive: bool = False):
+        """
+        locks the table for all other threads and processes (via the lock file of the table, so that the lock also covers a table which gets replaced by 'create')
+
+        :param exclusive: bool, optional
+            if True, the table gets locked for writing, if False, for reading
+            syntax: <boolean>
+            example: False
+        :return: contextmanager
+
+        :since: 0.1.0
+        """
+        return _FileLock(self.fname, exclusive)
+
+    def _find(self, name: bytes) -> (int, bool):
+        """
+        searches the slot of a variable
+
+        :param name: bytes
+            encoded name of the variable
+            syntax: <name>
+            example: b"IS_AION_RUNNING"
+        :return: (int, bool)
+            returns the offset of the slot of the variable (or of the first free slot, if the variable doesn't exist) and if the variable exists
+            syntax: (<offset>, <boolean>)
+            example: (4112, True)
+
+        :since: 0.1.0
+        """
+        free_offset = None
+        index = _crc32(name) % self._slot_number
+        for i in range(self._slot_number):
+            offset = self._header_size + ((index + i) % self._slot_number) * self._slot_size
+            state = self._map[offset]
+            if state == 0:
+                if free_offset is None:
+                    free_offset = offset
+                return free_offset, False
+            elif state == 2:
+                if free_offset is None:
+                    free_offset = offset
+            elif self._map[offset + 1] == len(name) and self._map[offset + 4:offset + 4 + len(name)] == name:
+                return offset, True
+        return free_offset, False
+
+    def close(self) -> None:
+        """
+        closes the table
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from os import close
+
+        self._map.close()
+        close(self._fd)
+
+    def get(self, name: str) -> str:
+        """
+        get the value of a variable
+
+        :param name: str
+            name of the variable
+            syntax: <name>
+            example: "IS_AION_RUNNING"
+        :return: str
+            returns the value of the variable or None if the variable doesn't exist
+            syntax: <value>
+            example: "True"
+
+        :since: 0.1.0
+        """
+        encoded_name = name.encode("utf-8")
+        with self._locked():
+            offset, exists = self._find(encoded_name)
+            if exists is False:
+                return None
+            value_length = _unpack_from("<H", self._map, offset + 2)[0]
+            value_offset = offset + 4 + self._name_size
+            return self._map[value_offset:value_offset + value_length].decode("utf-8")
+
+    def items(self) -> dict:
+        """
+        get all variables
+
+        :return: dict
+            returns all variables with their values
+            syntax: {<name>: <value>}
+            example: {"IS_AION_RUNNING": "True"}
+
+        :since: 0.1.0
+        """
+        variables = {}
+        with self._locked():
+            for slot in range(self._slot_number):
+                offset = self._header_size + slot * self._slot_size
+                if self._map[offset] == 1:
+                    name = self._map[offset + 4:offset + 4 + self._map[offset + 1]].decode("utf-8")
+                    value_offset = offset + 4 + self._name_size
+                    variables[name] = self._map[value_offset:value_offset + _unpack_from("<H", self._map, offset + 2)[0]].decode("utf-8")
+        return variables
+
+    def remove(self, name: str) -> bool:
+        """
+        removes a variable
+
+        :param name: str
+            name of the variable
+            syntax: <name>
+            example: "test_variable"
+        :return: bool
+            returns True if the variable existed, False if not
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        encoded_name = name.encode("utf-8")
+        with self._locked(True):
+            offset, exists = self._find(encoded_name)
+            if exists is True:
+                self._map[offset] = 2
+            return exists
+
+    def set(self, name: str, value: str, must_exist: bool = False) -> bool:
+        """
+        sets the value of a variable (atomic for all processes)
+
+        :param name: str
+            name of the variable
+            syntax: <name>
+            example: "IS_AION_RUNNING"
+        :param value: str
+            new value of the variable
+            syntax: <value>
+            example: "True"
+        :param must_exist: bool, optional
+            if True, the value is only set if the variable already exists
+            syntax: <boolean>
+            example: False
+        :return: bool
+            returns True if the value was set, False if not
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        encoded_name = name.encode("utf-8")
+        encoded_value = str(value).encode("utf-8")
+        if len(encoded_name) > self._name_size or len(encoded_value) > self._value_size:
+            raise ValueError("Errno: " + _variable_name_or_value_too_long + " - The name of a variable can be max. " + str(self._name_size) + " and the value max. " + str(self._value_size) + " bytes long")
+
+        with self._locked(True):
+            offset, exists = self._find(encoded_name)
+            if exists is False:
+                if must_exist is True:
+                    return False
+                if offset is None:
+                    raise MemoryError("Errno: " + _variable_table_full + " - Can't store more than " + str(self._slot_number) + " variables")
+            value_offset = offset + 4 + self._name_size
+            self._map[value_offset:value_offset + len(encoded_value)] = encoded_value
+            _pack_into("<BBH", self._map, offset, 0 if exists is False else 1, len(encoded_name), len(encoded_value))
+            self._map[offset + 4:offset + 4 + len(encoded_name)] = encoded_name
+            self._map[offset] = 1
+            return True
+
+
 class Variable:
     """
     base class for aion variables
@@ -22,14 +281,12 @@ class Variable:
 
         :since: 0.1.0
         """
-        from os.path import isfile as _isfile
-
         self._user_variables = {}
 
-        if _isfile(_aion_variable_file):
-            self._aion_open_variable_file = open(_aion_variable_file, "w+")
-        else:
-            self._aion_open_variable_file = None
+        try:
+            self._variable_table = _VariableTable(_aion_variable_file)
+        except (FileNotFoundError, ValueError):
+            self._variable_table = None
 
     def add_variable(self, variable_name: str, value: str) -> None:
         """
@@ -47,15 +304,13 @@ class Variable:
 
         :since: 0.1.0
         """
-        if self._aion_open_variable_file is not None:
-            file = open(_aion_variable_file, "a")
-            file.write(variable_name + "=" + value)
-            self._aion_open_variable_file = open(_aion_variable_file, "w+")
+        if self._variable_table is not None:
+            self._variable_table.set(variable_name, value)
         self._user_variables[variable_name] = value
 
     def close(self) -> None:
         """
-        remove the file with the saved variables
+        remove the file with the saved variables (only the aion daemon should call this, other processes use 'release')
 
         :return: None
 
@@ -63,9 +318,51 @@ class Variable:
         """
         from os import remove
 
-        if self._aion_open_variable_file is not None:
-            remove(_aion_variable_file)
-            self._aion_open_variable_file = None
+        if self._variable_table is not None:
+            self.release()
+            try:
+                remove(_aion_variable_file)
+            except FileNotFoundError:
+                pass
+
+    def release(self) -> None:
+        """
+        closes the file descriptor and the memory map of the variable table, the file with the saved variables stays
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        if self._variable_table is not None:
+            self._variable_table.close()
+            self._variable_table = None
+
+    def get_aion_pid(self) -> int:
+        """
+        get the pid of the running aion daemon, after it was checked that the pid really belongs to aion
+
+        :return: int
+            returns the pid
+            syntax: <pid>
+            example: 1234
+
+        :since: 0.1.0
+        """
+        from os import stat
+
+        pid = self.get_value(AION_PID)
+        try:
+            if pid.isdigit() is False or int(pid) <= 1:
+                raise ValueError
+            # the process must be owned by the owner of the variable table and must run aion's 'main.py'
+            if stat("/proc/" + pid).st_uid != stat(_aion_variable_file).st_uid:
+                raise ValueError
+            with open("/proc/" + pid + "/cmdline", "rb") as file:
+                if b"main.py" not in file.read():
+                    raise ValueError
+        except (OSError, ValueError):
+            raise ValueError("Errno: " + _variable_invalid_aion_pid + " - " + pid + " isn't the pid of a running aion process")
+        return int(pid)
 
     def get_value(self, variable_name: str) -> str:
         """
@@ -87,13 +384,11 @@ class Variable:
         except ImportError:
             from _error_codes import variable_get_value_variable_file_variable_doesnt_exist, variable_get_value_user_variables_variable_doesnt_exist
 
-        if self._aion_open_variable_file is not None:
-            for value in self._aion_open_variable_file:
-                if value.strip().startswith("#"):
-                    continue
-                elif value.split("=")[0].strip() == variable_name:
-                    return value.split("=")[1].strip()
-            raise KeyError("Errno: " + variable_get_value_variable_file_variable_doesnt_exist + " - The variable " + variable_name + " doesn't exists")
+        if self._variable_table is not None:
+            value = self._variable_table.get(variable_name)
+            if value is None:
+                raise KeyError("Errno: " + variable_get_value_variable_file_variable_doesnt_exist + " - The variable " + variable_name + " doesn't exists")
+            return value
         else:
             try:
                 return str(_default_variables[variable_name])
@@ -104,7 +399,7 @@ class Variable:
 
     def inititalize_variables(self, additional_variables: dict = {}) -> None:
         """
-        creates a new file for the variables to store
+        creates a new table for the variables to store
 
         :param additional_variables: dict, optional
             variables that should be added ('add_variable' could be used instead)
@@ -114,12 +409,12 @@ class Variable:
 
         :since: 0.1.0
         """
-        self._aion_open_variable_file = open(_aion_variable_file, "w+")
-        write_list = [variable + "=" + str(value) for variable, value in _default_variables.items()]
-        write_list = write_list + [str(additional_variable) + "=" + str(additional_value) for additional_variable, additional_value in additional_variables.items()]
-        write_list = write_list + [str(user_variable) + "=" + str(user_value) for user_variable, user_value in self._user_variables]
-        self._aion_open_variable_file.writelines(write_list)
-        self._aion_open_variable_file = open(_aion_variable_file, "w+")
+        if self._variable_table is not None:
+            self._variable_table.close()
+        self._variable_table = _VariableTable(_aion_variable_file, create=True)
+        for variables in (_default_variables, additional_variables, self._user_variables):
+            for variable, value in variables.items():
+                self._variable_table.set(str(variable), str(value))
 
     def remove_variable(self, variable_name: str) -> None:
         """
@@ -135,10 +430,8 @@ class Variable:
         """
         try:
             from ._error_codes import variable_remove_variable_variable_doesnt_exist
-            from .utils import remove_space, replace_line
         except ImportError:
             from _error_codes import variable_remove_variable_variable_doesnt_exist
-            from utils import remove_space, replace_line
 
         found = False
 
@@ -146,14 +439,8 @@ class Variable:
             del self._user_variables[variable_name]
             found = True
 
-        if self._aion_open_variable_file is not None:
-            line_number = -1
-            for line in self._aion_open_variable_file:
-                line_number = line_number + 1
-                if remove_space(line, "").split("=")[0] == variable_name:
-                    replace_line(_aion_variable_file, line_number, "")
-                    self._aion_open_variable_file = open(_aion_variable_file, "w+")
-                    return
+        if self._variable_table is not None and self._variable_table.remove(variable_name) is True:
+            found = True
 
         if found is False:
             raise KeyError("Errno: " + variable_remove_variable_variable_doesnt_exist + " - The variable " + variable_name + " doesn't exists")
@@ -176,10 +463,8 @@ class Variable:
         """
         try:
             from ._error_codes import variable_set_value_variable_doesnt_exist
-            from .utils import remove_space, replace_line
         except ImportError:
             from _error_codes import variable_set_value_variable_doesnt_exist
-            from utils import remove_space, replace_line
 
         found = False
 
@@ -187,14 +472,8 @@ class Variable:
             self._user_variables[variable_name] = value
             found = True
 
-        if self._aion_open_variable_file is not None:
-            line_number = -1
-            for line in self._aion_open_variable_file:
-                line_number = line_number + 1
-                if remove_space(line, " ").split("=")[0] == variable_name:
-                    replace_line(_aion_variable_file, line_number, variable_name + "=" + value)
-                    self._aion_open_variable_file = open(_aion_variable_file, "w+")
-                    return
+        if self._variable_table is not None and self._variable_table.set(variable_name, value, must_exist=not found) is True:
+            found = True
 
         if found is False:
             raise KeyError("Errno: " + variable_set_value_variable_doesnt_exist + " - The variable " + variable_name + " doesn't exists")
@@ -0,0 +1,347 @@
+#!/usr/bin/python3
+
+try:
+    from .utils import get_file_signature as _get_file_signature
+except ImportError:
+    from utils import get_file_signature as _get_file_signature
+
+# inotify constants (see 'man 7 inotify')
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_CLOEXEC = 0o2000000
+_IN_NONBLOCK = 0o4000
+
+_watch_mask = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_MODIFY
+
+
+def _load_inotify():
+    """
+    loads the inotify functions of the c library
+
+    :return: ctypes.CDLL
+        returns the c library or None if inotify isn't available (e.g. not on linux)
+
+    :since: 0.1.0
+    """
+    from ctypes import CDLL, c_char_p, c_int, c_uint32
+    from ctypes.util import find_library
+
+    try:
+        libc = CDLL(find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [c_int]
+        libc.inotify_init1.restype = c_int
+        libc.inotify_add_watch.argtypes = [c_int, c_char_p, c_uint32]
+        libc.inotify_add_watch.restype = c_int
+    except (AttributeError, OSError):
+        return None
+    return libc
+
+
+def _signature(fname: str) -> tuple:
+    """
+    returns the signature of a file or None if it doesn't exist
+
+    :param fname: str
+        name of the file
+        syntax: <filename>
+        example: "/etc/aion_data/config.xml"
+    :return: tuple
+        returns the signature (see 'utils.get_file_signature')
+        syntax: (<inode>, <modification time in ns>, <size>)
+        example: (262311, 1593853741265172000, 412)
+
+    :since: 0.1.0
+    """
+    try:
+        return _get_file_signature(fname)
+    except OSError:
+        return None
+
+
+class FileWatcher:
+    """
+    watches files and directories and calls a callback when they were changed, created, replaced or removed
+    it uses inotify if available and checks the signatures of the files every 'interval' seconds if not
+    changes which happen shortly after each other (e.g. while a skill is installed) are collected and every callback is called only once with all its changed files
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, interval: float = 1.0, debounce: float = 0.2, use_inotify: bool = True) -> None:
+        """
+        :param interval: float, optional
+            seconds between two checks if inotify isn't available
+            syntax: <seconds>
+            example: 1.0
+        :param debounce: float, optional
+            seconds without any change after which the callbacks are called
+            syntax: <seconds>
+            example: 0.2
+        :param use_inotify: bool, optional
+            if False, the files are always polled
+            syntax: <boolean>
+            example: True
+        :return: None
+
+        :since: 0.1.0
+        """
+        from threading import Event, Lock
+
+        self.interval = interval
+        self.debounce = debounce
+        self.use_inotify = use_inotify
+        self.mode = None
+
+        self._callbacks = {}
+        self._lock = Lock()
+        self._signatures = {}
+        self._stop_event = Event()
+        self._thread = None
+
+    def _changed_files(self, paths: set = None) -> dict:
+        """
+        compares the signatures of the watched files with the last known ones
+
+        :param paths: set, optional
+            watched paths which should be checked (None = all)
+            syntax: {<path>}
+            example: {"/etc/aion_data/language"}
+        :return: dict
+            returns the changed files per watched path
+            syntax: {<path>: [<filename>]}
+            example: {"/etc/aion_data/language": ["/etc/aion_data/language/en_US.acph"]}
+
+        :since: 0.1.0
+        """
+        changed = {}
+        for path in (self._callbacks if paths is None else paths):
+            signatures = self._scan(path)
+            old_signatures = self._signatures.get(path, {})
+            fnames = sorted(fname for fname in set(signatures) | set(old_signatures) if signatures.get(fname) != old_signatures.get(fname))
+            if fnames:
+                changed[path] = fnames
+            self._signatures[path] = signatures
+        return changed
+
+    def _notify(self, changed: dict) -> None:
+        """
+        calls the callbacks of the changed paths (every callback only once)
+
+        :param changed: dict
+            the changed files per watched path (see '_changed_files')
+            syntax: {<path>: [<filename>]}
+            example: {"/etc/aion_data/skills/skills.xml": ["/etc/aion_data/skills/skills.xml"]}
+        :return: None
+
+        :since: 0.1.0
+        """
+        from traceback import print_exc
+
+        calls = []
+        with self._lock:
+            for path, fnames in changed.items():
+                for callback in self._callbacks.get(path, []):
+                    for call in calls:
+                        if call[0] is callback:
+                            call[1].extend(fname for fname in fnames if fname not in call[1])
+                            break
+                    else:
+                        calls.append((callback, list(fnames)))
+        for callback, fnames in calls:
+            try:
+                callback(fnames)
+            except Exception:  # a failed rebuild mustn't stop the watcher
+                print_exc()
+
+    def _run_inotify(self, libc) -> bool:
+        """
+        waits for inotify events until the watcher gets stopped
+
+        :param libc: ctypes.CDLL
+            the c library (see '_load_inotify')
+        :return: bool
+            returns False if inotify couldn't be set up, True if the watcher was stopped
+
+        :since: 0.1.0
+        """
+        from os import close, read
+        from os.path import dirname, isdir
+        from select import select
+        from struct import calcsize, unpack_from
+        from time import monotonic
+
+        fd = libc.inotify_init1(_IN_CLOEXEC | _IN_NONBLOCK)
+        if fd < 0:
+            return False
+        try:
+            directories = {}
+            with self._lock:
+                paths = list(self._callbacks)
+            for path in paths:
+                directory = path if isdir(path) else dirname(path)  # files are replaced atomically, so the directory must be watched
+                if directory in directories.values():
+                    continue
+                wd = libc.inotify_add_watch(fd, directory.encode(), _watch_mask)
+                if wd < 0:
+                    return False
+                directories[wd] = directory
+
+            self.mode = "inotify"
+            event_size = calcsize("iIII")
+            while not self._stop_event.is_set():
+                changed_paths = set()
+                deadline = None
+                while not self._stop_event.is_set():
+                    timeout = 0.5 if deadline is None else max(0.0, deadline - monotonic())
+                    if deadline is not None and timeout == 0:
+                        break
+                    if not select([fd], [], [], timeout)[0]:
+                        continue
+                    try:
+                        buffer = read(fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    offset = 0
+                    while offset + event_size <= len(buffer):
+                        wd, mask, cookie, length = unpack_from("iIII", buffer, offset)
+                        name = buffer[offset + event_size:offset + event_size + length].split(b"\0", 1)[0].decode(errors="replace")
+                        offset += event_size + length
+                        directory = directories.get(wd)
+                        if directory is None or name.startswith("."):  # e.g. the temporary files of atomic writes
+                            continue
+                        fname = directory + "/" + name
+                        with self._lock:
+                            for path in self._callbacks:
+                                if path == fname or path == directory:
+                                    changed_paths.add(path)
+                    if changed_paths:
+                        deadline = monotonic() + self.debounce
+                if changed_paths:
+                    with self._lock:
+                        changed = self._changed_files(changed_paths)
+                    if changed:
+                        self._notify(changed)
+            return True
+        finally:
+            close(fd)
+
+    def _run_polling(self) -> None:
+        """
+        checks the watched files every 'interval' seconds until the watcher gets stopped
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        self.mode = "polling"
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                changed = self._changed_files()
+            if changed:
+                self._stop_event.wait(self.debounce)  # the files of one installation are collected together
+                with self._lock:
+                    for path, fnames in self._changed_files(set(changed)).items():
+                        changed[path] = sorted(set(changed[path]) | set(fnames))
+                self._notify(changed)
+
+    def _run(self) -> None:
+        """
+        main loop of the watcher thread
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        libc = _load_inotify() if self.use_inotify else None
+        if libc is None or self._run_inotify(libc) is False:
+            self._run_polling()
+
+    @staticmethod
+    def _scan(path: str) -> dict:
+        """
+        returns the signatures of a watched file or of all (not hidden) files in a watched directory
+
+        :param path: str
+            the watched file or directory
+            syntax: <path>
+            example: "/etc/aion_data/language"
+        :return: dict
+            returns the signature of every existing file
+            syntax: {<filename>: <signature>}
+            example: {"/etc/aion_data/language/en_US.acph": (262311, 1593853741265172000, 412)}
+
+        :since: 0.1.0
+        """
+        from os import listdir
+        from os.path import isdir
+
+        if isdir(path):
+            try:
+                fnames = [path + "/" + fname for fname in listdir(path) if not fname.startswith(".")]
+            except OSError:
+                fnames = []
+        else:
+            fnames = [path]
+        signatures = {}
+        for fname in fnames:
+            signature = _signature(fname)
+            if signature is not None:
+                signatures[fname] = signature
+        return signatures
+
+    def start(self) -> None:
+        """
+        starts the watcher thread
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from threading import Thread
+
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        stops the watcher thread
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def watch(self, path: str, callback) -> None:
+        """
+        calls a callback when a file or a file in a directory was changed (must be called before 'start')
+
+        :param path: str
+            the file or directory (files in sub directories and hidden files are ignored)
+            syntax: <path>
+            example: "/etc/aion_data/language"
+        :param callback: callable
+            function which gets a list of all changed files
+            syntax: <callback>
+            example: lambda fnames: print(fnames)
+        :return: None
+
+        :since: 0.1.0
+        """
+        from os.path import abspath
+
+        path = abspath(path)
+        with self._lock:
+            self._callbacks.setdefault(path, []).append(callback)
+            if path not in self._signatures:
+                self._signatures[path] = self._scan(path)
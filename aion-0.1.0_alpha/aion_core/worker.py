@@ -0,0 +1,988 @@
+#!/usr/bin/python3
+
+try:
+    from .logging import _get_writer, flush as _flush, rotate as _rotate
+    from .skill import get_registry as _get_registry, skills_file as _skills_file
+    from .trace import record as _record, set_trace as _set_trace, span as _span
+    from .utils import aion_data_path as _aion_data_path, BaseXMLReader as _BaseXMLReader
+except ImportError:
+    from logging import _get_writer, flush as _flush, rotate as _rotate
+    from skill import get_registry as _get_registry, skills_file as _skills_file
+    from trace import record as _record, set_trace as _set_trace, span as _span
+    from utils import aion_data_path as _aion_data_path, BaseXMLReader as _BaseXMLReader
+
+accounting_file = _aion_data_path + "/logs/skills.accounting"
+
+# limits a skill run can have ('timeout' and 'cpu_time' in seconds, 'memory' in megabytes, 0 = no limit)
+limit_names = ("timeout", "cpu_time", "memory")
+
+_max_accounting_file_size = 1048576
+_cpu_limited = False
+
+# statuses with which a worker reports a finished job
+_finish_statuses = ("done", "error", "cpu_limit", "memory_limit")
+
+
+class _CpuTimeExceeded(BaseException):
+    """
+    raised in a skill worker if a skill has used up its cpu time (it's no 'Exception', so that a skill can't catch it with 'except Exception')
+
+    :since: 0.1.0
+    """
+
+
+def execute(main_file: str, method: str, speech_input: str, activate_phrase: str, run_after_plugins: dict, run_before_plugins: dict) -> None:
+    """
+    executes a skill class (calls 'run_before', 'main' and 'run_after')
+
+    :param main_file: str
+        name of the skill main file (without '.py')
+        syntax: <main file>
+        example: "skills"
+    :param method: str
+        name of the skill class in the main file
+        syntax: <method>
+        example: "CurrentTime"
+    :param speech_input: str
+        complete spoken words
+        syntax: <speech input>
+        example: "What time is it"
+    :param activate_phrase: str
+        activate phrase that called the skill
+        syntax: <activate phrase>
+        example: "time"
+    :param run_after_plugins: dict
+        all run after plugins (a dict or a 'plugin.PluginRegistry')
+    :param run_before_plugins: dict
+        all run before plugins (a dict or a 'plugin.PluginRegistry')
+    :return: None
+
+    :since: 0.1.0
+    """
+    with _get_registry().use(main_file, method) as skill_class:  # another thread can't unload the skill while it's running
+        skill = skill_class(activate_phrase, speech_input, run_after_plugins, run_before_plugins)
+        with _span("skill.run_before"):
+            skill.run_before()
+        with _span("skill.main"):
+            skill.main()
+        with _span("skill.run_after"):
+            skill.run_after()
+
+
+def get_all_skill_main_files() -> list:
+    """
+    returns the main files (without '.py') of all installed skills
+
+    :return: list
+        returns list of all skill main files
+        syntax: [<main file>]
+        example: ["skills"]
+
+    :since: 0.1.0
+    """
+    main_files = []
+    for skill in _BaseXMLReader(_skills_file).find("main_file"):
+        main_file = "".join(skill.text.split(".")[:-1])
+        if main_file not in main_files:
+            main_files.append(main_file)
+    return main_files
+
+
+def _cgroup_value(cgroup: str, name: str, key: str = None) -> int:
+    """
+    reads a value from a cgroup file
+
+    :param cgroup: str
+        path of the cgroup
+        syntax: <path>
+        example: "/sys/fs/cgroup/aion/worker-1234"
+    :param name: str
+        name of the file
+        syntax: <name>
+        example: "memory.events"
+    :param key: str, optional
+        key of the value in a flat keyed file (None = the file contains only the value)
+        syntax: <key>
+        example: "oom_kill"
+    :return: int
+        returns the value or None if it couldn't be read
+        syntax: <value>
+        example: 0
+
+    :since: 0.1.0
+    """
+    try:
+        with open(cgroup + "/" + name, "r") as file:
+            if key is None:
+                return int(file.read().strip())
+            for line in file:
+                if line.split()[0] == key:
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _cpu_time(pid: int = None) -> float:
+    """
+    returns the cpu time (user + system) a process has used
+
+    :param pid: int, optional
+        pid of the process (None = this process, including its finished child processes)
+        syntax: <pid>
+        example: 1234
+    :return: float
+        returns the cpu time in seconds or None if the process doesn't exist
+        syntax: <seconds>
+        example: 0.42
+
+    :since: 0.1.0
+    """
+    from os import sysconf
+
+    if pid is None:
+        from resource import getrusage, RUSAGE_CHILDREN, RUSAGE_SELF
+
+        return sum(usage.ru_utime + usage.ru_stime for usage in (getrusage(RUSAGE_SELF), getrusage(RUSAGE_CHILDREN)))
+    try:
+        with open("/proc/" + str(pid) + "/stat", "r") as file:
+            fields = file.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _join_cgroup(cgroup: str) -> str:
+    """
+    moves the calling worker into its own child cgroup of the given (cgroup v2) cgroup
+
+    :param cgroup: str
+        path of the cgroup under which the worker cgroups are created
+        syntax: <path>
+        example: "/sys/fs/cgroup/aion"
+    :return: str
+        returns the path of the worker cgroup or None if the worker couldn't be moved into it
+        syntax: <path>
+        example: "/sys/fs/cgroup/aion/worker-1234"
+
+    :since: 0.1.0
+    """
+    from os import getpid, mkdir
+
+    worker_cgroup = cgroup.rstrip("/") + "/worker-" + str(getpid())
+    try:
+        try:
+            mkdir(worker_cgroup)
+        except FileExistsError:
+            pass
+        with open(worker_cgroup + "/cgroup.procs", "w") as file:
+            file.write(str(getpid()))
+    except OSError:
+        return None
+    return worker_cgroup
+
+
+def _peak_rss(pid: (int, str) = "self") -> int:
+    """
+    returns the peak resident memory of a process (since the start of the process or the last '_reset_peak_rss')
+
+    :param pid: int or str, optional
+        pid of the process
+        syntax: <pid>
+        example: 1234
+    :return: int
+        returns the peak resident memory in kilobytes or None if it couldn't be read
+        syntax: <kilobytes>
+        example: 24576
+
+    :since: 0.1.0
+    """
+    try:
+        with open("/proc/" + str(pid) + "/status", "r") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _raise_cpu_time_exceeded(signum, frame) -> None:
+    """
+    handler of 'SIGXCPU', which the kernel sends when the soft cpu time limit of the worker is reached
+
+    :return: None
+
+    :since: 0.1.0
+    """
+    if _cpu_limited is True:
+        raise _CpuTimeExceeded()
+
+
+def _reset_peak_rss() -> None:
+    """
+    resets the peak resident memory of this process, so that the peak of every job can be measured
+
+    :return: None
+
+    :since: 0.1.0
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+    except OSError:
+        pass
+
+
+def _set_limits(limits: dict, cgroup: str = None) -> tuple:
+    """
+    sets the cpu time and memory limit of a job in the worker (the limits are also inherited by all processes the skill starts)
+    the cpu time is limited with 'RLIMIT_CPU', the memory with the 'memory.max' of the worker cgroup or, without cgroup, with 'RLIMIT_AS' (the address space of the whole worker)
+
+    :param limits: dict
+        limits of the job (see 'limit_names')
+        syntax: {<limit>: <value>}
+        example: {"cpu_time": 30, "memory": 200}
+    :param cgroup: str, optional
+        path of the worker cgroup
+        syntax: <path>
+        example: "/sys/fs/cgroup/aion/worker-1234"
+    :return: tuple
+        returns the previous cpu time and address space limits, which are given to '_restore_limits'
+        syntax: (<cpu time limits>, <address space limits>)
+        example: ((-1, -1), (-1, -1))
+
+    :since: 0.1.0
+    """
+    from math import ceil
+    from resource import getrlimit, getrusage, setrlimit, RLIM_INFINITY, RLIMIT_AS, RLIMIT_CPU, RUSAGE_SELF
+
+    global _cpu_limited
+
+    previous_limits = (getrlimit(RLIMIT_CPU), getrlimit(RLIMIT_AS))
+    try:
+        if limits.get("cpu_time"):
+            usage = getrusage(RUSAGE_SELF)
+            soft_limit = int(ceil(usage.ru_utime + usage.ru_stime + float(limits["cpu_time"])))  # 'RLIMIT_CPU' counts the whole lifetime of the worker
+            hard_limit = previous_limits[0][1]
+            setrlimit(RLIMIT_CPU, (soft_limit if hard_limit == RLIM_INFINITY else min(soft_limit, hard_limit), hard_limit))
+            _cpu_limited = True
+        if limits.get("memory"):
+            memory = int(float(limits["memory"]) * 1048576)
+            if cgroup is None or _write_cgroup(cgroup, "memory.max", str(memory)) is False:
+                hard_limit = previous_limits[1][1]
+                setrlimit(RLIMIT_AS, (memory if hard_limit == RLIM_INFINITY else min(memory, hard_limit), hard_limit))
+    except (OSError, ValueError):
+        pass
+    return previous_limits
+
+
+def _restore_limits(previous_limits: tuple, cgroup: str = None) -> None:
+    """
+    removes the limits of a job (see '_set_limits')
+
+    :param previous_limits: tuple
+        the limits which '_set_limits' has returned
+        syntax: (<cpu time limits>, <address space limits>)
+        example: ((-1, -1), (-1, -1))
+    :param cgroup: str, optional
+        path of the worker cgroup
+        syntax: <path>
+        example: "/sys/fs/cgroup/aion/worker-1234"
+    :return: None
+
+    :since: 0.1.0
+    """
+    from resource import setrlimit, RLIMIT_AS, RLIMIT_CPU
+
+    global _cpu_limited
+
+    _cpu_limited = False
+    try:
+        setrlimit(RLIMIT_CPU, previous_limits[0])
+        setrlimit(RLIMIT_AS, previous_limits[1])
+    except (OSError, ValueError):
+        pass
+    if cgroup is not None:
+        _write_cgroup(cgroup, "memory.max", "max")
+
+
+def _write_cgroup(cgroup: str, name: str, value: str) -> bool:
+    """
+    writes a value to a cgroup file
+
+    :param cgroup: str
+        path of the cgroup
+        syntax: <path>
+        example: "/sys/fs/cgroup/aion/worker-1234"
+    :param name: str
+        name of the file
+        syntax: <name>
+        example: "memory.max"
+    :param value: str
+        the value
+        syntax: <value>
+        example: "209715200"
+    :return: bool
+        returns True if the value was written, False if not
+        syntax: <boolean>
+        example: True
+
+    :since: 0.1.0
+    """
+    try:
+        with open(cgroup + "/" + name, "w") as file:
+            file.write(value)
+    except OSError:
+        return False
+    return True
+
+
+def _preload(main_files: list) -> None:
+    """
+    imports 'aion_core', the hot skills and the given skill main files, so that the jobs of a worker don't have to do it (all other skills are imported on their first use)
+
+    :param main_files: list
+        skill main files which should be imported
+        syntax: [<main file>]
+        example: ["skills"]
+    :return: None
+
+    :since: 0.1.0
+    """
+    from importlib import import_module
+    from traceback import print_exc
+
+    for core_module in ["config", "language", "plugin", "skill", "utils"]:
+        try:
+            if __package__:
+                import_module("." + core_module, __package__)
+            else:
+                import_module(core_module)
+        except Exception:
+            print_exc()
+
+    _get_registry().preload(main_files)
+
+
+def _worker(job_queue, status_queue, max_jobs: int, main_files: list, run_after_plugins: dict, run_before_plugins: dict, cgroup: str = None) -> None:
+    """
+    main loop of a skill worker process
+
+    :param job_queue: multiprocessing.Queue
+        queue from which the jobs are taken
+    :param status_queue: multiprocessing.Queue
+        queue to which the status of the jobs are reported
+    :param max_jobs: int
+        number of jobs after which the worker exits (0 = never)
+        syntax: <max jobs>
+        example: 50
+    :param main_files: list
+        skill main files which are imported before the first job
+        syntax: [<main file>]
+        example: ["skills"]
+    :param run_after_plugins: dict
+        all run after plugins (a dict or a 'plugin.PluginRegistry')
+    :param run_before_plugins: dict
+        all run before plugins (a dict or a 'plugin.PluginRegistry')
+    :param cgroup: str, optional
+        path of the cgroup (v2) under which the worker creates its own cgroup (None = no cgroup)
+        syntax: <path>
+        example: "/sys/fs/cgroup/aion"
+    :return: None
+
+    :since: 0.1.0
+    """
+    from os import getpid, setpgid
+    from signal import signal, SIGXCPU
+    from time import time
+    from traceback import format_exc
+
+    pid = getpid()
+    # every worker leads its own process group, so that a cancelled skill gets killed together with all processes it has started (e.g. 'vlc')
+    try:
+        setpgid(0, 0)
+    except OSError:
+        pass
+    if cgroup is not None:
+        cgroup = _join_cgroup(cgroup)
+    signal(SIGXCPU, _raise_cpu_time_exceeded)
+    _preload(main_files)
+    status_queue.put(("ready", None, pid, None, None))
+
+    jobs = 0
+    while True:
+        job = job_queue.get()
+        if job is None:
+            break
+        job_id, main_file, method, speech_input, activate_phrase, trace_id, submit_time, limits = job
+        _reset_peak_rss()
+        start_cpu_time = _cgroup_value(cgroup, "cpu.stat", "usage_usec") if cgroup is not None else None
+        start_cpu_time = start_cpu_time / 1000000 if start_cpu_time is not None else _cpu_time()
+        status_queue.put(("start", job_id, pid, None, {"cpu_time": _cpu_time(pid)}))
+        _set_trace(trace_id)
+        _record("skill.queue", submit_time, time() - submit_time)
+        _get_registry().refresh()  # skills which were installed, updated or removed since the worker was started
+        for plugins in (run_after_plugins, run_before_plugins):
+            if hasattr(plugins, "refresh"):  # plugins which were installed or removed since the worker was started
+                plugins.refresh()
+        previous_limits = _set_limits(limits or {}, cgroup)
+        try:
+            execute(main_file, method, speech_input, activate_phrase, run_after_plugins, run_before_plugins)
+            status, error = "done", None
+        except _CpuTimeExceeded:
+            status, error = "cpu_limit", None
+        except MemoryError:
+            status, error = "memory_limit" if (limits or {}).get("memory") else "error", format_exc()
+        except BaseException:
+            status, error = "error", format_exc()
+        _restore_limits(previous_limits, cgroup)
+        cpu_time = _cgroup_value(cgroup, "cpu.stat", "usage_usec") if cgroup is not None else None
+        cpu_time = cpu_time / 1000000 if cpu_time is not None else _cpu_time()
+        status_queue.put((status, job_id, pid, error, {"cpu_time": cpu_time - start_cpu_time, "peak_rss": _peak_rss()}))
+        _flush()  # the worker can be killed at any time, so the spans of the job shouldn't stay in the buffer
+        jobs += 1
+        if 0 < max_jobs <= jobs:
+            status_queue.put(("recycle", None, pid, None, None))
+            break
+
+
+def read_accounting_file(fname: str = None) -> list:
+    """
+    reads all skill runs from an accounting file
+
+    :param fname: str, optional
+        filename of the accounting file (None = 'accounting_file')
+        syntax: <filename>
+        example: "/etc/aion_data/logs/skills.accounting"
+    :return: list
+        returns the skill runs ('cpu_time' in seconds and 'peak_rss' in kilobytes are None if they're unknown)
+        syntax: [{"start": <start time>, "duration": <duration in seconds>, "main_file": <main file>, "method": <method>, "status": <status>, "cpu_time": <cpu time>, "peak_rss": <peak rss>, "pid": <pid>, "trace_id": <trace id>}]
+        example: [{"start": 1593853741.27, "duration": 0.412, "main_file": "skills", "method": "CurrentTime", "status": "done", "cpu_time": 0.42, "peak_rss": 24576, "pid": 1234, "trace_id": "3f2a9c1e04b7d865"}]
+
+    :since: 0.1.0
+    """
+    if fname is None:
+        fname = accounting_file
+
+    runs = []
+    with open(fname, "r") as file:
+        for line in file:
+            try:
+                start, duration, main_file, method, status, cpu_time, peak_rss, pid, trace_id = line.split()
+                runs.append({"start": float(start), "duration": float(duration) / 1000, "main_file": main_file, "method": method, "status": status,
+                             "cpu_time": float(cpu_time) / 1000 if cpu_time != "-" else None, "peak_rss": int(peak_rss) if peak_rss != "-" else None,
+                             "pid": int(pid), "trace_id": trace_id if trace_id != "-" else None})
+            except ValueError:  # e.g. a line which was written by a killed process
+                continue
+    return runs
+
+
+def summarize_accounting(fname: str = None, last: int = None) -> dict:
+    """
+    summarizes the skill runs in an accounting file per skill class
+
+    :param fname: str, optional
+        filename of the accounting file (None = 'accounting_file')
+        syntax: <filename>
+        example: "/etc/aion_data/logs/skills.accounting"
+    :param last: int, optional
+        number of (newest) skill runs which should be summarized (None = all)
+        syntax: <number>
+        example: 20
+    :return: dict
+        returns the number of runs and per skill class the number of runs per status, the mean and max. duration and cpu time (in milliseconds) and the highest peak resident memory (in kilobytes)
+        syntax: {"runs": <number of runs>, "skills": {<main file>.<method>: {"runs": <runs>, "statuses": {<status>: <runs>}, "mean": <mean>, "max": <max>, "cpu_mean": <mean>, "cpu_max": <max>, "peak_rss": <kilobytes>}}}
+        example: {"runs": 1, "skills": {"skills.CurrentTime": {"runs": 1, "statuses": {"done": 1}, "mean": 412.118, "max": 412.118, "cpu_mean": 420.0, "cpu_max": 420.0, "peak_rss": 24576}}}
+
+    :since: 0.1.0
+    """
+    runs = sorted(read_accounting_file(fname), key=lambda run: run["start"])
+    if last is not None:
+        runs = runs[-last:]
+
+    skills = {}
+    for run in runs:
+        skills.setdefault(run["main_file"] + "." + run["method"], []).append(run)
+
+    summary = {}
+    for name in sorted(skills):
+        durations = [run["duration"] * 1000 for run in skills[name]]
+        cpu_times = [run["cpu_time"] * 1000 for run in skills[name] if run["cpu_time"] is not None]
+        peak_rss = [run["peak_rss"] for run in skills[name] if run["peak_rss"] is not None]
+        statuses = {}
+        for run in skills[name]:
+            statuses[run["status"]] = statuses.get(run["status"], 0) + 1
+        summary[name] = {"runs": len(skills[name]), "statuses": statuses, "mean": round(sum(durations) / len(durations), 3), "max": round(max(durations), 3),
+                         "cpu_mean": round(sum(cpu_times) / len(cpu_times), 3) if cpu_times else None, "cpu_max": round(max(cpu_times), 3) if cpu_times else None,
+                         "peak_rss": max(peak_rss) if peak_rss else None}
+    return {"runs": len(runs), "skills": summary}
+
+
+class SkillWorkerPool:
+    """
+    pool of long-lived processes which are executing skills
+    every job can have a timeout, a cpu time and a memory limit (see 'submit') and the cpu time, peak memory and outcome of every job is written to an accounting file
+
+    :since: 0.1.0
+    """
+
+    def __init__(self, pool_size: int = 2, max_jobs: int = 50, run_after_plugins: dict = {}, run_before_plugins: dict = {}, main_files: list = None,
+                 cgroup: str = None, accounting_fname: str = None, logger=None) -> None:
+        """
+        :param pool_size: int, optional
+            number of worker processes
+            syntax: <pool size>
+            example: 2
+        :param max_jobs: int, optional
+            number of jobs after which a worker gets replaced by a fresh one (0 = never)
+            syntax: <max jobs>
+            example: 50
+        :param run_after_plugins: dict, optional
+            all run after plugins (a dict or a 'plugin.PluginRegistry', which is shared with the workers instead of copied into every job)
+        :param run_before_plugins: dict, optional
+            all run before plugins (a dict or a 'plugin.PluginRegistry', which is shared with the workers instead of copied into every job)
+        :param main_files: list, optional
+            additional skill main files which are imported by every worker before the first job (the hot skills are always imported)
+            syntax: [<main file>]
+            example: ["skills"]
+        :param cgroup: str, optional
+            path of a delegated cgroup (v2) in which every worker gets its own cgroup, so that the memory limit and the cpu time also include the processes a skill starts (None = no cgroup)
+            NOTE: the cgroup must be writable and mustn't contain any processes itself (e.g. a cgroup created by systemd with 'Delegate=yes')
+            syntax: <path>
+            example: "/sys/fs/cgroup/aion"
+        :param accounting_fname: str, optional
+            file to which the usage of every job is written (None = 'accounting_file', "" = no accounting)
+            syntax: <filename>
+            example: "/etc/aion_data/logs/skills.accounting"
+        :param logger: logging.LogAll, optional
+            logger to which the tracebacks of failed skills are written (None = they are printed)
+            syntax: <logger>
+            example: LogAll("/etc/aion_data/logs/aion.log")
+        :return: None
+
+        :since: 0.1.0
+        """
+        from multiprocessing import Queue
+        from threading import Condition, Lock
+
+        self.pool_size = max(1, int(pool_size))
+        self.max_jobs = max(0, int(max_jobs))
+        self.run_after_plugins = run_after_plugins
+        self.run_before_plugins = run_before_plugins
+
+        self.main_files = main_files or []
+        self.cgroup = cgroup.rstrip("/") if cgroup else None
+        self.accounting_fname = accounting_file if accounting_fname is None else accounting_fname
+        self.logger = logger
+        self.on_status = None
+
+        self._job_queue = Queue()
+        self._status_queue = Queue()
+        self._lock = Lock()
+        self._job_finished = Condition(self._lock)
+        self._next_job_id = 0
+        self._workers = {}
+        self._job_counts = {}
+        self._cancelled = set()
+        self._pending = set()
+        self._running = {}
+        self._jobs = {}
+        self._deadlines = {}
+        self._closed = False
+        self._supervisor = None
+
+    def _spawn(self) -> None:
+        """
+        starts a new worker process
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from multiprocessing import Process
+
+        worker = Process(target=_worker, args=(self._job_queue, self._status_queue, self.max_jobs, self.main_files, self.run_after_plugins, self.run_before_plugins, self.cgroup))
+        worker.daemon = False
+        worker.start()
+        self._workers[worker.pid] = worker
+        self._job_counts[worker.pid] = 0
+
+    def _account(self, job_id: int, status: str, pid: int, usage: dict = None) -> str:
+        """
+        removes a finished job and returns its line for the accounting file (must be called with the lock held)
+
+        :param job_id: int
+            id of the job
+            syntax: <job id>
+            example: 3
+        :param status: str
+            outcome of the job ('done', 'error', 'timeout', 'cpu_limit', 'memory_limit', 'killed' or 'cancelled')
+            syntax: <status>
+            example: "done"
+        :param pid: int
+            pid of the worker which has executed the job
+            syntax: <pid>
+            example: 1234
+        :param usage: dict, optional
+            the cpu time (in seconds) and peak resident memory (in kilobytes) of the job (None = unknown)
+            syntax: {"cpu_time": <seconds>, "peak_rss": <kilobytes>}
+            example: {"cpu_time": 0.42, "peak_rss": 24576}
+        :return: str
+            returns the line for the accounting file or None if the job is unknown
+            syntax: <line>
+            example: "1593853741.270 412.118 skills CurrentTime done 420.000 24576 1234 3f2a9c1e04b7d865\n"
+
+        :since: 0.1.0
+        """
+        from time import time
+
+        self._deadlines.pop(job_id, None)
+        job = self._jobs.pop(job_id, None)
+        if job is None or job["start"] is None:
+            return None
+        usage = usage or {}
+        cpu_time = usage.get("cpu_time")
+        peak_rss = usage.get("peak_rss")
+        return " ".join([format(job["start"], ".3f"), format((time() - job["start"]) * 1000, ".3f"), job["main_file"], job["method"], status,
+                         format(cpu_time * 1000, ".3f") if cpu_time is not None else "-", str(peak_rss) if peak_rss is not None else "-",
+                         str(pid), job["trace_id"] or "-"]) + "\n"
+
+    def _kill_job(self, job_id: int, pid: int) -> dict:
+        """
+        kills the worker of a running job and measures the usage of the job before (must be called with the lock held)
+
+        :param job_id: int
+            id of the job
+            syntax: <job id>
+            example: 3
+        :param pid: int
+            pid of the worker which executes the job
+            syntax: <pid>
+            example: 1234
+        :return: dict
+            returns the cpu time (in seconds) and peak resident memory (in kilobytes) of the job (without the processes the skill has started)
+            syntax: {"cpu_time": <seconds>, "peak_rss": <kilobytes>}
+            example: {"cpu_time": 0.42, "peak_rss": 24576}
+
+        :since: 0.1.0
+        """
+        cpu_time = _cpu_time(pid)
+        start_cpu_time = self._jobs.get(job_id, {}).get("start_cpu_time")
+        usage = {"cpu_time": cpu_time - start_cpu_time if cpu_time is not None and start_cpu_time is not None else None, "peak_rss": _peak_rss(pid)}
+        self._kill(pid)
+        return usage
+
+    def _supervise(self) -> None:
+        """
+        reads the status of the workers, kills jobs whose timeout has expired and replaces workers which were recycled or died
+        every job status ('start', 'done', 'error', 'timeout', 'cpu_limit', 'memory_limit' and 'killed' if the worker died) is also passed to 'on_status'
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from queue import Empty
+        from os import rmdir
+        from time import monotonic, time
+
+        while not self._closed:
+            with self._lock:
+                timeout = min([0.5] + [deadline - monotonic() for deadline in self._deadlines.values()])
+            try:
+                status, job_id, pid, error, usage = self._status_queue.get(timeout=max(0, timeout))
+            except Empty:
+                status = None
+            except (EOFError, OSError):
+                break
+
+            statuses = []
+            accounting = []
+            errors = []
+            with self._lock:
+                if status == "start":
+                    if job_id in self._cancelled:  # the job was cancelled before the worker took it
+                        self._cancelled.discard(job_id)
+                        self._jobs.pop(job_id, None)
+                        self._kill(pid)
+                    else:
+                        self._running[job_id] = pid
+                        if job_id in self._jobs:
+                            self._jobs[job_id]["start"] = time()
+                            self._jobs[job_id]["start_cpu_time"] = usage["cpu_time"]
+                            if self._jobs[job_id]["limits"].get("timeout"):
+                                self._deadlines[job_id] = monotonic() + float(self._jobs[job_id]["limits"]["timeout"])
+                        statuses.append((status, job_id, pid, None))
+                elif status in _finish_statuses:
+                    if self._running.pop(job_id, None) is not None:
+                        statuses.append((status, job_id, pid, usage))
+                        accounting.append(self._account(job_id, status, pid, usage))
+                    self._pending.discard(job_id)
+                    self._job_finished.notify_all()
+                    self._job_counts[pid] = self._job_counts.get(pid, 0) + 1
+                    if error:
+                        errors.append("Skill job " + str(job_id) + " failed: " + error)
+
+                for job_id, deadline in list(self._deadlines.items()):
+                    if deadline <= monotonic() and job_id in self._running:
+                        pid = self._running.pop(job_id)
+                        usage = self._kill_job(job_id, pid)
+                        self._pending.discard(job_id)
+                        self._job_finished.notify_all()
+                        statuses.append(("timeout", job_id, pid, usage))
+                        accounting.append(self._account(job_id, "timeout", pid, usage))
+
+                for pid, worker in list(self._workers.items()):
+                    if worker.is_alive() is False:
+                        worker.join()
+                        del self._workers[pid]
+                        self._job_counts.pop(pid, None)
+                        status = "killed"
+                        if self.cgroup is not None:
+                            if _cgroup_value(self.cgroup + "/worker-" + str(pid), "memory.events", "oom_kill"):
+                                status = "memory_limit"
+                            try:
+                                rmdir(self.cgroup + "/worker-" + str(pid))
+                            except OSError:
+                                pass
+                        for running_job_id, running_pid in list(self._running.items()):
+                            if running_pid == pid:
+                                del self._running[running_job_id]
+                                self._pending.discard(running_job_id)
+                                self._job_finished.notify_all()
+                                statuses.append((status, running_job_id, pid, None))
+                                accounting.append(self._account(running_job_id, status, pid))
+                        if self._closed is False:
+                            self._spawn()
+
+            self._write_accounting(accounting)
+            for error in errors:  # written without the lock, so that a slow log file doesn't block 'submit' and 'wait'
+                if self.logger is not None:
+                    self.logger.error(error)
+                else:
+                    print(error)
+            if self.on_status is not None:
+                for status_infos in statuses:
+                    self.on_status(*status_infos)
+
+    def _write_accounting(self, lines: list) -> None:
+        """
+        writes lines to the accounting file (the writes are buffered like the log messages)
+
+        :param lines: list
+            lines from '_account' (None is skipped)
+            syntax: [<line>]
+            example: ["1593853741.270 412.118 skills CurrentTime done 420.000 24576 1234 3f2a9c1e04b7d865\n"]
+        :return: None
+
+        :since: 0.1.0
+        """
+        lines = [line for line in lines if line is not None]
+        if not lines or not self.accounting_fname:
+            return
+        _rotate(self.accounting_fname, _max_accounting_file_size)
+        for line in lines:
+            _get_writer().write(self.accounting_fname, "a", line)
+
+    @staticmethod
+    def _kill(pid: int) -> bool:
+        """
+        kills a worker and all processes it has started (its process group)
+
+        :param pid: int
+            pid of the worker
+            syntax: <pid>
+            example: 1234
+        :return: bool
+            returns True if the worker was killed, False if it didn't exist anymore
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        from os import getpgid, kill, killpg
+        from signal import SIGKILL
+
+        try:
+            if getpgid(pid) == pid:
+                killpg(pid, SIGKILL)
+            else:  # the worker couldn't create its own process group
+                kill(pid, SIGKILL)
+        except ProcessLookupError:
+            return False
+        return True
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        kills the worker which executes the given job together with all processes the job has started (a new worker is started automatically)
+        if no worker has taken the job yet, the worker which takes it gets killed as soon as it reports the start of the job
+
+        :param job_id: int
+            id of the job which should be cancelled
+            syntax: <job id>
+            example: 3
+        :return: bool
+            returns True if the job was running or waiting and got cancelled, False if not
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            pid = self._running.pop(job_id, None)
+            if pid is None:
+                if job_id not in self._pending:
+                    return False
+                self._cancelled.add(job_id)
+            else:
+                accounting = self._account(job_id, "cancelled", pid, self._kill_job(job_id, pid))
+            self._pending.discard(job_id)
+            self._job_finished.notify_all()
+        if pid is None:
+            return True
+        self._write_accounting([accounting])
+        return True
+
+    def close(self, kill: bool = False) -> None:
+        """
+        stops all workers
+
+        :param kill: bool, optional
+            if True, the workers get killed immediately, if False, they finish their current job first
+            syntax: <boolean>
+            example: False
+        :return: None
+
+        :since: 0.1.0
+        """
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            if kill is True:
+                self._kill(worker.pid)
+            else:
+                self._job_queue.put(None)
+        for worker in workers:
+            worker.join()
+
+    def job_counts(self) -> dict:
+        """
+        returns how many jobs every running worker has executed
+
+        :return: dict
+            returns the number of executed jobs per worker pid
+            syntax: {<pid>: <number of jobs>}
+            example: {1234: 7, 1235: 3}
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            return dict(self._job_counts)
+
+    def running(self) -> dict:
+        """
+        returns all jobs that are currently executed
+
+        :return: dict
+            returns the pid of the executing worker per job id
+            syntax: {<job id>: <pid>}
+            example: {3: 1234}
+
+        :since: 0.1.0
+        """
+        with self._lock:
+            return dict(self._running)
+
+    def start(self) -> None:
+        """
+        starts the worker processes and the supervisor
+
+        :return: None
+
+        :since: 0.1.0
+        """
+        from atexit import register
+        from threading import Thread
+
+        if self.cgroup is not None:
+            _write_cgroup(self.cgroup, "cgroup.subtree_control", "+cpu +memory")  # so that the workers can get a memory limit
+        with self._lock:
+            for i in range(self.pool_size - len(self._workers)):
+                self._spawn()
+        if self._supervisor is None:
+            register(self.close, True)
+            self._supervisor = Thread(target=self._supervise, daemon=True)
+            self._supervisor.start()
+
+    def submit(self, main_file: str, method: str, speech_input: str, activate_phrase: str, trace_id: str = None, submit_time: float = None, limits: dict = None) -> int:
+        """
+        hands a skill to the next free worker
+
+        :param main_file: str
+            name of the skill main file (without '.py')
+            syntax: <main file>
+            example: "skills"
+        :param method: str
+            name of the skill class in the main file
+            syntax: <method>
+            example: "CurrentTime"
+        :param speech_input: str
+            complete spoken words
+            syntax: <speech input>
+            example: "What time is it"
+        :param activate_phrase: str
+            activate phrase that called the skill
+            syntax: <activate phrase>
+            example: "time"
+        :param trace_id: str, optional
+            id of the trace to which the spans of the job belong (None = no tracing)
+            syntax: <trace id>
+            example: "3f2a9c1e04b7d865"
+        :param submit_time: float, optional
+            time at which the skill was requested, the wait until a worker starts it is recorded from it (None = now)
+            syntax: <unix time>
+            example: 1593853741.26
+        :param limits: dict, optional
+            limits of the job, 'timeout' (seconds after which the worker gets killed), 'cpu_time' (seconds) and 'memory' (megabytes), 0 or a missing limit means no limit
+            a job which exceeds a limit ends with the status 'timeout', 'cpu_limit' or 'memory_limit'
+            syntax: {<limit>: <value>}
+            example: {"timeout": 60, "cpu_time": 30, "memory": 200}
+        :return: int
+            returns the id of the job
+            syntax: <job id>
+            example: 3
+
+        :since: 0.1.0
+        """
+        from time import time
+
+        with self._lock:
+            self._next_job_id += 1
+            job_id = self._next_job_id
+            self._pending.add(job_id)
+            self._jobs[job_id] = {"main_file": main_file, "method": method, "trace_id": trace_id, "limits": limits or {}, "start": None, "start_cpu_time": None}
+        self._job_queue.put((job_id, main_file, method, speech_input, activate_phrase, trace_id, submit_time if submit_time is not None else time(), limits))
+        return job_id
+
+    def wait(self, job_id: int, timeout: float = None) -> bool:
+        """
+        waits until a job is finished (or cancelled)
+
+        :param job_id: int
+            id of the job
+            syntax: <job id>
+            example: 3
+        :param timeout: float, optional
+            max. seconds to wait (None = no limit)
+            syntax: <seconds>
+            example: 10
+        :return: bool
+            returns True if the job is finished, False if the timeout expired
+            syntax: <boolean>
+            example: True
+
+        :since: 0.1.0
+        """
+        with self._job_finished:
+            return self._job_finished.wait_for(lambda: job_id not in self._pending, timeout)
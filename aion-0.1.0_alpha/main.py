@@ -4,24 +4,41 @@ __author__ = "blueShard"
 __license__ = "GPL-3.0"
 __version__ = "0.1.0"
 
+from time import monotonic
+
+startup_time = monotonic()  # taken before all other imports, so that the time to ready includes them
+
+from aion_core import grammar as agrammar
+from aion_core import language as alang
 from aion_core import logging as alog
+from aion_core import manifest as amanifest
+from aion_core import pipeline as apipe
+from aion_core import task as atask
+from aion_core import trace as atrace
+from aion_core import tts as atts
 from aion_core import utils as atils
 from aion_core import variable as avar
+from aion_core import watcher as awatch
 
-from aion_core.config import Aion
+from aion_core import STARTUP_PROFILE_ENV
+from aion_core.acph import ActivatePhraseMatcher, read_acph_file
+from aion_core.config import Aion, config_file
 from aion_core.language import language_directory
-from aion_core.skill import skills_file, skills_path
-from aion_core.plugin import get_all_run_after_plugins, get_all_run_before_plugins
-from aion_core.utils import aion_path, aion_data_path, is_dict_in_dict
+from aion_core.skill import get_registry, skills_file
+from aion_core.plugin import get_plugin_registry, run_after_file, run_before_file, RUN_AFTER, RUN_BEFORE
+from aion_core.utils import aion_data_path, is_dict_in_dict, LazyModule
+from aion_core.worker import SkillWorkerPool
 
 import os, signal, sys, traceback
-import snowboydecoder
-import speech_recognition as sr
 
-from colorama import Fore
 from inspect import currentframe, getframeinfo
-from multiprocessing import Process
 from threading import Thread
+from time import time
+
+# the heavy third party modules are imported when they're used the first time, not before the config, skills and matcher are loaded
+colorama = LazyModule("colorama")
+snowboydecoder = LazyModule("snowboydecoder")
+sr = LazyModule("speech_recognition")
 
 console_logger = alog.LogConsole()
 logger = alog.LogAll(aion_data_path + "/logs/aion.log",
@@ -33,7 +50,7 @@ logger = alog.LogAll(aion_data_path + "/logs/aion.log",
 
 
 variables = avar.Variable()
-variables.inititalize_variables()
+variables.inititalize_variables({avar.AION_PID: str(os.getpid())})
 variables.set_value(avar.IS_AION_RUNNING, str(True))
 
 
@@ -44,95 +61,154 @@ listening_mode = "auto"
 stt_engine = Aion().get_stt_engine()
 
 
-def get_main_file_from_skill(skill):
-    for skills_list in atils.BaseXMLReader(skills_file).get_infos("main_file").values():
-        for skill_name in skills_list:
-            if skill_name["parent"]["tag"] == skill:
-                return "".join(skill_name["text"].split(".")[:-1])
+skill_registry = get_registry()
 
 
-phrase_dict = {}
+def load_phrase_matcher():
+    """
+    builds the activate phrase matcher for the current language from the compiled manifest or, if it's missing or stale, from the '.acph' file
+    """
+    global activate_phrase_file
 
-activate_phrase_file = language_directory + "/" + Aion().get_language() + ".acph"
-if os.path.isfile(activate_phrase_file) is False:
-    logger.warning("Couldn't find an activate phrase (.acph) file with your language locale (" + Aion().get_language() + ") in " + language_directory + ". Using the default activate phrase file (en_US)", getframeinfo(currentframe()).lineno - 1)
-    activate_phrase_file = language_directory + "/en_US.acph"
-for value_list in atils.BaseXMLReader(activate_phrase_file).get_infos("<all>").values():
-    for phrase_infos in value_list:
-        try:
-            if phrase_infos["parent"]["tag"] == "activate_phrases":
-                and_phrase_list = []
-                if "__and__" in phrase_infos["tag"]:
-                    for phrase in phrase_infos["tag"].split("__and__"):
-                        and_phrase_list.append(phrase.replace("_", " "))
-                    phrase_dict["__and__".join(and_phrase_list)] = [get_main_file_from_skill(phrase_infos["attrib"]["skill"]), phrase_infos["attrib"]["method"]]
-                else:
-                    phrase_dict[phrase_infos["tag"].replace("_", " ")] = [get_main_file_from_skill(phrase_infos["attrib"]["skill"]), phrase_infos["attrib"]["method"]]
-        except KeyError:
-            pass
+    activate_phrase_file = language_directory + "/" + language + ".acph"
+    if os.path.isfile(activate_phrase_file) is False:
+        logger.warning("Couldn't find an activate phrase (.acph) file with your language locale (" + language + ") in " + language_directory + ". Using the default activate phrase file (en_US)", getframeinfo(currentframe()).lineno - 1)
+        activate_phrase_file = language_directory + "/en_US.acph"
 
+    phrase_dict = None
+    manifest = amanifest.load()
+    if manifest is not None:
+        phrase_dict = manifest.phrases(activate_phrase_file)
+    if phrase_dict is None:
+        if os.path.isfile(amanifest.manifest_file):
+            logger.info("The compiled manifest (" + amanifest.manifest_file + ") is outdated, reading the xml files instead. Run 'aion compile' to update it", getframeinfo(currentframe()).lineno - 1)
+        phrase_dict = {phrase: [skill_registry.main_file(skill), method] for phrase, (skill, method) in read_acph_file(activate_phrase_file).items()}
 
-run_after_plugins = get_all_run_after_plugins()
-run_before_plugins = get_all_run_before_plugins()
+    return ActivatePhraseMatcher(phrase_dict)
 
 
-def getset_stt_engine():
+activate_phrase_file = None
+phrase_matcher = load_phrase_matcher()
+
+
+run_after_plugins = get_plugin_registry(RUN_AFTER)
+run_before_plugins = get_plugin_registry(RUN_BEFORE)
+
+skill_pool = SkillWorkerPool(Aion().get_skill_worker_pool_size(), Aion().get_skill_worker_max_jobs(), run_after_plugins, run_before_plugins, cgroup=Aion().get_skill_cgroup() or None, logger=logger)
+task_table = atask.TaskTable(skill_pool, Aion().get_max_concurrent_skills(), atask.get_skill_priorities(), limits=atask.get_skill_limits(),
+                             default_limits={"timeout": Aion().get_skill_timeout(), "cpu_time": Aion().get_skill_cpu_time(), "memory": Aion().get_skill_memory_limit()})
+output_task = None
+detected_time = None
+tts_server = None
+
+
+def on_connectivity_change(connected):
     global stt_engine
-    if listening_mode == "auto":
-        if atils.is_internet_connected() is True:
-            if stt_engine != "google":
-                Aion().set_stt_engine("google")
-                stt_engine = "google"
-                logger.info("Set listening_source in '" + aion_path + "/config.xml' to 'google'", getframeinfo(currentframe()).lineno - 1)
-        else:
-            if stt_engine != "pocketsphinx":
-                Aion().set_stt_engine("pocketsphinx")
-                stt_engine = "pocketsphinx"
-                logger.info("Set listening_source in '" + aion_path + "/config.xml' to 'pocketsphinx'", getframeinfo(currentframe()).lineno - 1)
+    if listening_mode != "auto":
+        return
+    if connected is True:
+        new_stt_engine = "google"
     else:
+        new_stt_engine = "pocketsphinx"
+    if stt_engine != new_stt_engine:
+        stt_engine = new_stt_engine
+        Aion().set_stt_engine(new_stt_engine)  # runs in the background thread of the connectivity monitor
+        logger.info("Set stt_engine in '" + aion_data_path + "/config.xml' to '" + new_stt_engine + "'", getframeinfo(currentframe()).lineno - 1)
+
+
+def on_aion_data_change(fnames):
+    """
+    rebuilds the in-memory structures which depend on the changed files in 'aion_data' (called by the file watcher, e.g. after 'aion install')
+    every structure is built completely before it replaces the old one, so a voice command uses either the old or the new one
+    """
+    global language, phrase_matcher
+
+    start = monotonic()
+    rebuilt = []
+    rebuild_phrases = amanifest.manifest_file in fnames or skills_file in fnames
+
+    if config_file in fnames and Aion().get_language() != language:
+        language = Aion().get_language()
+        rebuild_phrases = True
+        rebuilt.append("language")
+    if skills_file in fnames or amanifest.manifest_file in fnames:
+        skill_registry.reload()
+        task_table.priorities = atask.get_skill_priorities()
+        task_table.limits = atask.get_skill_limits()
+        rebuilt.append("skills")
+    if any(fname.endswith(".acph") for fname in fnames):
+        rebuild_phrases = True
+    if rebuild_phrases:
+        phrase_matcher = load_phrase_matcher()
+        agrammar.compile(language)
+        rebuilt.append("activate phrases")
+    if amanifest.manifest_file in fnames or run_after_file in fnames or run_before_file in fnames:
+        run_after_plugins.refresh()
+        run_before_plugins.refresh()
+        rebuilt.append("plugins")
+    if any(fname.endswith(".lng") for fname in fnames) or amanifest.manifest_file in fnames:
+        lng_file = language_directory + "/" + language + ".lng"
+        alang.load_catalog(lng_file if os.path.isfile(lng_file) else language_directory + "/en_US.lng")
+        rebuilt.append("language entries")
+
+    if rebuilt:
+        logger.info("Reloaded " + ", ".join(rebuilt) + " in " + str(round((monotonic() - start) * 1000, 1)) + " ms", getframeinfo(currentframe()).lineno - 1)
+
+
+file_watcher = awatch.FileWatcher()
+for watched_path in [config_file, skills_file, run_after_file, run_before_file, amanifest.manifest_file, language_directory]:
+    file_watcher.watch(watched_path, on_aion_data_change)
+
+
+connectivity_monitor = atils.ConnectivityMonitor(Aion().get_connectivity_check_interval(), Aion().get_connectivity_hysteresis(), on_change=on_connectivity_change)
+
+
+def getset_stt_engine():
+    global stt_engine
+    if listening_mode != "auto":
         stt_engine = Aion().get_stt_engine()
     return stt_engine
 
 
+def memory_hotword_detector(hotword_file, sensitivity):
+    """
+    creates a hotword detector which hands the recorded audio directly to the 'audio_recorder_callback' (as 'sr.AudioData') instead of saving it to a '.wav' file
+    (the class is created here, because 'snowboydecoder' is imported lazily)
+    """
+
+    class MemoryHotwordDetector(snowboydecoder.HotwordDetector):
+
+        def saveMessage(self):
+            return sr.AudioData(b"".join(self.recordedData), self.detector.SampleRate(), int(self.detector.BitsPerSample() / 8))
+
+    return MemoryHotwordDetector(hotword_file, sensitivity=sensitivity)
+
+
 #def start_pysb():
 #    from aion_core.usb import USB
 #    for action in USB().listen():
 #        pass
 
 
-def execute(main_file, method, speech_input, acph):
-    if skills_path in sys.path:
-        pass
-    else:
-        sys.path.insert(0, skills_path)
-    exec("skill = __import__(main_file)." + method + "('" + acph + "', '" + speech_input + "', " + str(run_after_plugins) + ", " + str(run_before_plugins) + ")")
-    exec("skill.run_before()", {"skill": locals()["skill"]})
-    exec("skill.main()", {"skill": locals()["skill"]})
-    exec("skill.run_after()", {"skill": locals()["skill"]})
-
-
-def main(fname):
-    global output_pid
+def main(audio, trace_id=None):
+    global output_task
 
     found = False
-    and_found = True
 
     print("Converting...")
     global speech_input
-    speech = sr.Recognizer()
 
-    with sr.AudioFile(fname) as source:
-        audio = speech.record(source)
+    fname = None
+    if isinstance(audio, sr.AudioData) is False:  # the recording was saved to a file ('audio_handoff' is 'file')
+        fname = audio
 
     try:
-        if getset_stt_engine() == "google":
-            speech_input = speech.recognize_google(audio_data=audio, language=language)
-        elif getset_stt_engine() == "pocketsphinx":
-            speech_input = speech.recognize_sphinx(audio_data=audio, language=language)
+        speech_input = apipe.recognize(audio, getset_stt_engine(), language, trace_id)
         speech_input_lower = str(speech_input.lower())
         logger.info("Speech_input: " + str(speech_input), getframeinfo(currentframe()).lineno - 2)
 
-        os.remove(fname)
+        if fname is not None:
+            os.remove(fname)
 
         if speech_input_lower.startswith("system call "):  # 'system call ' <- copied from SAO Alicization? maybe...
             speech_input_lower = speech_input_lower.replace("system call ", "").strip()
@@ -143,64 +219,43 @@ def main(fname):
                     logger.error("No root privileges, couldn't shutdown system", getframeinfo(currentframe()).lineno - 1)
             elif speech_input_lower == "stop":
                 variables.close()
-                try:
-                    os.kill(output_pid, signal.CTRL_C_EVENT)
-                except ProcessLookupError:
-                    pass
-                try:
-                    os.kill(os.getpid(), signal.CTRL_C_EVENT)
-                except ProcessLookupError:
-                    pass
-                sys.exit(1)
+                skill_pool.close(kill=True)
+                if tts_server is not None:
+                    tts_server.kill()
+                alog.flush()
+                os._exit(1)  # 'main' runs in a recognition worker thread, where 'sys.exit' would only end the thread
             found = True
 
         if speech_input_lower.endswith("stop"):
-            try:
-                output_pid = output_pid + Aion().get_pid_manipulation_number()  # the pid is from 'aion_task.pid' given pid plus 5 and i don't know why
-                os.kill(output_pid, signal.SIGKILL)
-                logger.info("Killed an aion skill with the PID " + str(output_pid), getframeinfo(currentframe()).lineno - 1)
-                output_pid = None
-            except (ProcessLookupError, TypeError):
-                logger.error("No process with the PID " + str(output_pid), getframeinfo(currentframe()).lineno - 1)
-            except NameError:
-                logger.error("No PID was given", getframeinfo(currentframe()).lineno - 1)
+            # cancels the last started skill or, if it's already finished, the newest one which is still running or waiting
+            cancelled_task = output_task
+            if cancelled_task is None or task_table.cancel(cancelled_task) is False:
+                cancelled_task = task_table.latest()
+                if cancelled_task is not None and task_table.cancel(cancelled_task) is False:
+                    cancelled_task = None
+            if cancelled_task is None:
+                logger.error("No running skill task", getframeinfo(currentframe()).lineno - 1)
+            else:
+                logger.info("Cancelled the skill task " + str(cancelled_task), getframeinfo(currentframe()).lineno - 1)
+            output_task = None
             found = True
 
-        for activate_phrase, value in phrase_dict.items():
-            activate_phrase_lower = activate_phrase.lower()
-            if "__and__" in activate_phrase_lower:
-                for and_phrase in activate_phrase.split("__and__"):
-                    if and_phrase.lower() not in speech_input_lower:
-                        and_found = False
-                        break
-                if and_found is True:
-                    aion_task = Process(target=execute, args=(value[0], value[1], speech_input, activate_phrase,))
-                    aion_task.daemon = False
-                    aion_task.start()
-                    output_pid = aion_task.pid
-                    found = True
-                    break
-            elif activate_phrase_lower in speech_input_lower:
-                aion_task = Process(target=execute, args=(value[0], value[1], speech_input, activate_phrase,))
-                aion_task.daemon = False
-                aion_task.start()
-                output_pid = aion_task.pid
-                break
+        task = apipe.dispatch(speech_input, phrase_matcher, task_table, trace_id)
+        if task is not None:
+            output_task = task
+            found = True
 
         if found is False:
             logger.warning("Couldn't find skill", getframeinfo(currentframe()).lineno - 1)
         else:
-            try:
-                logger.info("Output_pid: " + str(output_pid + Aion().get_pid_manipulation_number()), getframeinfo(currentframe()).lineno - 1)
-            except NameError:
-                logger.info("Output_pid: None", getframeinfo(currentframe()).lineno - 1)
+            logger.info("Output_task: " + str(output_task), getframeinfo(currentframe()).lineno - 1)
 
     except KeyboardInterrupt:
         variables.close()
-        try:
-            os.kill(output_pid, signal.SIGKILL)
-        except ProcessLookupError:
-            pass
+        skill_pool.close(kill=True)
+        if tts_server is not None:
+            tts_server.kill()
+        alog.flush()
         try:
             os.kill(os.getpid(), signal.SIGKILL)
         except ProcessLookupError:
@@ -219,17 +274,42 @@ def main(fname):
         pass
 
 
+def on_recording_dropped(audio, trace_id):
+    if isinstance(audio, str):  # the recording was saved to a file ('audio_handoff' is 'file')
+        try:
+            os.remove(audio)
+        except OSError:
+            pass
+    logger.warning("Dropped a recording, because the recognition queue is full (trace " + str(trace_id) + ")", getframeinfo(currentframe()).lineno - 1)
+
+
+recognition_queue = apipe.RecognitionQueue(main, Aion().get_recognition_queue_depth(), Aion().get_recognition_queue_policy(), Aion().get_recognition_workers(), on_drop=on_recording_dropped)
+
+
+def audio_recorder_callback(audio):
+    """
+    puts the recorded audio into the recognition queue, so that the hotword detector can listen again while the speech is recognized
+    """
+    trace_id = atrace.current_trace()
+    if detected_time is not None:
+        atrace.record("recording", detected_time, time() - detected_time, trace_id)
+    recognition_queue.put(audio, trace_id)
+
+
 def detected_callback():
+    global detected_time
     # wake_up.terminate()
+    atrace.new_trace()
+    detected_time = time()
     print('recording audio...', end='', flush=True)
 
 
 def signal_handler(sig, frame):
     variables.close()
-    try:
-        os.kill(output_pid, signal.SIGKILL)
-    except ProcessLookupError:
-        pass
+    skill_pool.close(kill=True)
+    if tts_server is not None:
+        tts_server.kill()
+    alog.flush()
     try:
         os.kill(os.getpid(), signal.SIGKILL)
     except ProcessLookupError:
@@ -248,11 +328,44 @@ def snowboy():
         global main_pid
         main_pid = os.getpid()
         print("Main PID: " + str(main_pid))
-        wake_up = snowboydecoder.HotwordDetector(hotword_file, sensitivity=0.5)
+        global tts_server
+        tts_server = atts.start_server()
+        skill_pool.start()
+        recognition_queue.start()
+        logger.info("Started " + str(recognition_queue.worker_number) + " recognition workers", getframeinfo(currentframe()).lineno - 1)
+        file_watcher.start()
+        logger.info("Started the file watcher", getframeinfo(currentframe()).lineno - 1)
+        if agrammar.is_stale(language):  # e.g. the '.acph' file was changed while aion wasn't running
+            Thread(target=agrammar.compile, args=(language,), daemon=True).start()  # the grammar is only needed for offline recognition, so aion doesn't wait for it
+        if listening_mode == "auto":
+            connectivity_monitor.start()
+        logger.info("Started " + str(skill_pool.pool_size) + " skill workers", getframeinfo(currentframe()).lineno - 1)
+        if Aion().get_audio_handoff() == "file":
+            wake_up = snowboydecoder.HotwordDetector(hotword_file, sensitivity=0.5)
+        else:
+            wake_up = memory_hotword_detector(hotword_file, sensitivity=0.5)
         logger.info("Configured the hotword detector", getframeinfo(currentframe()).lineno - 1)
+
+        ready_ms = round((monotonic() - startup_time) * 1000, 1)
+        print("Ready after " + str(ready_ms) + " ms")
+        logger.info("Ready after " + str(ready_ms) + " ms", getframeinfo(currentframe()).lineno - 2)
+        if os.environ.get(STARTUP_PROFILE_ENV):  # set by 'aion startup-profile', which only measures the startup
+            wake_up.terminate()
+            connectivity_monitor.stop()
+            file_watcher.stop()
+            recognition_queue.stop()
+            variables.set_value(avar.IS_AION_RUNNING, str(False))
+            variables.close()
+            skill_pool.close(kill=True)
+            if tts_server is not None:
+                tts_server.kill()
+            alog.flush()
+            sys.exit(0)
+        Thread(target=getattr, args=(sr, "AudioData"), daemon=True).start()  # imports 'speech_recognition' while aion waits for the hotword
+
         logger.info("Starting hotword detection...", getframeinfo(currentframe()).lineno - 1)
         wake_up.start(detected_callback=detected_callback,
-                      audio_recorder_callback=main,
+                      audio_recorder_callback=audio_recorder_callback,
                       recording_timeout=50,
                       sleep_time=0.01)
 
@@ -261,7 +374,7 @@ def snowboy():
         variables.close()
         sys.exit(1)
     except Exception:
-        print(Fore.CYAN + "Caught error: " + Fore.RED + "\n" + traceback.format_exc() + Fore.RESET)
+        print(colorama.Fore.CYAN + "Caught error: " + colorama.Fore.RED + "\n" + traceback.format_exc() + colorama.Fore.RESET)
         error_list = []
         for error in traceback.format_exc().split("\n"):
             error_list.append(error.strip())
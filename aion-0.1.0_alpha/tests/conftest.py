@@ -0,0 +1,74 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+_aion_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_aion_data_source = os.path.join(os.path.dirname(_aion_path), "aion_data")
+_aion_data_directory = None
+
+_task_skill = """from subprocess import call
+
+from aion_core.skill import Skill
+
+
+class Allocate(Skill):
+
+    def main(self):
+        memory = bytearray(int(self.speech_input) * 1048576)
+
+
+class Fail(Skill):
+
+    def main(self):
+        raise RuntimeError(self.speech_input)
+
+
+class Spin(Skill):
+
+    def main(self):
+        while True:
+            pass
+
+
+class Wait(Skill):
+
+    def main(self):
+        call(["sleep", self.speech_input])  # a child process, which must be killed together with the skill if its task gets cancelled
+"""
+
+sys.path.insert(0, _aion_path)
+
+
+def pytest_configure(config):
+    """
+    runs the tests against a copy of the repository's 'aion_data' in a temporary directory, so that they never touch '/etc/aion_data'
+    (must happen before 'aion_core' is imported, because the paths are set on import)
+    """
+    global _aion_data_directory
+
+    _aion_data_directory = tempfile.mkdtemp(prefix="aion_tests_")
+    aion_data_path = os.path.join(_aion_data_directory, "aion_data")
+    shutil.copytree(_aion_data_source, aion_data_path)
+    os.makedirs(os.path.join(aion_data_path, "logs"), exist_ok=True)
+    os.environ["AION_DATA_PATH"] = aion_data_path  # 'utils.AION_DATA_PATH_ENV', 'aion_core' can't be imported before
+
+
+def pytest_unconfigure(config):
+    from aion_core.logging import flush
+
+    flush()  # the buffered log, trace and accounting lines must be written before their directory is removed
+    if _aion_data_directory is not None:
+        shutil.rmtree(_aion_data_directory, ignore_errors=True)
+
+
+@pytest.fixture
+def task_skill(tmp_path, monkeypatch):
+    """
+    creates a skill module with test skills and returns its main file (without '.py')
+    """
+    (tmp_path / "aion_test_task_skill.py").write_text(_task_skill)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return "aion_test_task_skill"
@@ -0,0 +1,35 @@
+from shutil import copyfile
+from xml.etree.ElementTree import parse
+
+import pytest
+
+from aion_core import config
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    fname = str(tmp_path / "config.xml")
+    copyfile(config.config_file, fname)
+    monkeypatch.setattr(config, "config_file", fname)
+    monkeypatch.setattr(config, "_snapshot", {"signature": None, "values": {}})
+    return fname
+
+
+def _file_value(fname, tag):
+    element = parse(fname).getroot().find("aion/" + tag)
+    return None if element is None else element.text
+
+
+def test_set_updates_file_and_snapshot(config_file):
+    aion = config.Aion()
+    language = "de_DE" if aion.get_language() != "de_DE" else "en_US"
+    aion._set("language", language)
+    assert _file_value(config_file, "language") == language
+    assert config.Aion().get_language() == language
+
+
+def test_set_creates_missing_element(config_file):
+    config.Aion()._set("test_value", "on")
+    assert _file_value(config_file, "test_value") == "on"
+    config._snapshot["signature"] = None  # parse the file again instead of using the updated snapshot
+    assert config.Aion()._get("test_value") == "on"
@@ -0,0 +1,28 @@
+from threading import Event
+
+from aion_core import utils
+
+MAX_WAIT = 10
+
+
+def test_monitor_keeps_running_after_error(monkeypatch):
+    results = iter([True, False, False, True, True])
+    monkeypatch.setattr(utils, "is_internet_connected", lambda: next(results, True))
+    changes = []
+    reconnected = Event()
+
+    def on_change(connected):
+        changes.append(connected)
+        if connected is False:
+            raise RuntimeError("on_change failed")
+        elif len(changes) > 1:
+            reconnected.set()
+
+    monitor = utils.ConnectivityMonitor(interval=0.01, hysteresis=2, on_change=on_change)
+    monitor.start()
+    try:
+        assert reconnected.wait(MAX_WAIT)
+    finally:
+        monitor.stop()
+    assert changes == [True, False, True]
+    assert monitor.connected is True
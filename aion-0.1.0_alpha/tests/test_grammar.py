@@ -0,0 +1,74 @@
+from os import utime
+from re import search
+
+import pytest
+
+from aion_core import grammar, language
+
+LOCALE = "xx_XX"  # not in the manifest, so the phrases are read from the test file
+
+PHRASE_DICT = {"time": ["skills", "CurrentTime"],
+               "ip_address": ["skills", "IpAddress"],
+               "tell__and__about": ["skills", "Wikipedia"],
+               "what__and__weather": ["skills", "Weather"],
+               "good_morning": ["skills", "Greeting"]}
+
+
+@pytest.fixture
+def acph_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(language, "language_directory", str(tmp_path))
+    monkeypatch.setattr(grammar, "grammar_directory", str(tmp_path / "grammar"))
+    monkeypatch.setattr(grammar, "_dictionary_words", lambda language_locale: None)
+    fname = tmp_path / (LOCALE + ".acph")
+    fname.write_text("<activate_phrases>\n" + "".join("  <" + phrase + " skill=\"" + skill + "\" method=\"" + method + "\"/>\n"
+                                                      for phrase, (skill, method) in PHRASE_DICT.items()) + "</activate_phrases>")
+    utime(fname, (0, 0))  # older than the grammar, also on file systems with a coarse time resolution
+    return fname
+
+
+def _grammar_phrases():
+    with open(grammar.grammar_file(LOCALE), "r") as file:
+        rule = search(r"public <" + LOCALE + r"> = (.*);", file.read())
+    return set(rule.group(1).split(" | "))
+
+
+@pytest.mark.parametrize("activate_phrase, words, expected", [
+    ("ip_address", None, "ip address"),
+    ("Time", None, "time"),
+    ("tell__and__about", None, None),
+    ("ip_address", {"ip"}, None),
+    ("ip_address", {"ip", "address"}, "ip address"),
+    ("a<b", None, None),
+    ("_", None, None),
+])
+def test_grammar_phrase(activate_phrase, words, expected):
+    assert grammar._grammar_phrase(activate_phrase, words) == expected
+
+
+def test_grammar_contains_phrases_without_and(acph_file):
+    assert grammar.compile(LOCALE) == {LOCALE: 3}
+    assert _grammar_phrases() == {"time", "ip address", "good morning"}
+
+
+def test_cached_grammar_is_removed(acph_file, tmp_path):
+    grammar.compile(LOCALE)
+    fsg_file = tmp_path / "grammar" / (LOCALE + ".fsg")
+    fsg_file.touch()
+    grammar.compile(LOCALE)
+    assert not fsg_file.exists()
+
+
+def test_grammar_is_stale_after_acph_change(acph_file):
+    assert grammar.is_stale(LOCALE)  # not compiled yet
+    grammar.compile(LOCALE)
+    assert not grammar.is_stale(LOCALE)
+    utime(acph_file)
+    assert grammar.is_stale(LOCALE)
+
+
+def test_grammar_without_phrases_is_removed(acph_file):
+    grammar.compile(LOCALE)
+    acph_file.write_text("<activate_phrases>\n  <tell__and__about skill=\"skills\" method=\"Wikipedia\"/>\n</activate_phrases>")
+    assert grammar.compile(LOCALE) == {LOCALE: 0}
+    with pytest.raises(FileNotFoundError):
+        open(grammar.grammar_file(LOCALE))
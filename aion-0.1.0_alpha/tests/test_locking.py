@@ -0,0 +1,44 @@
+from multiprocessing import get_context
+
+from aion_core.utils import BaseXMLReader, BaseXMLWriter
+from aion_core.variable import _VariableTable
+
+PROCESS_NUMBER = 8
+CHANGE_NUMBER = 25
+
+
+def _write(fname, table_fname, process, change_number):
+    """
+    adds entries to the '.xml' file and increments the counter in the variable table from one of the test processes
+    """
+    table = _VariableTable(table_fname)
+    # one long living writer (like the cached config writer) and one transaction per change, so that both write paths are tested
+    long_living_writer = BaseXMLWriter(fname)
+    for i in range(change_number):
+        if i % 2 == 0:
+            long_living_writer.add("<root>", "entry_" + str(process) + "_" + str(i))
+            long_living_writer.write()
+        else:
+            with BaseXMLWriter(fname).transaction() as xml_writer:
+                xml_writer.add("<root>", "entry_" + str(process) + "_" + str(i))
+        with table._locked(True):
+            table.set("counter", str(int(table.get("counter")) + 1))
+    table.close()
+
+
+def test_concurrent_writers_lose_no_change(tmp_path):
+    fname = str(tmp_path / "locked.xml")
+    table_fname = str(tmp_path / "variables")
+    with open(fname, "w") as file:
+        file.write("<root>\n</root>\n")
+    table = _VariableTable(table_fname, create=True)
+    table.set("counter", "0")
+
+    with get_context("fork").Pool(PROCESS_NUMBER) as pool:
+        pool.starmap(_write, [(fname, table_fname, process, CHANGE_NUMBER) for process in range(PROCESS_NUMBER)])
+
+    entries = BaseXMLReader(fname).root.childs
+    assert len(entries) == PROCESS_NUMBER * CHANGE_NUMBER
+    assert set(entries) == set("entry_" + str(process) + "_" + str(i) for process in range(PROCESS_NUMBER) for i in range(CHANGE_NUMBER))
+    assert int(table.get("counter")) == PROCESS_NUMBER * CHANGE_NUMBER
+    table.close()
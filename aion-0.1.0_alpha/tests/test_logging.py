@@ -0,0 +1,18 @@
+from aion_core import logging
+
+
+def test_closed_log_file_is_written_and_released(tmp_path):
+    fname = str(tmp_path / "aion.log")
+    logging.LogFile(fname).info("This is an test")
+    logging.close_file(fname)
+    assert fname not in logging._get_writer()._files
+    with open(fname) as file:
+        assert file.read().endswith("INFO: This is an test\n")
+
+
+def test_benchmark_logging_writes_into_given_directory(tmp_path):
+    from aion_core.benchmark import benchmark_logging
+
+    assert benchmark_logging(10, str(tmp_path))["messages"] == 10
+    assert list(tmp_path.iterdir()) == []
+    assert not any(fname.startswith(str(tmp_path)) for fname in logging._get_writer()._files)
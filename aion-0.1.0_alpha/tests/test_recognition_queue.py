@@ -0,0 +1,86 @@
+from threading import Event, Lock
+from time import perf_counter, sleep
+
+import pytest
+
+from aion_core import logging, pipeline, trace
+
+RECORDING_NUMBER = 20
+RECOGNITION_TIME = 0.05
+MAX_WAIT = 30
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(trace, "trace_file", str(tmp_path / "aion.trace"))
+    yield trace.trace_file
+    trace.set_trace(None)
+
+
+def _put_recordings(policy, depth=2, workers=1):
+    """
+    puts recordings faster into a queue than the stub recognition can handle them and returns the handled and dropped recordings and the max. put time
+    """
+    lock = Lock()
+    handled = []
+    dropped = []
+
+    def recognize(audio, trace_id):
+        sleep(RECOGNITION_TIME)
+        with lock:
+            handled.append(audio)
+
+    recognition_queue = pipeline.RecognitionQueue(recognize, depth, policy, workers, on_drop=lambda audio, trace_id: dropped.append(audio))
+    recognition_queue.start()
+    put_times = []
+    try:
+        for recording in range(RECORDING_NUMBER):
+            start = perf_counter()
+            recognition_queue.put(recording, trace.new_trace())
+            put_times.append(perf_counter() - start)
+            sleep(0.01)
+        end = perf_counter() + MAX_WAIT
+        while len(handled) + len(dropped) < RECORDING_NUMBER:
+            assert perf_counter() < end, "the workers didn't handle all recordings"
+            sleep(0.01)
+    finally:
+        recognition_queue.stop(MAX_WAIT)
+    assert recognition_queue.dropped == len(dropped)
+    return handled, dropped, max(put_times)
+
+
+@pytest.mark.parametrize("policy", pipeline.drop_policies)
+def test_no_recording_is_lost_or_handled_twice(trace_file, policy):
+    handled, dropped, put_max = _put_recordings(policy)
+
+    assert sorted(handled + dropped) == list(range(RECORDING_NUMBER))
+    assert dropped
+    assert put_max < RECOGNITION_TIME, "the detector was blocked by the recognition"
+    if policy == pipeline.DROP_OLDEST:
+        assert RECORDING_NUMBER - 1 in handled
+    else:
+        assert 0 in handled
+
+
+@pytest.mark.parametrize("policy", pipeline.drop_policies)
+def test_queue_wait_is_traced(trace_file, policy):
+    handled, dropped, put_max = _put_recordings(policy, depth=3, workers=2)
+    logging.flush()
+
+    spans = trace.summarize(trace_file)["spans"]["recognition.queue"]
+    assert spans["count"] == RECORDING_NUMBER
+    assert spans["errors"] == len(dropped)  # the spans of the dropped recordings have the status 'dropped'
+
+
+def test_stop_from_the_handler(trace_file):
+    stopped = Event()
+    recognition_queue = None
+
+    def stop(audio, trace_id):
+        recognition_queue.stop(MAX_WAIT)  # like 'system call stop', which runs in a worker
+        stopped.set()
+
+    recognition_queue = pipeline.RecognitionQueue(stop)
+    recognition_queue.start()
+    recognition_queue.put("stop", trace.new_trace())
+    assert stopped.wait(MAX_WAIT)
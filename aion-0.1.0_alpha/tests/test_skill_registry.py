@@ -0,0 +1,50 @@
+import sys
+
+import pytest
+
+from aion_core.skill import SkillRegistry
+
+SKILL_NUMBER = 5
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    main_files = ["aion_test_registry_skill_" + str(i) for i in range(SKILL_NUMBER)]
+    for main_file in main_files:
+        (tmp_path / (main_file + ".py")).write_text("class Test:\n    pass\n")
+    registry = SkillRegistry(hot_skills=[], module_budget=2)
+    monkeypatch.setattr(registry, "_main_files", {main_file: main_file for main_file in main_files})
+    yield registry
+    for main_file in main_files:
+        sys.modules.pop(main_file, None)
+
+
+def test_least_recently_used_are_unloaded(registry):
+    for i in range(SKILL_NUMBER):
+        registry.get_class("aion_test_registry_skill_" + str(i), "Test")
+    assert registry.loaded() == ["aion_test_registry_skill_3", "aion_test_registry_skill_4"]
+    assert "aion_test_registry_skill_0" not in sys.modules
+
+
+def test_used_module_is_not_unloaded(registry):
+    with registry.use("aion_test_registry_skill_0", "Test"):
+        for i in range(1, SKILL_NUMBER):
+            registry.get_class("aion_test_registry_skill_" + str(i), "Test")
+        assert registry.loaded() == ["aion_test_registry_skill_0", "aion_test_registry_skill_4"]
+    registry.get_class("aion_test_registry_skill_1", "Test")
+    assert registry.loaded() == ["aion_test_registry_skill_4", "aion_test_registry_skill_1"]
+
+
+def test_hot_skills_are_not_counted(registry):
+    registry.hot_skills = ["aion_test_registry_skill_0"]
+    for i in range(SKILL_NUMBER):
+        registry.get_class("aion_test_registry_skill_" + str(i), "Test")
+    assert registry.loaded() == ["aion_test_registry_skill_0", "aion_test_registry_skill_3", "aion_test_registry_skill_4"]
+
+
+def test_no_budget(registry):
+    registry.module_budget = 0
+    for i in range(SKILL_NUMBER):
+        registry.get_class("aion_test_registry_skill_" + str(i), "Test")
+    assert len(registry.loaded()) == SKILL_NUMBER
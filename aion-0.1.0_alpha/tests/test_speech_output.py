@@ -0,0 +1,50 @@
+import subprocess
+from os import remove
+
+import pytest
+
+import aion_core
+
+SPEECH_OUTPUT = "The $(touch pwned) `id` test"
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    commands = []
+
+    def run(command, **kwargs):
+        commands.append(command)
+        fname = command[-2][len("--wave="):] if command[0] == "pico2wave" else command[-2]
+        with open(fname, "wb") as file:
+            file.write(b"RIFF")
+        return subprocess.CompletedProcess(command, 0)
+
+    monkeypatch.setattr(subprocess, "run", run)
+    return commands
+
+
+@pytest.mark.parametrize("tts_engine", ["espeak", "pico2wave"])
+def test_words_are_one_argument(commands, tts_engine):
+    fname = aion_core.tts_engines[tts_engine](SPEECH_OUTPUT, "en_US")
+    remove(fname)
+    assert commands[0][-1].rstrip(".") == SPEECH_OUTPUT
+
+
+def test_every_synthesis_has_its_own_file(commands):
+    fnames = [aion_core._tts_espeak(SPEECH_OUTPUT, "en_US") for i in range(2)]
+    for fname in fnames:
+        remove(fname)
+    assert fnames[0] != fnames[1]
+
+
+def test_failed_synthesis_leaves_no_file(monkeypatch):
+    fnames = []
+
+    def run(command, **kwargs):
+        fnames.append(command[-2])
+        return subprocess.CompletedProcess(command, 1)
+
+    monkeypatch.setattr(subprocess, "run", run)
+    assert aion_core._tts_espeak(SPEECH_OUTPUT, "en_US") is None
+    with pytest.raises(FileNotFoundError):
+        open(fnames[0])
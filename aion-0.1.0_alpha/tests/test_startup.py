@@ -0,0 +1,21 @@
+import os
+from glob import glob
+
+import pytest
+
+from aion_core.benchmark import benchmark_startup
+
+# can be raised for slow machines, the default is meant for a raspberry pi
+BUDGET_MS = float(os.environ.get("AION_STARTUP_BUDGET_MS", "3000"))
+
+
+def test_time_to_ready_within_budget():
+    # aion must be able to get ready: the hotword detector and its model must be installed
+    pytest.importorskip("snowboydecoder")
+    pytest.importorskip("speech_recognition")
+    if not glob("/usr/local/aion-*"):
+        pytest.skip("aion isn't installed (the hotword model is missing)")
+
+    results = benchmark_startup(main_file=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py"))
+
+    assert results["ready_ms"] <= BUDGET_MS, "aion got ready after " + str(results["ready_ms"]) + " ms, slowest imports: " + str(results["imports"][:5])
@@ -0,0 +1,75 @@
+from glob import glob
+from time import perf_counter, sleep
+
+import pytest
+
+from aion_core.task import CANCELLED, DONE, TaskTable
+from aion_core.worker import SkillWorkerPool
+
+MAX_TASKS = 2
+TIMEOUT = 30
+
+
+def _process_group_alive(pgid):
+    """
+    checks if a process group has a process which isn't a zombie
+    """
+    for stat_file in glob("/proc/[0-9]*/stat"):
+        try:
+            with open(stat_file, "r") as file:
+                fields = file.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):  # the process has exited in the meantime
+            continue
+        if int(fields[2]) == pgid and fields[0] not in ("Z", "X"):
+            return True
+    return False
+
+
+@pytest.fixture
+def task_table(task_skill):
+    skill_pool = SkillWorkerPool(MAX_TASKS, 0, {}, {}, [task_skill])
+    skill_pool.start()
+    yield TaskTable(skill_pool, MAX_TASKS)
+    skill_pool.close(kill=True)
+
+
+def test_priorities_and_concurrency_cap(task_table, task_skill):
+    # the short tasks are waiting until the blocking tasks are finished
+    task_ids = [task_table.submit(task_skill, "Wait", "0.3", "wait") for i in range(MAX_TASKS)]
+    task_ids += [task_table.submit(task_skill, "Wait", "0.01", "wait", priority=10 * (i % 2)) for i in range(20)]
+    for task_id in task_ids:
+        assert task_table.wait(task_id, TIMEOUT)
+    tasks = [task_table.get(task_id) for task_id in task_ids]
+    assert [task["state"] for task in tasks] == [DONE] * len(tasks)
+
+    events = sorted([(task["start_time"], 1) for task in tasks] + [(task["end_time"], -1) for task in tasks])
+    concurrent = max_concurrent = 0
+    for event_time, change in events:
+        concurrent += change
+        max_concurrent = max(max_concurrent, concurrent)
+    assert max_concurrent <= MAX_TASKS
+
+    # the job ids are given in the order the tasks are handed to the workers
+    assert max(task["job_id"] for task in tasks[MAX_TASKS:] if task["priority"] == 10) < min(task["job_id"] for task in tasks[MAX_TASKS:] if task["priority"] == 0)
+
+
+def test_cancel_kills_the_skill_and_its_processes(task_table, task_skill):
+    task_id = task_table.submit(task_skill, "Wait", "30", "wait")
+    end = perf_counter() + TIMEOUT
+    while task_table.get(task_id)["pgid"] is None or _process_group_alive(task_table.get(task_id)["pgid"]) is False:
+        assert perf_counter() < end, "the task didn't start"
+        sleep(0.01)
+    sleep(0.1)  # time for the skill to start 'sleep'
+    pgid = task_table.get(task_id)["pgid"]
+
+    start = perf_counter()
+    assert task_table.cancel(task_id)
+    while _process_group_alive(pgid):
+        assert perf_counter() - start < 1, "the skill or its 'sleep' process is still running"
+    assert task_table.get(task_id)["state"] == CANCELLED
+
+
+def test_cancel_skill_cancels_running_and_waiting_tasks(task_table, task_skill):
+    task_ids = [task_table.submit(task_skill, "Wait", "30", "wait") for i in range(MAX_TASKS + 1)]
+    assert sorted(task_table.cancel_skill(task_skill, "Wait")) == task_ids
+    assert [task_table.get(task_id)["state"] for task_id in task_ids] == [CANCELLED] * len(task_ids)
@@ -0,0 +1,39 @@
+import subprocess
+from os import readlink, stat
+from os.path import dirname
+from socket import AF_UNIX, SOCK_STREAM, socket
+from stat import S_IMODE
+
+import pytest
+
+from aion_core import tts
+
+
+def test_pico2wave_writes_through_private_link():
+    command = tts._pico2wave_command("This is an test", "en_US")
+    link = command[2][len("--wave="):]
+    assert readlink(link) == "/dev/stdout"
+    assert S_IMODE(stat(dirname(link)).st_mode) == 0o700
+
+
+def test_client_refuses_foreign_file(tmp_path, monkeypatch):
+    fname = tmp_path / "tts.sock"
+    fname.write_text("")  # e.g. a file which another user has put there
+    monkeypatch.setattr(tts, "_socket_path", lambda: str(fname))
+    with socket(AF_UNIX, SOCK_STREAM) as client:
+        with pytest.raises(ConnectionRefusedError):
+            tts._connect(client)
+    assert tts.say("This is an test", "espeak", "en_US", timeout=1) is False
+
+
+def test_prerender_skips_broken_entry(tmp_path, monkeypatch):
+    lng_file = tmp_path / "xx_XX.lng"
+    lng_file.write_text("<xx_XX>\n  <test.broken>Broken output</test.broken>\n  <test.good>Good output</test.good>\n</xx_XX>")
+
+    def run(command, **kwargs):
+        stdout = b"RIFF" if command[-1] == "Broken output" else tts._wav(b"\x00\x00" * 16, 16000, 1, 2)
+        return subprocess.CompletedProcess(command, 0, stdout)
+
+    monkeypatch.setitem(tts.stream_engines, "test", lambda speech_output, language: ["test", speech_output])
+    monkeypatch.setattr(subprocess, "run", run)
+    assert tts.prerender("test", [str(lng_file)]) == (1, 0)
@@ -0,0 +1,27 @@
+from os.path import isfile
+
+import pytest
+
+from aion_core import variable
+
+
+@pytest.fixture
+def daemon_variables(tmp_path, monkeypatch):
+    monkeypatch.setattr(variable, "_aion_variable_file", str(tmp_path / "variables"))
+    variables = variable.Variable()
+    variables.inititalize_variables({variable.AION_PID: "1234"})
+    yield variables
+    variables.close()
+
+
+def test_release_keeps_the_variable_file(daemon_variables):
+    avar = variable.Variable()
+    assert avar.get_value(variable.AION_PID) == "1234"
+    avar.release()
+    assert isfile(variable._aion_variable_file)
+    assert daemon_variables.get_value(variable.AION_PID) == "1234"
+
+
+def test_close_removes_the_variable_file(daemon_variables):
+    daemon_variables.close()
+    assert not isfile(variable._aion_variable_file)
@@ -0,0 +1,88 @@
+from ast import literal_eval
+from os import replace
+from threading import Event, Thread
+from time import sleep
+
+import pytest
+
+from aion_core.acph import ActivatePhraseMatcher
+from aion_core.watcher import FileWatcher
+
+MAX_WAIT = 10
+
+
+def _write(fname, phrase_dict):
+    with open(fname + ".new", "w") as file:
+        file.write(repr(phrase_dict))
+    replace(fname + ".new", fname)  # like the atomic writes of 'utils.BaseXMLWriter'
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def file_watcher(request):
+    file_watcher = FileWatcher(interval=0.1, debounce=0.05, use_inotify=request.param)
+    yield file_watcher
+    file_watcher.stop()
+
+
+def _wait_until_started(file_watcher):
+    while file_watcher.mode is None:
+        sleep(0.01)
+
+
+def test_changed_file_is_reported(tmp_path, file_watcher):
+    fname = str(tmp_path / "skills.xml")
+    _write(fname, {})
+    changed = []
+    notified = Event()
+    file_watcher.watch(fname, lambda fnames: (changed.append(fnames), notified.set()))
+    file_watcher.start()
+    _wait_until_started(file_watcher)
+
+    _write(fname, {"time": ["skills", "CurrentTime"]})
+    assert notified.wait(MAX_WAIT), "the change wasn't reported (" + file_watcher.mode + ")"
+    assert changed == [[fname]]
+
+
+def test_matcher_swap_loses_no_speech_input(tmp_path, file_watcher):
+    fname = str(tmp_path / "phrases.acph")
+    phrase_dict = {"time": ["skills", "CurrentTime"]}
+    current = {"matcher": ActivatePhraseMatcher(phrase_dict), "version": -1}
+    reloaded = Event()
+
+    def on_change(fnames):
+        with open(fname, "r") as file:
+            new_phrase_dict = literal_eval(file.read())
+        current["matcher"] = ActivatePhraseMatcher(new_phrase_dict)
+        current["version"] = max(int(phrase.split("__and__")[1]) for phrase in new_phrase_dict if phrase.startswith("reload__and__"))
+        reloaded.set()
+
+    stop = Event()
+    counts = {"matches": 0, "lost": 0}
+
+    def match():
+        while not stop.is_set():
+            if "time" in [phrase for phrase, value in current["matcher"].match("what time is it")]:
+                counts["matches"] += 1
+            else:
+                counts["lost"] += 1
+            stop.wait(0.001)
+
+    _write(fname, phrase_dict)
+    file_watcher.watch(str(tmp_path), on_change)
+    file_watcher.start()
+    _wait_until_started(file_watcher)
+    matcher_thread = Thread(target=match, daemon=True)
+    matcher_thread.start()
+    try:
+        for version in range(5):
+            phrase_dict["reload__and__" + str(version)] = ["skills", "CurrentTime"]
+            _write(fname, phrase_dict)
+            while current["version"] != version:
+                assert reloaded.wait(MAX_WAIT), "the changed phrase file wasn't reloaded (" + file_watcher.mode + ")"
+                reloaded.clear()
+    finally:
+        stop.set()
+        matcher_thread.join()
+
+    assert counts["lost"] == 0
+    assert counts["matches"] > 0
@@ -0,0 +1,66 @@
+from threading import Event
+
+import pytest
+
+from aion_core.logging import flush
+from aion_core.task import CPU_LIMIT, DONE, MEMORY_LIMIT, TIMEOUT, TaskTable
+from aion_core.worker import read_accounting_file, SkillWorkerPool
+
+MEMORY_LIMIT_MB = 256
+MAX_WAIT = 30
+
+
+@pytest.fixture
+def accounting_fname(tmp_path):
+    return str(tmp_path / "skills.accounting")
+
+
+@pytest.fixture
+def task_table(task_skill, accounting_fname):
+    skill_pool = SkillWorkerPool(1, 0, {}, {}, [task_skill], accounting_fname=accounting_fname)
+    skill_pool.start()
+    yield TaskTable(skill_pool, limits={task_skill: {"Wait": {"timeout": 0.5}, "Spin": {"cpu_time": 1}, "Allocate": {"memory": MEMORY_LIMIT_MB}}})
+    skill_pool.close(kill=True)
+
+
+@pytest.mark.parametrize("method, speech_input, state", [("Wait", "0", DONE), ("Wait", "30", TIMEOUT), ("Spin", "", CPU_LIMIT),
+                                                         ("Allocate", str(MEMORY_LIMIT_MB * 4), MEMORY_LIMIT)])
+def test_limits_stop_the_skill(task_table, task_skill, method, speech_input, state):
+    task_id = task_table.submit(task_skill, method, speech_input, method.lower())
+    finished = task_table.wait(task_id, MAX_WAIT)
+    if finished is False:
+        task_table.cancel(task_id)
+    assert finished, "the skill wasn't stopped"
+    assert task_table.get(task_id)["state"] == state
+
+
+def test_every_run_is_accounted(task_table, task_skill, accounting_fname):
+    for method, speech_input in [("Wait", "0"), ("Wait", "30"), ("Spin", ""), ("Allocate", str(MEMORY_LIMIT_MB * 4))]:
+        assert task_table.wait(task_table.submit(task_skill, method, speech_input, method.lower()), MAX_WAIT)
+    flush()
+
+    runs = read_accounting_file(accounting_fname)
+    assert [run["status"] for run in runs] == ["done", "timeout", "cpu_limit", "memory_limit"]
+
+
+class _Logger:
+
+    def __init__(self):
+        self.errors = []
+        self.logged = Event()
+
+    def error(self, msg, lineno=None):
+        self.errors.append(msg)
+        self.logged.set()
+
+
+def test_skill_error_is_logged(task_skill, accounting_fname):
+    logger = _Logger()
+    skill_pool = SkillWorkerPool(1, 0, {}, {}, [task_skill], accounting_fname=accounting_fname, logger=logger)
+    skill_pool.start()
+    try:
+        assert skill_pool.wait(skill_pool.submit(task_skill, "Fail", "broken skill", "fail"), MAX_WAIT)
+        assert logger.logged.wait(MAX_WAIT)
+    finally:
+        skill_pool.close(kill=True)
+    assert "RuntimeError: broken skill" in logger.errors[0]
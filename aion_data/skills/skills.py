@@ -170,7 +170,7 @@ class Play(Skill):
 
     def run_after(self):
         for plugin in self.run_after_plugins:
-            self.start_run_after_plugin(plugin["name"])
+            self.start_run_after_plugin(plugin)
 
 
 class RamUsage(Skill):
@@ -230,6 +230,6 @@ class Wikipedia(Skill):
         if article.exists():
             article_text = remove_brackets(article.summary)
             article_text = remove_space(article_text)
-            self.speech_output(alang.start("skills", "wikipedia", {"article_text": article_text}))
+            self.speech_output_stream(alang.start("skills", "wikipedia", {"article_text": article_text}))
         else:
             self.speech_output(alang.start("skills", "wikipedia_article_not_found", {"article_name": searched_article}))